@@ -0,0 +1,252 @@
+"""companyテーブル用のSQL組み立てヘルパー
+
+DatabaseService と ThreadSafeDatabaseService で共有する、
+企業データの一括挿入・一括更新SQLやIN句による一括検索を提供
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from collections.abc import Callable, Iterable, Iterator
+from itertools import chain
+from typing import Any
+
+from stock_batch.models.company import Company
+
+logger = logging.getLogger(__name__)
+
+# SQLクエリを実行してカーソルを返す関数（読み取り用の execute 等）
+QueryExecutor = Callable[[str, tuple[Any, ...]], sqlite3.Cursor]
+
+# IN句に渡すパラメータ数の上限（SQLiteの既定上限999未満に抑える）
+MAX_QUERY_PARAMETERS = 900
+
+# 企業データ挿入SQL（1件挿入で使用）
+INSERT_COMPANY_SQL = """
+INSERT INTO company (symbol, name, market, business_summary, price)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+# 複数行VALUESの一括挿入で1文にまとめる行数（5列 × 100行 = 500パラメータ）
+INSERT_CHUNK_ROWS = 100
+
+# 企業データupsert用の競合時更新句（挿入SQLに付加する）
+UPSERT_CONFLICT_CLAUSE = (
+    " ON CONFLICT(symbol) DO UPDATE SET"
+    " name = excluded.name, market = excluded.market,"
+    " business_summary = excluded.business_summary, price = excluded.price,"
+    " last_updated = CURRENT_TIMESTAMP"
+)
+
+# CASE式の一括更新で1文にまとめる行数（9パラメータ × 100行 = 900パラメータ）
+UPDATE_CHUNK_ROWS = 100
+
+# チャンク単位の一括SQLが失敗した場合に、そのチャンクだけを取り消すSAVEPOINT名
+_CHUNK_SAVEPOINT = "company_chunk"
+
+# (チャンク内の企業データ, SQL, パラメータ) の組
+ChunkStatement = tuple[list[Company], str, tuple[Any, ...]]
+
+
+def insert_parameters(company: Company) -> tuple[Any, ...]:
+    """企業データ挿入SQLのパラメータを作成する
+
+    Args:
+        company: 挿入する企業データ
+
+    Returns:
+        INSERT_COMPANY_SQL のプレースホルダー順のパラメータ
+    """
+    return (
+        company.symbol,
+        company.name,
+        company.market,
+        company.business_summary,
+        company.price,
+    )
+
+
+def multi_row_inserts(companies: list[Company]) -> Iterator[ChunkStatement]:
+    """複数行VALUESの企業データ挿入SQLとパラメータを生成する
+
+    SQLiteのパラメータ数上限を超えないよう INSERT_CHUNK_ROWS 行ごとに分割する。
+
+    Args:
+        companies: 挿入する企業データのリスト
+
+    Yields:
+        (チャンク内の企業データ, 挿入SQL, 全行分を連結したパラメータ) のタプル
+    """
+    for start in range(0, len(companies), INSERT_CHUNK_ROWS):
+        chunk = companies[start : start + INSERT_CHUNK_ROWS]
+        values = ", ".join(["(?, ?, ?, ?, ?)"] * len(chunk))
+        sql = (
+            "INSERT INTO company (symbol, name, market, business_summary, price) "
+            f"VALUES {values}"
+        )
+        parameters = tuple(chain.from_iterable(insert_parameters(c) for c in chunk))
+        yield chunk, sql, parameters
+
+
+def multi_row_upserts(companies: list[Company]) -> Iterator[ChunkStatement]:
+    """複数行VALUESの INSERT ... ON CONFLICT DO UPDATE 文とパラメータを生成する
+
+    入力内で同じシンボルが再度現れた場合は先行行への更新になる。
+
+    Args:
+        companies: upsertする企業データのリスト
+
+    Yields:
+        (チャンク内の企業データ, upsert SQL, 全行分を連結したパラメータ) のタプル
+    """
+    for chunk, sql, parameters in multi_row_inserts(companies):
+        yield chunk, sql + UPSERT_CONFLICT_CLAUSE, parameters
+
+
+def upsert_row(execute: QueryExecutor, company: Company) -> bool:
+    """企業データを1件upsertする
+
+    execute_chunks_with_fallback で一括upsertが失敗した場合の1件ずつの処理に使う。
+
+    Args:
+        execute: SQLを実行する関数
+        company: upsertする企業データ
+
+    Returns:
+        成功時True、失敗時False
+    """
+    try:
+        execute(INSERT_COMPANY_SQL + UPSERT_CONFLICT_CLAUSE, insert_parameters(company))
+    except sqlite3.Error as e:
+        logger.error("企業データupsertエラー: %s - %s", company.symbol, e)
+        return False
+    return True
+
+
+def case_updates(companies: list[Company]) -> Iterator[ChunkStatement]:
+    """CASE式で複数企業をまとめて更新するSQLとパラメータを生成する
+
+    1行あたり9パラメータ（4列 × (シンボル, 値) + IN句のシンボル）を使うため、
+    パラメータ数上限を超えないよう UPDATE_CHUNK_ROWS 行ごとに分割する。
+
+    Args:
+        companies: 更新する企業データのリスト（シンボルは重複しないこと）
+
+    Yields:
+        (チャンク内の企業データ, 更新SQL, パラメータ) のタプル
+    """
+    for start in range(0, len(companies), UPDATE_CHUNK_ROWS):
+        chunk = companies[start : start + UPDATE_CHUNK_ROWS]
+        whens = " ".join(["WHEN ? THEN ?"] * len(chunk))
+        placeholders = ",".join("?" * len(chunk))
+        sql = (
+            "UPDATE company SET "
+            f"name = CASE symbol {whens} END, "
+            f"market = CASE symbol {whens} END, "
+            f"business_summary = CASE symbol {whens} END, "
+            f"price = CASE symbol {whens} END, "
+            "last_updated = CURRENT_TIMESTAMP "
+            f"WHERE symbol IN ({placeholders})"
+        )
+        parameters: list[Any] = []
+        for column in ("name", "market", "business_summary", "price"):
+            for company in chunk:
+                parameters.append(company.symbol)
+                parameters.append(getattr(company, column))
+        parameters.extend(company.symbol for company in chunk)
+        yield chunk, sql, tuple(parameters)
+
+
+def execute_chunks_with_fallback(
+    execute: QueryExecutor,
+    statements: Iterable[ChunkStatement],
+    execute_row: Callable[[Company], bool],
+) -> list[str]:
+    """チャンク単位の一括SQLを実行し、失敗したチャンクは1件ずつ実行し直す
+
+    チャンクごとにSAVEPOINTを設定し、一括SQLが失敗した場合はそのチャンクだけを
+    取り消してから execute_row で1件ずつ実行する。これにより不正な行だけが
+    失敗として報告される。トランザクション内で呼び出すこと。
+
+    Args:
+        execute: SQLを実行する関数
+        statements: multi_row_inserts や case_updates が生成するチャンク単位のSQL
+        execute_row: 1件分の処理を行い、成功時にTrueを返す関数
+
+    Returns:
+        1件ずつの実行でも失敗した企業のシンボルのリスト
+    """
+    failed_symbols: list[str] = []
+    for chunk, sql, parameters in statements:
+        execute(f"SAVEPOINT {_CHUNK_SAVEPOINT}", ())
+        try:
+            execute(sql, parameters)
+        except sqlite3.Error as e:
+            # 一括SQLを取り消し、失敗した企業を特定するため1件ずつ実行する
+            execute(f"ROLLBACK TO SAVEPOINT {_CHUNK_SAVEPOINT}", ())
+            execute(f"RELEASE SAVEPOINT {_CHUNK_SAVEPOINT}", ())
+            logger.warning("一括SQLの実行に失敗したため1件ずつ実行します: %s", e)
+            failed_symbols.extend(
+                company.symbol for company in chunk if not execute_row(company)
+            )
+        else:
+            execute(f"RELEASE SAVEPOINT {_CHUNK_SAVEPOINT}", ())
+    return failed_symbols
+
+
+def fetch_existing_symbols(execute: QueryExecutor, symbols: list[str]) -> set[str]:
+    """データベースに存在するシンボルを一括取得する
+
+    SQLiteのパラメータ数上限を超えないよう、IN句をチャンクに分けて問い合わせる。
+
+    Args:
+        execute: SELECT文を実行する関数
+        symbols: 確認するシンボルのリスト
+
+    Returns:
+        データベースに存在するシンボルの集合
+
+    Example:
+        >>> fetch_existing_symbols(conn.execute_read_query, ["1332.T", "9999.T"])
+        {"1332.T"}
+    """
+    existing_symbols: set[str] = set()
+    for i in range(0, len(symbols), MAX_QUERY_PARAMETERS):
+        chunk = symbols[i : i + MAX_QUERY_PARAMETERS]
+        placeholders = ",".join("?" * len(chunk))
+        cursor = execute(
+            f"SELECT symbol FROM company WHERE symbol IN ({placeholders})",
+            tuple(chunk),
+        )
+        existing_symbols.update(row[0] for row in cursor)
+    return existing_symbols
+
+
+def fetch_existing_companies(
+    execute: QueryExecutor, symbols: list[str]
+) -> dict[str, Company]:
+    """データベースに存在する企業データをシンボル指定で一括取得する
+
+    fetch_existing_symbols と同様に、IN句をチャンクに分けて問い合わせる。
+
+    Args:
+        execute: SELECT文を実行する関数
+        symbols: 取得するシンボルのリスト
+
+    Returns:
+        シンボルをキーとする既存企業データの辞書
+    """
+    unique_symbols = list(dict.fromkeys(symbols))
+    existing: dict[str, Company] = {}
+    for i in range(0, len(unique_symbols), MAX_QUERY_PARAMETERS):
+        chunk = unique_symbols[i : i + MAX_QUERY_PARAMETERS]
+        placeholders = ",".join("?" * len(chunk))
+        cursor = execute(
+            "SELECT symbol, name, market, business_summary, price "
+            f"FROM company WHERE symbol IN ({placeholders})",
+            tuple(chunk),
+        )
+        for row in cursor:
+            existing[row[0]] = Company.from_row(row)
+    return existing
@@ -6,6 +6,8 @@ SQLiteデータベースへの接続、切断、クエリ実行を管理する
 from __future__ import annotations
 
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
 
@@ -17,6 +19,8 @@ class DatabaseConnection:
 
     Attributes:
         db_path: データベースファイルのパス
+        pragmas: 接続時に追加で適用するPRAGMA設定
+        optimize_on_close: 切断時に PRAGMA optimize を実行するか
         connection: SQLite接続オブジェクト
 
     Example:
@@ -33,11 +37,17 @@ class DatabaseConnection:
         >>> conn.disconnect()
     """
 
-    def __init__(self, db_path: str) -> None:
+    # 接続ごとにキャッシュするプリペアドステートメント数（既定128から拡張）
+    CACHED_STATEMENTS = 256
+
+    def __init__(self, db_path: str, pragmas: dict[str, str] | None = None) -> None:
         """DatabaseConnection を初期化する
 
         Args:
-            db_path: データベースファイルのパス（":memory:" でメモリDB）
+            db_path: データベースファイルのパス（":memory:" でメモリDB、
+                "file:" で始まる場合はURIとして解釈）
+            pragmas: 既定のPRAGMA設定の後に適用するPRAGMA名と値の辞書
+                （例: {"journal_mode": "MEMORY", "synchronous": "OFF"}）
 
         Example:
             >>> conn = DatabaseConnection("/data/stocks.db")
@@ -45,13 +55,18 @@ class DatabaseConnection:
             "/data/stocks.db"
         """
         self.db_path = db_path
+        self.pragmas = dict(pragmas or {})
+        # メモリDBは切断時に破棄されるため、統計情報の更新は行わない
+        self.optimize_on_close = not self._is_memory_database(db_path)
         self.connection: sqlite3.Connection | None = None
+        self._in_batch = False
 
     def connect(self) -> sqlite3.Connection:
         """データベースに接続する
 
         既に接続がある場合は既存の接続を返す。
-        SQLiteの設定を最適化（外部キー制約有効、WALモード等）。
+        SQLiteの設定を最適化（外部キー制約有効、WALモード等）し、
+        pragmas が指定されていれば続けて適用する。
 
         Returns:
             SQLite接続オブジェクト
@@ -69,7 +84,12 @@ class DatabaseConnection:
             return self.connection
 
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            # "file:" 形式はURIとして接続（共有キャッシュのメモリDB等）
+            self.connection = sqlite3.connect(
+                self.db_path,
+                uri=self.db_path.startswith("file:"),
+                cached_statements=self.CACHED_STATEMENTS,
+            )
 
             # SQLite設定の最適化
             self.connection.execute("PRAGMA foreign_keys = ON")  # 外部キー制約有効
@@ -77,10 +97,19 @@ class DatabaseConnection:
             self.connection.execute(
                 "PRAGMA synchronous = NORMAL"
             )  # パフォーマンス最適化
+            self.connection.execute("PRAGMA temp_store = MEMORY")  # 一時領域をメモリに
+            self.connection.execute("PRAGMA cache_size = -20000")  # キャッシュ約20MB
+            self.connection.execute("PRAGMA mmap_size = 268435456")  # mmap最大256MB
+
+            # 追加のPRAGMA設定（既定値を上書き可能）
+            for name, value in self.pragmas.items():
+                self.connection.execute(f"PRAGMA {name} = {value}")
 
             return self.connection
 
         except sqlite3.Error as e:
+            if self.connection is not None:
+                self.connection.close()
             self.connection = None
             raise e
 
@@ -88,6 +117,7 @@ class DatabaseConnection:
         """データベース接続を切断する
 
         接続がない場合は何もしない（エラーにならない）。
+        ファイルDBの場合は切断前に PRAGMA optimize でクエリプランナーの統計を更新する。
 
         Example:
             >>> conn = DatabaseConnection(":memory:")
@@ -99,9 +129,29 @@ class DatabaseConnection:
             False
         """
         if self.connection is not None:
+            if self.optimize_on_close:
+                try:
+                    self.connection.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    # 統計更新の失敗で切断を妨げない
+                    pass
             self.connection.close()
             self.connection = None
 
+    @staticmethod
+    def _is_memory_database(db_path: str) -> bool:
+        """メモリDBのパスかどうかを判定する
+
+        Args:
+            db_path: データベースファイルのパスまたはURI
+
+        Returns:
+            ":memory:" またはメモリDBのURIの場合True
+        """
+        return db_path == ":memory:" or (
+            db_path.startswith("file:") and "mode=memory" in db_path
+        )
+
     def is_connected(self) -> bool:
         """接続状態を確認する
 
@@ -147,12 +197,45 @@ class DatabaseConnection:
 
         try:
             cursor = self.connection.execute(query, parameters)
-            self.connection.commit()  # 自動コミット
+            if not self._in_batch:
+                self.connection.commit()  # 自動コミット
             return cursor
         except sqlite3.Error as e:
-            self.connection.rollback()  # エラー時はロールバック
+            if not self._in_batch:
+                self.connection.rollback()  # エラー時はロールバック
             raise e
 
+    def execute_read_query(
+        self, query: str, parameters: tuple[Any, ...] = ()
+    ) -> sqlite3.Cursor:
+        """読み取り専用のSQLクエリを実行する
+
+        execute_query と異なりコミットを行わない。
+        呼び出し側で開始したトランザクションを終了させずに読み取りを続けられる。
+
+        Args:
+            query: 実行するSELECTクエリ
+            parameters: クエリパラメータ（プリペアドステートメント用）
+
+        Returns:
+            実行結果のカーソル
+
+        Raises:
+            RuntimeError: データベースに接続されていない場合
+            sqlite3.Error: SQL実行エラーの場合
+
+        Example:
+            >>> conn = DatabaseConnection(":memory:")
+            >>> conn.connect()
+            >>> cursor = conn.execute_read_query("SELECT 1 as test")
+            >>> cursor.fetchone()[0]
+            1
+        """
+        if self.connection is None:
+            raise RuntimeError("データベースに接続されていません")
+
+        return self.connection.execute(query, parameters)
+
     def execute_many(
         self, query: str, parameters_list: list[tuple[Any, ...]]
     ) -> sqlite3.Cursor:
@@ -183,12 +266,62 @@ class DatabaseConnection:
 
         try:
             cursor = self.connection.executemany(query, parameters_list)
-            self.connection.commit()  # 自動コミット
+            if not self._in_batch:
+                self.connection.commit()  # 自動コミット
             return cursor
         except sqlite3.Error as e:
-            self.connection.rollback()  # エラー時はロールバック
+            if not self._in_batch:
+                self.connection.rollback()  # エラー時はロールバック
             raise e
 
+    @contextmanager
+    def batch_transaction(self) -> Iterator[sqlite3.Connection]:
+        """複数の書き込みを1つのトランザクションにまとめる
+
+        ブロック内の execute_query / execute_many は自動コミットせず、
+        ブロック終了時に1回だけコミットする（例外発生時はロールバック）。
+        ブロック内で失敗した文はその文だけが取り消され、トランザクションは継続する。
+        入れ子の場合は外側のトランザクションに参加する。
+
+        Yields:
+            SQLite接続オブジェクト
+
+        Raises:
+            RuntimeError: データベースに接続されていない場合
+
+        Example:
+            >>> conn = DatabaseConnection(":memory:")
+            >>> conn.connect()
+            >>> with conn.batch_transaction():
+            ...     for row in rows:
+            ...         conn.execute_query("INSERT INTO test VALUES (?)", row)
+        """
+        if self.connection is None:
+            raise RuntimeError("データベースに接続されていません")
+
+        connection = self.connection
+        in_batch = self._in_batch
+        owns_transaction = not in_batch
+        if owns_transaction:
+            if connection.in_transaction:
+                # 暗黙に開始された未コミットのトランザクションを先に確定する
+                connection.commit()
+            # 書き込みロックを先に取得してコミット回数を1回にまとめる
+            connection.execute("BEGIN IMMEDIATE")
+
+        self._in_batch = True
+        try:
+            yield connection
+        except BaseException:
+            if owns_transaction:
+                connection.rollback()
+            raise
+        else:
+            if owns_transaction:
+                connection.commit()
+        finally:
+            self._in_batch = in_batch
+
     def get_database_info(self) -> dict[str, Any]:
         """データベース情報を取得する
 
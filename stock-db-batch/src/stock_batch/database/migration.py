@@ -6,9 +6,21 @@ SQLiteデータベースのスキーマ作成、バージョン管理、マイ
 from __future__ import annotations
 
 import sqlite3
-from typing import Any
+from typing import Any, Protocol
 
-from stock_batch.database.connection import DatabaseConnection
+
+class MigrationConnection(Protocol):
+    """DatabaseMigration が使用するデータベース接続のインターフェース
+
+    DatabaseConnection のほか、ThreadSafeDatabaseConnection 用のアダプター等、
+    execute_query を持つオブジェクトを受け付ける。
+    """
+
+    def execute_query(
+        self, query: str, parameters: tuple[Any, ...] = ...
+    ) -> sqlite3.Cursor:
+        """SQLクエリを実行してカーソルを返す"""
+        ...
 
 
 class DatabaseMigration:
@@ -28,11 +40,11 @@ class DatabaseMigration:
         ...     # データベーステーブルが作成される
     """
 
-    def __init__(self, db_connection: DatabaseConnection) -> None:
+    def __init__(self, db_connection: MigrationConnection) -> None:
         """DatabaseMigration を初期化する
 
         Args:
-            db_connection: データベース接続管理オブジェクト
+            db_connection: データベース接続管理オブジェクト（execute_query を持つもの）
 
         Example:
             >>> conn = DatabaseConnection("/data/stocks.db")
@@ -156,21 +168,46 @@ class DatabaseMigration:
             ...     exists = migration.table_exists("company")
             ...     print(exists)  # False (テーブル未作成)
         """
+        return table_name in self.tables_exist([table_name])
+
+    def tables_exist(self, table_names: list[str]) -> set[str]:
+        """指定したテーブルのうち存在するものを1回のクエリで取得する
+
+        Args:
+            table_names: チェックするテーブル名のリスト
+
+        Returns:
+            存在するテーブル名の集合
+
+        Example:
+            >>> conn = DatabaseConnection(":memory:")
+            >>> migration = DatabaseMigration(conn)
+            >>> with conn:
+            ...     migration.run_migrations()
+            ...     migration.tables_exist(["company", "schema_version", "other"])
+            {'company', 'schema_version'}
+        """
+        if not table_names:
+            return set()
+
+        placeholders = ", ".join("?" * len(table_names))
         cursor = self.db_connection.execute_query(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (table_name,),
+            "SELECT name FROM sqlite_master "
+            f"WHERE type='table' AND name IN ({placeholders})",
+            tuple(table_names),
         )
-        result = cursor.fetchone()
-        return result is not None
+        return {row[0] for row in cursor.fetchall()}
 
     def run_migrations(self) -> None:
         """マイグレーションを実行する
 
         現在のスキーマバージョンをチェックし、必要なマイグレーションを実行する。
         複数回実行しても安全（冪等性）。
+        完了後に PRAGMA optimize を実行し、クエリプランナーの統計を更新する。
 
         Migration versions:
         - 0 → 1: 初回テーブル作成 (company, schema_version)
+        - 1 → 2: 市場別検索用の複合インデックス作成 (company(market, symbol))
 
         Example:
             >>> conn = DatabaseConnection(":memory:")
@@ -181,11 +218,17 @@ class DatabaseMigration:
         """
         current_version = self.get_schema_version()
 
-        if current_version == 0:
+        if current_version < 1:
             self._run_migration_v1()
 
+        if current_version < 2:
+            self._run_migration_v2()
+
         # 将来的にバージョン2、3等のマイグレーションをここに追加
 
+        # インデックス作成後の検索で適切な実行計画が選ばれるよう統計を更新
+        self.db_connection.execute_query("PRAGMA optimize")
+
     def _run_migration_v1(self) -> None:
         """マイグレーション v0 → v1 を実行
 
@@ -202,6 +245,21 @@ class DatabaseMigration:
         # バージョン更新
         self.set_schema_version(1)
 
+    def _run_migration_v2(self) -> None:
+        """マイグレーション v1 → v2 を実行
+
+        市場別検索用インデックス作成:
+        - company(market, symbol) 複合インデックス
+          （WHERE market = ? ORDER BY symbol をインデックススキャンのみで処理）
+        """
+        self.db_connection.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_company_market_symbol "
+            "ON company(market, symbol)"
+        )
+
+        # バージョン更新
+        self.set_schema_version(2)
+
     def get_migration_info(self) -> dict[str, Any]:
         """マイグレーション情報を取得する
 
@@ -216,11 +274,11 @@ class DatabaseMigration:
             >>> with conn:
             ...     migration.run_migrations()
             ...     info = migration.get_migration_info()
-            ...     print(info["current_version"])  # 1
+            ...     print(info["current_version"])  # 2
         """
         info = {
             "current_version": self.get_schema_version(),
-            "available_migrations": [1],  # 将来的に拡張
+            "available_migrations": [1, 2],
             "tables": [],
         }
 
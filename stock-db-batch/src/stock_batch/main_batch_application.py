@@ -10,11 +10,11 @@ import logging
 import os
 import signal
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import psutil
 import yfinance
 
 from stock_batch.database.thread_safe_connection import ThreadSafeDatabaseConnection
@@ -27,6 +27,9 @@ from stock_batch.services.async_batch_processor import AsyncBatchProcessor
 
 logger = logging.getLogger(__name__)
 
+# RSS（バイト）をMB単位に換算する除数
+_BYTES_PER_MB = 1 << 20
+
 
 @dataclass
 class BatchConfig:
@@ -51,6 +54,8 @@ class BatchConfig:
     progress_report_interval: int = 100
     enable_performance_monitoring: bool = False
     enable_graceful_shutdown: bool = False
+    # 処理時間計測用の単調増加クロック（テストでは偽の時計を注入できる）
+    clock: Callable[[], float] = time.monotonic
 
     def __post_init__(self) -> None:
         """設定の検証を行う"""
@@ -150,11 +155,20 @@ class MainBatchApplication:
         >>> print(f"処理完了: {result.total_processed}件")
     """
 
-    def __init__(self, config: BatchConfig) -> None:
+    # 進捗報告時にメモリ使用量を再測定する最短間隔（秒）
+    MEMORY_SAMPLE_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        config: BatchConfig,
+        process_factory: Callable[[], Any] | None = None,
+    ) -> None:
         """MainBatchApplication を初期化する
 
         Args:
             config: バッチ設定
+            process_factory: メモリ使用量の測定に使うプロセス情報の生成関数
+                （省略時は psutil.Process。テストでは偽のプロセスを注入できる）
 
         Example:
             >>> config = BatchConfig.from_environment()
@@ -162,6 +176,9 @@ class MainBatchApplication:
         """
         self.config = config
         self.shutdown_requested = False
+        self._process_factory = process_factory
+        # 進捗報告用のメモリ使用量の直近測定値（測定時刻, MB）
+        self._memory_sample: tuple[float, float] | None = None
 
         # ログ設定
         self._setup_logging()
@@ -215,7 +232,7 @@ class MainBatchApplication:
             >>> if result.success:
             ...     print(f"成功: {result.companies_inserted}件挿入")
         """
-        start_time = time.time()
+        start_time = self.config.clock()
         start_memory = self._get_memory_usage()
 
         # Liveness Probe用状態マーカー作成
@@ -263,7 +280,7 @@ class MainBatchApplication:
                 self._process_database_operations(csv_companies, result)
 
             # 5. 処理完了
-            processing_time = time.time() - start_time
+            processing_time = self.config.clock() - start_time
             end_memory = self._get_memory_usage()
 
             result.processing_time = processing_time
@@ -282,7 +299,7 @@ class MainBatchApplication:
             )
 
         except Exception as e:
-            processing_time = time.time() - start_time
+            processing_time = self.config.clock() - start_time
             result.processing_time = processing_time
             result.error_details.append(str(e))
             result.success = False
@@ -323,7 +340,7 @@ class MainBatchApplication:
         )
 
         enriched_companies = []
-        stock_start_time = time.time()
+        stock_start_time = self.config.clock()
         for i, company in enumerate(companies):
             if self.shutdown_requested:
                 logger.warning("シャットダウン要求により株価取得を中断")
@@ -345,8 +362,10 @@ class MainBatchApplication:
                     self.config.enable_progress_reporting
                     and (i + 1) % self.config.progress_report_interval == 0
                 ):
-                    current_memory = self._get_memory_usage()
-                    processing_time = time.time() - stock_start_time
+                    current_memory = self._get_memory_usage(
+                        max_age=self.MEMORY_SAMPLE_INTERVAL
+                    )
+                    processing_time = self.config.clock() - stock_start_time
 
                     progress = {
                         "stage": "stock_fetch",
@@ -395,57 +414,63 @@ class MainBatchApplication:
             max_retries=self.config.max_retries, retry_delay=self.config.retry_delay
         )
 
-        translation_start_time = time.time()
+        translation_start_time = self.config.clock()
 
-        for i, company in enumerate(companies):
-            if self.shutdown_requested:
-                logger.warning("シャットダウン要求により翻訳を中断")
-                break
-
-            try:
-                if company.business_summary:
-                    translated_summary = (
-                        await translation_service.translate_to_japanese(
-                            company.business_summary
+        try:
+            for i, company in enumerate(companies):
+                if self.shutdown_requested:
+                    logger.warning("シャットダウン要求により翻訳を中断")
+                    break
+
+                try:
+                    if company.business_summary:
+                        translated_summary = (
+                            await translation_service.translate_to_japanese(
+                                company.business_summary
+                            )
+                        )
+                        company.business_summary = translated_summary
+
+                    # 進捗報告とリソース監視
+                    if (
+                        self.config.enable_progress_reporting
+                        and (i + 1) % self.config.progress_report_interval == 0
+                    ):
+                        current_memory = self._get_memory_usage(
+                            max_age=self.MEMORY_SAMPLE_INTERVAL
+                        )
+                        # 翻訳開始時点からの処理時間を計算
+                        processing_time = self.config.clock() - translation_start_time
+
+                        progress = {
+                            "stage": "translation",
+                            "processed": i + 1,
+                            "total": len(companies),
+                            "percentage": ((i + 1) / len(companies)) * 100,
+                            "memory_usage_mb": current_memory,
+                            "processing_time": processing_time,
+                            "records_per_second": (i + 1) / processing_time
+                            if processing_time > 0
+                            else 0,
+                        }
+                        result.progress_reports.append(progress)
+                        logger.info(
+                            "翻訳進捗: %d/%d (%.1f%%) - "
+                            "メモリ: %.1fMB, 処理速度: %.1f件/秒",
+                            i + 1,
+                            len(companies),
+                            progress["percentage"],
+                            current_memory,
+                            progress["records_per_second"],
                         )
-                    )
-                    company.business_summary = translated_summary
-
-                # 進捗報告とリソース監視
-                if (
-                    self.config.enable_progress_reporting
-                    and (i + 1) % self.config.progress_report_interval == 0
-                ):
-                    current_memory = self._get_memory_usage()
-                    # 翻訳開始時点からの処理時間を計算
-                    processing_time = time.time() - translation_start_time
-
-                    progress = {
-                        "stage": "translation",
-                        "processed": i + 1,
-                        "total": len(companies),
-                        "percentage": ((i + 1) / len(companies)) * 100,
-                        "memory_usage_mb": current_memory,
-                        "processing_time": processing_time,
-                        "records_per_second": (i + 1) / processing_time
-                        if processing_time > 0
-                        else 0,
-                    }
-                    result.progress_reports.append(progress)
-                    logger.info(
-                        "翻訳進捗: %d/%d (%.1f%%) - "
-                        "メモリ: %.1fMB, 処理速度: %.1f件/秒",
-                        i + 1,
-                        len(companies),
-                        progress["percentage"],
-                        current_memory,
-                        progress["records_per_second"],
-                    )
 
-            except Exception as e:
-                if not self.config.continue_on_error:
-                    raise
-                result.error_details.append(f"翻訳エラー {company.symbol}: {e}")
+                except Exception as e:
+                    if not self.config.continue_on_error:
+                        raise
+                    result.error_details.append(f"翻訳エラー {company.symbol}: {e}")
+        finally:
+            # Translatorが保持するHTTPクライアントを同じイベントループ上でクローズする
+            await translation_service.close()
 
         logger.info("翻訳処理完了: %d件処理", len(companies))
         return companies
@@ -579,15 +604,39 @@ class MainBatchApplication:
         else:
             return "local"
 
-    def _get_memory_usage(self) -> float:
+    def _get_memory_usage(self, max_age: float = 0.0) -> float:
         """現在のメモリ使用量をMB単位で取得する
 
+        Args:
+            max_age: 直前の測定値を再利用してよい経過秒数。進捗報告のように
+                頻繁に呼ばれる箇所で psutil によるプロセス情報の読み取りを間引く。
+                0の場合は常に測定する
+
         Returns:
             メモリ使用量（MB）
         """
+        if max_age <= 0:
+            return self._read_memory_usage()
+
+        now = self.config.clock()
+        if self._memory_sample is not None and now - self._memory_sample[0] < max_age:
+            return self._memory_sample[1]
+
+        usage = self._read_memory_usage()
+        self._memory_sample = (now, usage)
+        return usage
+
+    def _read_memory_usage(self) -> float:
+        """プロセスのメモリ使用量（MB）を読み取る"""
+        if self._process_factory is None:
+            # psutil は読み込みが重いため、メモリ使用量を初めて測定する時点で読み込む
+            import psutil
+
+            self._process_factory = psutil.Process
+
         try:
-            process = psutil.Process()
-            return process.memory_info().rss / 1024 / 1024
+            process = self._process_factory()
+            return process.memory_info().rss / _BYTES_PER_MB
         except Exception:
             return 0.0
 
@@ -639,7 +688,7 @@ class MainBatchApplication:
             >>> if result.success:
             ...     print(f"成功: {result.companies_inserted}件挿入")
         """
-        start_time = time.time()
+        start_time = self.config.clock()
         start_memory = self._get_memory_usage()
 
         # Liveness Probe用状態マーカー作成
@@ -695,7 +744,7 @@ class MainBatchApplication:
             self._remove_liveness_marker()
 
             # 処理時間とメモリ使用量計算
-            result.processing_time = time.time() - start_time
+            result.processing_time = self.config.clock() - start_time
             end_memory = self._get_memory_usage()
             result.memory_usage_mb = max(0, end_memory - start_memory)
 
@@ -755,9 +804,12 @@ class MainBatchApplication:
         )
 
         # パイプライン実行
-        pipeline_start = time.time()
-        processed_companies = await async_processor.process_pipeline(companies)
-        pipeline_time = time.time() - pipeline_start
+        pipeline_start = self.config.clock()
+        try:
+            processed_companies = await async_processor.process_pipeline(companies)
+        finally:
+            await translation_service.close()
+        pipeline_time = self.config.clock() - pipeline_start
 
         # 統計情報に追加
         result.progress_reports.append({
@@ -7,15 +7,19 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+from pydantic.dataclasses import dataclass as pydantic_dataclass
 
 
-class Company(BaseModel):
+@pydantic_dataclass(slots=True, kw_only=True)
+class Company:
     """株式企業情報を表すデータクラス
 
-    データベースのcompanyテーブルに対応するデータ構造
+    データベースのcompanyテーブルに対応するデータ構造。
+    大量に生成されるため __slots__ を使用してインスタンスごとの __dict__ を持たない。
 
     Attributes:
         id: データベース内の一意識別子
@@ -46,10 +50,78 @@ class Company(BaseModel):
     price: float | None = Field(default=None, ge=0.0, description="株価")
     last_updated: datetime | None = Field(default=None, description="最終更新日時")
     created_at: datetime | None = Field(default=None, description="作成日時")
-    
+
     # 非同期処理用の追加フィールド
     stock_data: Any | None = Field(default=None, description="取得した株価データ")
-    business_summary_ja: str | None = Field(default=None, description="翻訳済み企業概要")
+    business_summary_ja: str | None = Field(
+        default=None, description="翻訳済み企業概要"
+    )
+
+    @classmethod
+    def from_row(cls, row: tuple[Any, ...]) -> Company:
+        """データベースの行タプルからCompanyオブジェクトを作成する
+
+        行は (symbol, name, market, business_summary, price) の列順であること。
+
+        Args:
+            row: companyテーブルから取得した行
+
+        Returns:
+            作成されたCompanyオブジェクト
+
+        Example:
+            >>> cursor = connection.execute(
+            ...     "SELECT symbol, name, market, business_summary, price FROM company"
+            ... )
+            >>> companies = [Company.from_row(row) for row in cursor]
+        """
+        symbol, name, market, business_summary, price = row
+        return cls(
+            symbol=symbol,
+            name=name,
+            market=market,
+            business_summary=business_summary,
+            price=price,
+        )
+
+    def has_significant_changes(self, new: Company) -> bool:
+        """新しい企業データとの間に重要な変更があるかチェックする
+
+        価格、ビジネス要約、企業名、市場の変更を検出する。
+        軽微な変更（1銭以下の価格差や前後の空白の違い）は無視する。
+
+        Args:
+            new: 比較する新しい企業データ
+
+        Returns:
+            重要な変更がある場合True
+
+        Example:
+            >>> existing = Company(symbol="1332.T", name="ニッスイ", price=877.8)
+            >>> existing.has_significant_changes(
+            ...     Company(symbol="1332.T", name="ニッスイ ", price=877.8)
+            ... )
+            False
+        """
+        # 価格の変更チェック（小数点以下の誤差を考慮）
+        if self.price is not None and new.price is not None:
+            price_diff = abs(self.price - new.price)
+            if price_diff > 0.01:  # 1銭以上の差
+                return True
+
+        # 文字列項目の変更チェック（ビジネス要約・企業名・市場）
+        # 大半の行は変更がないため、完全一致する場合は strip() を省略する
+        for existing_value, new_value in (
+            (self.business_summary, new.business_summary),
+            (self.name, new.name),
+            (self.market, new.market),
+        ):
+            if existing_value == new_value:
+                continue
+            if (existing_value or "").strip() != (new_value or "").strip():
+                return True
+
+        return False
 
     def set_timestamps(
         self,
@@ -73,11 +145,30 @@ class Company(BaseModel):
             self.last_updated = last_updated
 
 
-@dataclass
+@lru_cache(maxsize=8192)
+def _yfinance_symbol(code: str, market_prefix: str) -> str:
+    """株式コードと市場区分の1文字目からyfinanceシンボルを生成する
+
+    同一銘柄の変換はバッチの再実行をまたいで繰り返されるため結果をキャッシュする。
+    """
+    return f"{code}{CSVCompanyData.EXCHANGE_MAPPING.get(market_prefix, '.T')}"
+
+
+@lru_cache(maxsize=8192)
+def _parse_price(current_value: str) -> float:
+    """現在値文字列を浮動小数点数に変換する（結果をキャッシュ）"""
+    try:
+        return float(current_value)
+    except ValueError as e:
+        raise ValueError(f"無効な価格文字列: {current_value}") from e
+
+
+@dataclass(slots=True)
 class CSVCompanyData:
     """CSV形式の企業データを表すデータクラス
 
-    SBI証券スクリーニング結果CSVから読み取った生データを保持
+    SBI証券スクリーニング結果CSVから読み取った生データを保持。
+    CSVの行数分生成されるため、Company と同様に __slots__ を使用する。
 
     Attributes:
         code: 株式コード（例: 1332, 130A）
@@ -150,17 +241,8 @@ class CSVCompanyData:
             >>> print(symbol)
             "3698.S"
         """
-        if not self.market:
-            # 市場区分が空の場合は東京証券取引所をデフォルトとする
-            return f"{self.code}.T"
-
-        # 市場区分の1文字目を取得
-        market_prefix = self.market[0]
-
-        # マッピングから対応する識別子を取得（見つからない場合は.Tをデフォルト）
-        exchange_suffix = self.EXCHANGE_MAPPING.get(market_prefix, ".T")
-
-        return f"{self.code}{exchange_suffix}"
+        # 市場区分の1文字目で識別子を決定（空の場合は東京証券取引所をデフォルトとする）
+        return _yfinance_symbol(self.code, self.market[:1])
 
     def parse_current_price(self) -> float:
         """現在値文字列を浮動小数点数に変換する
@@ -177,10 +259,32 @@ class CSVCompanyData:
             >>> print(price)
             877.8
         """
-        try:
-            return float(self.current_value)
-        except ValueError as e:
-            raise ValueError(f"無効な価格文字列: {self.current_value}") from e
+        return _parse_price(self.current_value)
+
+    def to_company_fields(self) -> dict[str, Any]:
+        """Company の生成に使うフィールド値を辞書で返す
+
+        複数件をまとめて検証する場合に、Company を1件ずつ生成せずに
+        入力値だけを用意するために使う。
+
+        Returns:
+            Companyのフィールド名をキーとする辞書
+
+        Raises:
+            ValueError: 無効な価格文字列の場合
+
+        Example:
+            >>> csv_data = CSVCompanyData("1332", "ニッスイ", "東P", "877.8", "+0.40%")
+            >>> csv_data.to_company_fields()["symbol"]
+            "1332.T"
+        """
+        return {
+            "symbol": self.to_yfinance_symbol(),
+            "name": self.name,
+            "market": self.market,
+            "price": self.parse_current_price(),
+            "business_summary": None,  # CSV段階では企業概要は未取得
+        }
 
     def to_company(self) -> Company:
         """CSVCompanyDataからCompanyオブジェクトに変換する
@@ -197,10 +301,4 @@ class CSVCompanyData:
             >>> print(company.symbol, company.name)
             "1332.T" "ニッスイ"
         """
-        return Company(
-            symbol=self.to_yfinance_symbol(),
-            name=self.name,
-            market=self.market,
-            price=self.parse_current_price(),
-            business_summary=None,  # CSV段階では企業概要は未取得
-        )
+        return Company(**self.to_company_fields())
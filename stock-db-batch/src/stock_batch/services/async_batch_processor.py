@@ -201,6 +201,49 @@ class AsyncBatchProcessor:
             len(self.errors),
         )
 
+    async def join_queues(self) -> None:
+        """投入済みの全データの処理完了を待機する
+
+        株価取得キュー、翻訳キューの順に join し、終了シグナルを含む
+        全アイテムがワーカーに処理されるまで待機する。
+
+        Example:
+            >>> await processor.stock_queue.put(company)
+            >>> await processor.join_queues()
+        """
+        await self.stock_queue.join()
+        await self.translation_queue.join()
+
+    async def submit_batch(self, companies: list[Any]) -> None:
+        """企業リストを投入し株価取得の完了まで待機する
+
+        全企業と株価取得ワーカー数分の終了シグナルを投入し、
+        株価取得キューの全アイテムが処理されるまで待機する。
+
+        Args:
+            companies: 処理対象の企業リスト
+
+        Raises:
+            RuntimeError: パイプラインが開始されていない場合
+
+        Example:
+            >>> await processor.start_pipeline()
+            >>> await processor.submit_batch(companies)
+        """
+        if not self.is_running:
+            raise RuntimeError("パイプラインが開始されていません")
+
+        self.stats.total_companies += len(companies)
+
+        for company in companies:
+            await self.stock_queue.put(company)
+
+        # 各株価取得ワーカーに終了シグナルを送信
+        for _ in range(self.stock_workers):
+            await self.stock_queue.put(None)
+
+        await self.stock_queue.join()
+
     async def process_companies(self, companies: list[Any]) -> list[Any]:
         """企業リストを非同期パイプラインで処理する
 
@@ -268,68 +311,72 @@ class AsyncBatchProcessor:
                     # キューから企業データ取得
                     company = await self.stock_queue.get()
 
-                    # 終了シグナル処理
-                    if company is None:
-                        # 最初のワーカーのみが翻訳ワーカーに停止シグナルを送信
-                        if not self._translation_shutdown_sent:
-                            self._translation_shutdown_sent = True
-                            for _ in range(self.translation_workers):
-                                await self.translation_queue.put(None)
-                        break
-
-                    # セマフォ取得（並行数制御）
-                    async with self.stock_semaphore:
-                        # レート制限適用
-                        await self._apply_rate_limit(
-                            last_request_time, self.stock_rate_limit
-                        )
-                        last_request_time = time.time()
-
-                        # 株価取得処理
-                        if self.stock_fetcher_func:
-                            try:
-                                start_time = time.time()
-                                processed_company = await self.stock_fetcher_func(
-                                    company
-                                )
-                                processing_time = time.time() - start_time
-
-                                self.stats.stock_fetch_completed += 1
-                                self.stats.stock_fetch_time += processing_time
-
-                                # 翻訳キューに送信
-                                await self.translation_queue.put(processed_company)
-
-                                logger.debug(
-                                    "%s: 株価取得完了 %s (%.3f秒)",
-                                    worker_name,
-                                    getattr(company, "symbol", "UNKNOWN"),
-                                    processing_time,
-                                )
-
-                            except Exception as e:
-                                self.stats.stock_fetch_errors += 1
-                                self.errors.append(e)
-                                logger.error(
-                                    "%s: 株価取得エラー %s - %s",
-                                    worker_name,
-                                    getattr(company, "symbol", "UNKNOWN"),
-                                    e,
-                                )
-                                # エラー時も翻訳キューに送信（処理継続）
+                    try:
+                        # 終了シグナル処理
+                        if company is None:
+                            # 最初のワーカーのみが翻訳ワーカーに停止シグナルを送信
+                            if not self._translation_shutdown_sent:
+                                self._translation_shutdown_sent = True
+                                for _ in range(self.translation_workers):
+                                    await self.translation_queue.put(None)
+                            break
+
+                        # セマフォ取得（並行数制御）
+                        async with self.stock_semaphore:
+                            # レート制限適用
+                            await self._apply_rate_limit(
+                                last_request_time, self.stock_rate_limit
+                            )
+                            last_request_time = time.time()
+
+                            # 株価取得処理
+                            if self.stock_fetcher_func:
+                                try:
+                                    start_time = time.time()
+                                    processed_company = await self.stock_fetcher_func(
+                                        company
+                                    )
+                                    processing_time = time.time() - start_time
+
+                                    self.stats.stock_fetch_completed += 1
+                                    self.stats.stock_fetch_time += processing_time
+
+                                    # 翻訳キューに送信
+                                    await self.translation_queue.put(processed_company)
+
+                                    logger.debug(
+                                        "%s: 株価取得完了 %s (%.3f秒)",
+                                        worker_name,
+                                        getattr(company, "symbol", "UNKNOWN"),
+                                        processing_time,
+                                    )
+
+                                except Exception as e:
+                                    self.stats.stock_fetch_errors += 1
+                                    self.errors.append(e)
+                                    logger.error(
+                                        "%s: 株価取得エラー %s - %s",
+                                        worker_name,
+                                        getattr(company, "symbol", "UNKNOWN"),
+                                        e,
+                                    )
+                                    # エラー時も翻訳キューに送信（処理継続）
+                                    await self.translation_queue.put(company)
+                            else:
+                                # 株価取得関数が未設定の場合はそのまま送信
                                 await self.translation_queue.put(company)
-                        else:
-                            # 株価取得関数が未設定の場合はそのまま送信
-                            await self.translation_queue.put(company)
-
-                    # 進捗報告
-                    if (
-                        self.enable_progress_reporting
-                        and self.stats.stock_fetch_completed
-                        % self.progress_report_interval
-                        == 0
-                    ):
-                        await self._report_progress("stock_fetch")
+
+                        # 進捗報告
+                        if (
+                            self.enable_progress_reporting
+                            and self.stats.stock_fetch_completed
+                            % self.progress_report_interval
+                            == 0
+                        ):
+                            await self._report_progress("stock_fetch")
+                    finally:
+                        # 終了シグナルも含めて処理完了を通知（join待機用）
+                        self.stock_queue.task_done()
 
                 except asyncio.CancelledError:
                     break
@@ -360,61 +407,67 @@ class AsyncBatchProcessor:
                     # キューから企業データ取得
                     company = await self.translation_queue.get()
 
-                    # 終了シグナル処理
-                    if company is None:
-                        break
-
-                    # セマフォ取得（並行数制御）
-                    async with self.translation_semaphore:
-                        # レート制限適用
-                        await self._apply_rate_limit(
-                            last_request_time, self.translation_rate_limit
-                        )
-                        last_request_time = time.time()
-
-                        # 翻訳処理
-                        if self.translator_func:
-                            try:
-                                start_time = time.time()
-                                processed_company = await self.translator_func(company)
-                                processing_time = time.time() - start_time
-
-                                self.stats.translation_completed += 1
-                                self.stats.translation_time += processing_time
-
-                                # 結果キューに送信
-                                await self.result_queue.put(processed_company)
-
-                                logger.debug(
-                                    "%s: 翻訳完了 %s (%.3f秒)",
-                                    worker_name,
-                                    getattr(company, "symbol", "UNKNOWN"),
-                                    processing_time,
-                                )
-
-                            except Exception as e:
-                                self.stats.translation_errors += 1
-                                self.errors.append(e)
-                                logger.error(
-                                    "%s: 翻訳エラー %s - %s",
-                                    worker_name,
-                                    getattr(company, "symbol", "UNKNOWN"),
-                                    e,
-                                )
-                                # エラー時も結果キューに送信（処理継続）
+                    try:
+                        # 終了シグナル処理
+                        if company is None:
+                            break
+
+                        # セマフォ取得（並行数制御）
+                        async with self.translation_semaphore:
+                            # レート制限適用
+                            await self._apply_rate_limit(
+                                last_request_time, self.translation_rate_limit
+                            )
+                            last_request_time = time.time()
+
+                            # 翻訳処理
+                            if self.translator_func:
+                                try:
+                                    start_time = time.time()
+                                    processed_company = await self.translator_func(
+                                        company
+                                    )
+                                    processing_time = time.time() - start_time
+
+                                    self.stats.translation_completed += 1
+                                    self.stats.translation_time += processing_time
+
+                                    # 結果キューに送信
+                                    await self.result_queue.put(processed_company)
+
+                                    logger.debug(
+                                        "%s: 翻訳完了 %s (%.3f秒)",
+                                        worker_name,
+                                        getattr(company, "symbol", "UNKNOWN"),
+                                        processing_time,
+                                    )
+
+                                except Exception as e:
+                                    self.stats.translation_errors += 1
+                                    self.errors.append(e)
+                                    logger.error(
+                                        "%s: 翻訳エラー %s - %s",
+                                        worker_name,
+                                        getattr(company, "symbol", "UNKNOWN"),
+                                        e,
+                                    )
+                                    # エラー時も結果キューに送信（処理継続）
+                                    await self.result_queue.put(company)
+                            else:
+                                # 翻訳関数が未設定の場合はそのまま結果キューに送信
                                 await self.result_queue.put(company)
-                        else:
-                            # 翻訳関数が未設定の場合はそのまま結果キューに送信
-                            await self.result_queue.put(company)
 
-                        # 進捗報告
-                        if (
-                            self.enable_progress_reporting
-                            and self.stats.translation_completed
-                            % self.progress_report_interval
-                            == 0
-                        ):
-                            await self._report_progress("translation")
+                            # 進捗報告
+                            if (
+                                self.enable_progress_reporting
+                                and self.stats.translation_completed
+                                % self.progress_report_interval
+                                == 0
+                            ):
+                                await self._report_progress("translation")
+                    finally:
+                        # 終了シグナルも含めて処理完了を通知（join待機用）
+                        self.translation_queue.task_done()
 
                 except asyncio.CancelledError:
                     break
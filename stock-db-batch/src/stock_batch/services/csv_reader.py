@@ -5,14 +5,36 @@ SBI証券スクリーニング結果CSVファイルの読み取り、パース
 
 from __future__ import annotations
 
+import codecs
 import csv
+import io
 import logging
+from collections.abc import Iterable, Iterator
 from typing import Any
 
+from pydantic import TypeAdapter, ValidationError
+
 from stock_batch.models.company import Company, CSVCompanyData
 
 logger = logging.getLogger(__name__)
 
+# 変換後の企業データを1回の呼び出しでまとめて検証するためのアダプター
+_COMPANY_LIST_ADAPTER: TypeAdapter[list[Company]] = TypeAdapter(list[Company])
+
+# JSON形式のスクリーニング結果を直接 CSVCompanyData に変換するためのアダプター
+_CSV_COMPANY_LIST_ADAPTER: TypeAdapter[list[CSVCompanyData]] = TypeAdapter(
+    list[CSVCompanyData]
+)
+
+
+def _is_plain_decimal(value: str) -> bool:
+    """符号・指数を含まない10進表記（例: 877.8, 405）かどうかを判定する
+
+    このような文字列は float() で必ず解析できるため、価格検証で
+    例外処理を経由せずに判定できる。
+    """
+    return value.replace(".", "", 1).isdecimal()
+
 
 class CSVReader:
     """CSV読み取りサービスクラス
@@ -33,6 +55,9 @@ class CSVReader:
     # 期待するCSVヘッダー（SBI証券スクリーニング結果の形式）
     EXPECTED_HEADERS = ["コード", "銘柄名", "市場", "現在値", "前日比(%)"]
 
+    # 読み取り時に試行する文字エンコーディング（優先順、BOMは読み込み時に除去する）
+    ENCODINGS = ("utf-8", "shift_jis")
+
     def __init__(self, csv_path: str) -> None:
         """CSVReader を初期化する
 
@@ -49,7 +74,7 @@ class CSVReader:
     def read_csv(self) -> list[CSVCompanyData]:
         """CSVファイルを読み取り、CSVCompanyDataのリストを返す
 
-        BOM付きUTF-8、Shift_JIS、UTF-8の順で文字エンコーディングを試行する。
+        先頭のUTF-8 BOMを除去し、UTF-8、Shift_JISの順でエンコーディングを試行する。
         不正なデータ行はスキップし、有効なデータのみを返す。
 
         Returns:
@@ -65,77 +90,60 @@ class CSVReader:
             >>> len(companies)
             1500
         """
-        encodings_to_try = ["utf-8-sig", "shift_jis", "utf-8"]
-        companies = []
+        return list(self._iter_csv())
 
-        for encoding in encodings_to_try:
-            try:
-                with open(self.csv_path, encoding=encoding, newline="") as file:
-                    csv_reader = csv.reader(file)
-
-                    # ヘッダー読み取り
-                    headers = next(csv_reader, None)
-                    if headers is None:
-                        logger.warning("CSVファイルが空です: %s", self.csv_path)
-                        return []
-
-                    # BOM除去（必要に応じて）
-                    if headers[0].startswith("\ufeff"):
-                        headers[0] = headers[0][1:]
-
-                    # ヘッダー検証
-                    if not self.validate_headers(headers):
-                        logger.warning(
-                            "CSVヘッダーが期待する形式と異なります。"
-                            "期待値: %s, 実際: %s",
-                            self.EXPECTED_HEADERS,
-                            headers,
-                        )
-
-                    # データ行読み取り
-                    line_number = 1
-                    for row in csv_reader:
-                        line_number += 1
-                        try:
-                            if len(row) >= 5:  # 必要な列数をチェック
-                                company_data = CSVCompanyData(
-                                    code=row[0].strip().strip('"'),
-                                    name=row[1].strip().strip('"'),
-                                    market=row[2].strip().strip('"'),
-                                    current_value=row[3].strip().strip('"'),
-                                    change_percent=row[4].strip().strip('"'),
-                                )
-                                companies.append(company_data)
-                            else:
-                                logger.warning(
-                                    "行 %d: 列数が不足しています（%d列）: %s",
-                                    line_number,
-                                    len(row),
-                                    row,
-                                )
-                        except ValueError as e:
-                            logger.warning(
-                                "行 %d: データ形式エラー: %s - %s", line_number, e, row
-                            )
-                            continue
+    def _iter_csv(self) -> Iterator[CSVCompanyData]:
+        """CSVファイルを読み取り、有効なCSVCompanyDataを1件ずつ返す
 
-                logger.info(
-                    "CSV読み取り完了: %s (%s) - %d件の企業データ",
-                    self.csv_path,
-                    encoding,
-                    len(companies),
-                )
-                return self.filter_valid_companies(companies)
+        全件のリストを保持せずに読み取り → フィルタリングを1パスで行う。
 
+        Yields:
+            有効なCSVCompanyDataオブジェクト
+
+        Raises:
+            FileNotFoundError: CSVファイルが存在しない場合
+            IOError: ファイル読み取りエラーの場合
+        """
+        try:
+            # ファイルは一度だけ読み込み、エンコーディングの試行はメモリ上で行う
+            with open(self.csv_path, "rb") as file:
+                raw = file.read().removeprefix(codecs.BOM_UTF8)
+        except FileNotFoundError:
+            logger.error("CSVファイルが見つかりません: %s", self.csv_path)
+            raise
+        except OSError as e:
+            logger.error("CSVファイル読み取りエラー: %s - %s", self.csv_path, e)
+            raise
+
+        for encoding in self.ENCODINGS:
+            try:
+                text = raw.decode(encoding)
             except UnicodeDecodeError:
                 logger.debug("エンコーディング %s で読み取り失敗、次を試行", encoding)
                 continue
-            except FileNotFoundError:
-                logger.error("CSVファイルが見つかりません: %s", self.csv_path)
-                raise
-            except OSError as e:
-                logger.error("CSVファイル読み取りエラー: %s - %s", self.csv_path, e)
-                raise
+
+            valid_count = 0
+            invalid_count = 0
+            for company in self._parse_rows(text):
+                if self._is_valid_company(company):
+                    valid_count += 1
+                    yield company
+                else:
+                    invalid_count += 1
+
+            logger.info(
+                "CSV読み取り完了: %s (%s) - %d件の企業データ",
+                self.csv_path,
+                encoding,
+                valid_count + invalid_count,
+            )
+            if invalid_count > 0:
+                logger.info(
+                    "データフィルタリング完了: 有効 %d件, 無効 %d件",
+                    valid_count,
+                    invalid_count,
+                )
+            return
 
         # すべてのエンコーディングで失敗した場合
         logger.error(
@@ -143,6 +151,80 @@ class CSVReader:
         )
         raise OSError(f"CSVファイル読み取りに失敗しました: {self.csv_path}")
 
+    def _parse_rows(self, text: str) -> Iterator[CSVCompanyData]:
+        """デコード済みのCSVテキストからCSVCompanyDataを1件ずつ生成する
+
+        Args:
+            text: デコード済みのCSVテキスト
+
+        Yields:
+            CSVCompanyDataオブジェクト（列数不足・不正な行は除く）
+        """
+        csv_reader = csv.reader(io.StringIO(text, newline=""))
+
+        # ヘッダー読み取り
+        headers = next(csv_reader, None)
+        if headers is None:
+            logger.warning("CSVファイルが空です: %s", self.csv_path)
+            return
+
+        # ヘッダー検証
+        if not self.validate_headers(headers):
+            logger.warning(
+                "CSVヘッダーが期待する形式と異なります。期待値: %s, 実際: %s",
+                self.EXPECTED_HEADERS,
+                headers,
+            )
+
+        # データ行読み取り（行番号はヘッダーを1行目とする）
+        for line_number, row in enumerate(csv_reader, start=2):
+            if len(row) < 5:  # 必要な列数をチェック
+                logger.warning(
+                    "行 %d: 列数が不足しています（%d列）: %s",
+                    line_number,
+                    len(row),
+                    row,
+                )
+                continue
+            try:
+                company = CSVCompanyData(*[cell.strip().strip('"') for cell in row[:5]])
+            except ValueError as e:
+                logger.warning("行 %d: データ形式エラー: %s - %s", line_number, e, row)
+                continue
+            yield company
+
+    def read_json(self) -> list[CSVCompanyData]:
+        """JSON形式のスクリーニング結果を読み取り、CSVCompanyDataのリストを返す
+
+        CSVCompanyDataのフィールド名をキーとするオブジェクトの配列を想定する。
+        JSONの解析と検証は pydantic-core で一括して行い、中間の辞書を作らない。
+
+        Returns:
+            有効なCSVCompanyDataオブジェクトのリスト
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合
+            pydantic.ValidationError: JSONの形式やフィールド値が不正な場合
+
+        Example:
+            >>> reader = CSVReader("/data/screener_result.json")
+            >>> companies = reader.read_json()
+            >>> companies[0].code
+            "1332"
+        """
+        try:
+            with open(self.csv_path, "rb") as file:
+                raw = file.read()
+        except FileNotFoundError:
+            logger.error("JSONファイルが見つかりません: %s", self.csv_path)
+            raise
+
+        companies = _CSV_COMPANY_LIST_ADAPTER.validate_json(raw)
+        logger.info(
+            "JSON読み取り完了: %s - %d件の企業データ", self.csv_path, len(companies)
+        )
+        return self.filter_valid_companies(companies)
+
     def validate_headers(self, headers: list[str]) -> bool:
         """CSVヘッダーが期待する形式かチェックする
 
@@ -158,14 +240,13 @@ class CSVReader:
             >>> reader.validate_headers(headers)
             True
         """
-        if len(headers) < len(self.EXPECTED_HEADERS):
+        # 列位置で値を取り出すため、集合ではなく順序付きで比較する
+        expected_count = len(self.EXPECTED_HEADERS)
+        if len(headers) < expected_count:
             return False
 
-        for i, expected_header in enumerate(self.EXPECTED_HEADERS):
-            if i >= len(headers) or headers[i].strip().strip('"') != expected_header:
-                return False
-
-        return True
+        normalized = [header.strip().strip('"') for header in headers[:expected_count]]
+        return normalized == self.EXPECTED_HEADERS
 
     def filter_valid_companies(
         self, companies: list[CSVCompanyData]
@@ -197,27 +278,9 @@ class CSVReader:
         invalid_count = 0
 
         for company in companies:
-            try:
-                # 基本的な検証
-                if not company.code.strip():
-                    logger.debug("無効なデータ: 株式コードが空 - %s", company.name)
-                    invalid_count += 1
-                    continue
-
-                if not company.name.strip():
-                    logger.debug("無効なデータ: 企業名が空 - %s", company.code)
-                    invalid_count += 1
-                    continue
-
-                # 価格の数値変換テスト
-                float(company.current_value)
-
+            if self._is_valid_company(company):
                 valid_companies.append(company)
-
-            except (ValueError, AttributeError) as e:
-                logger.debug(
-                    "無効なデータ: %s - %s (%s)", company.code, company.name, e
-                )
+            else:
                 invalid_count += 1
 
         if invalid_count > 0:
@@ -229,8 +292,37 @@ class CSVReader:
 
         return valid_companies
 
+    @staticmethod
+    def _is_valid_company(company: CSVCompanyData) -> bool:
+        """企業データが有効かチェックする
+
+        Args:
+            company: チェック対象の企業データ
+
+        Returns:
+            株式コード・企業名が空でなく、現在値が数値として解析可能な場合True
+        """
+        try:
+            # 基本的な検証
+            if not company.code.strip():
+                logger.debug("無効なデータ: 株式コードが空 - %s", company.name)
+                return False
+
+            if not company.name.strip():
+                logger.debug("無効なデータ: 企業名が空 - %s", company.code)
+                return False
+
+            # 価格の数値変換テスト（一般的な10進表記は変換を省略する）
+            if not _is_plain_decimal(company.current_value):
+                float(company.current_value)
+        except (ValueError, AttributeError) as e:
+            logger.debug("無効なデータ: %s - %s (%s)", company.code, company.name, e)
+            return False
+
+        return True
+
     def convert_to_companies(
-        self, csv_companies: list[CSVCompanyData]
+        self, csv_companies: Iterable[CSVCompanyData]
     ) -> list[Company]:
         """CSVCompanyDataをCompanyオブジェクトに変換する
 
@@ -238,7 +330,7 @@ class CSVReader:
         現在値を浮動小数点数に変換して Company オブジェクトを作成する。
 
         Args:
-            csv_companies: 変換元のCSVCompanyDataリスト
+            csv_companies: 変換元のCSVCompanyData（リストまたはイテレータ）
 
         Returns:
             Companyオブジェクトのリスト
@@ -251,29 +343,59 @@ class CSVReader:
             >>> companies[0].symbol
             "1332.T"
         """
-        companies = []
+        sources: list[CSVCompanyData] = []
+        payloads: list[dict[str, Any]] = []
+        total = 0
 
         for csv_company in csv_companies:
+            total += 1
             try:
-                company = csv_company.to_company()
-                companies.append(company)
+                payloads.append(csv_company.to_company_fields())
+                sources.append(csv_company)
             except Exception as e:
-                logger.warning(
-                    "企業データ変換エラー: %s (%s) - %s",
-                    csv_company.code,
-                    csv_company.name,
-                    e,
-                )
+                self._log_conversion_error(csv_company, e)
+
+        # Company の検証は1件ずつではなく全件まとめて行う
+        try:
+            companies = _COMPANY_LIST_ADAPTER.validate_python(payloads)
+        except ValidationError as e:
+            # 検証に失敗した行のみを除外して再検証する
+            errors_by_index: dict[int, str] = {}
+            # 使うのは位置とメッセージのみのため、URL・入力値・コンテキストは生成しない
+            for error in e.errors(
+                include_url=False, include_context=False, include_input=False
+            ):
+                index = error["loc"][0]
+                if isinstance(index, int):
+                    errors_by_index.setdefault(index, error["msg"])
+            for index, message in errors_by_index.items():
+                self._log_conversion_error(sources[index], message)
+            companies = _COMPANY_LIST_ADAPTER.validate_python(
+                [
+                    payload
+                    for index, payload in enumerate(payloads)
+                    if index not in errors_by_index
+                ]
+            )
 
-        logger.info(
-            "企業データ変換完了: %d件 → %d件", len(csv_companies), len(companies)
-        )
+        logger.info("企業データ変換完了: %d件 → %d件", total, len(companies))
         return companies
 
+    @staticmethod
+    def _log_conversion_error(csv_company: CSVCompanyData, error: object) -> None:
+        """企業データ変換エラーをログ出力する"""
+        logger.warning(
+            "企業データ変換エラー: %s (%s) - %s",
+            csv_company.code,
+            csv_company.name,
+            error,
+        )
+
     def read_and_convert(self) -> list[Company]:
         """CSV読み取りから Company オブジェクト変換までを一括実行
 
-        読み取り → フィルタリング → 変換の全ワークフローを実行する。
+        読み取り → フィルタリング → 変換の全ワークフローを1行ずつ1パスで実行し、
+        CSVCompanyDataの全件リストを保持しない。
 
         Returns:
             Companyオブジェクトのリスト
@@ -290,11 +412,8 @@ class CSVReader:
         """
         logger.info("CSV読み取り・変換処理を開始: %s", self.csv_path)
 
-        # CSV読み取り
-        csv_companies = self.read_csv()
-
-        # Company オブジェクトに変換
-        companies = self.convert_to_companies(csv_companies)
+        # CSV読み取りと Company オブジェクトへの変換をストリーミングで行う
+        companies = self.convert_to_companies(self._iter_csv())
 
         logger.info(
             "CSV読み取り・変換処理完了: %s - %d件の企業データ",
@@ -7,8 +7,22 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import partial
 from typing import Any
 
+from stock_batch.database.company_queries import (
+    INSERT_COMPANY_SQL,
+    case_updates,
+    execute_chunks_with_fallback,
+    fetch_existing_companies,
+    fetch_existing_symbols,
+    insert_parameters,
+    multi_row_inserts,
+    multi_row_upserts,
+    upsert_row,
+)
 from stock_batch.database.connection import DatabaseConnection
 from stock_batch.database.migration import DatabaseMigration
 from stock_batch.models.company import Company
@@ -61,6 +75,38 @@ class DatabaseService:
         migration.run_migrations()
         logger.info("データベース初期化完了")
 
+    @contextmanager
+    def read_transaction(self) -> Iterator[None]:
+        """複数の読み取りを1つのトランザクションにまとめる
+
+        SELECTごとに共有ロックを取得・解放せず、ブロック全体で1回だけ取得する。
+        既にトランザクション中の場合や開始できない場合はそのまま実行する。
+        ブロック内で例外が発生した場合はロールバックし、正常終了時のみコミットする。
+
+        Example:
+            >>> with service.read_transaction():
+            ...     for symbol in symbols:
+            ...         service.get_company_by_symbol(symbol)
+        """
+        connection = self.db_connection.connection
+        if connection is None or connection.in_transaction:
+            yield
+            return
+
+        try:
+            connection.execute("BEGIN")
+        except sqlite3.Error as e:
+            logger.debug("読み取りトランザクション開始失敗: %s", e)
+            yield
+            return
+
+        try:
+            yield
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+
     def insert_company(self, company: Company) -> bool:
         """企業データを挿入する
 
@@ -80,19 +126,8 @@ class DatabaseService:
             True
         """
         try:
-            sql = """
-            INSERT INTO company (symbol, name, market, business_summary, price)
-            VALUES (?, ?, ?, ?, ?)
-            """
             self.db_connection.execute_query(
-                sql,
-                (
-                    company.symbol,
-                    company.name,
-                    company.market,
-                    company.business_summary,
-                    company.price,
-                ),
+                INSERT_COMPANY_SQL, insert_parameters(company)
             )
             logger.debug("企業データ挿入成功: %s", company.symbol)
             return True
@@ -120,22 +155,15 @@ class DatabaseService:
         """
         try:
             sql = """
-            SELECT symbol, name, market, business_summary, price,
-                   last_updated, created_at
+            SELECT symbol, name, market, business_summary, price
             FROM company
             WHERE symbol = ?
             """
-            cursor = self.db_connection.execute_query(sql, (symbol,))
+            cursor = self.db_connection.execute_read_query(sql, (symbol,))
             row = cursor.fetchone()
 
             if row:
-                return Company(
-                    symbol=row[0],
-                    name=row[1],
-                    market=row[2],
-                    business_summary=row[3],
-                    price=row[4],
-                )
+                return Company.from_row(row)
             return None
 
         except Exception as e:
@@ -230,19 +258,8 @@ class DatabaseService:
             FROM company
             ORDER BY symbol
             """
-            cursor = self.db_connection.execute_query(sql)
-            rows = cursor.fetchall()
-
-            companies = []
-            for row in rows:
-                company = Company(
-                    symbol=row[0],
-                    name=row[1],
-                    market=row[2],
-                    business_summary=row[3],
-                    price=row[4],
-                )
-                companies.append(company)
+            cursor = self.db_connection.execute_read_query(sql)
+            companies = [Company.from_row(row) for row in cursor]
 
             logger.debug("全企業データ取得完了: %d件", len(companies))
             return companies
@@ -270,19 +287,8 @@ class DatabaseService:
             WHERE market = ?
             ORDER BY symbol
             """
-            cursor = self.db_connection.execute_query(sql, (market,))
-            rows = cursor.fetchall()
-
-            companies = []
-            for row in rows:
-                company = Company(
-                    symbol=row[0],
-                    name=row[1],
-                    market=row[2],
-                    business_summary=row[3],
-                    price=row[4],
-                )
-                companies.append(company)
+            cursor = self.db_connection.execute_read_query(sql, (market,))
+            companies = [Company.from_row(row) for row in cursor]
 
             logger.debug("市場別企業データ取得完了: %s - %d件", market, len(companies))
             return companies
@@ -311,18 +317,41 @@ class DatabaseService:
         if not companies:
             return {"successful": 0, "failed": 0, "failed_symbols": []}
 
-        successful = 0
-        failed = 0
-        failed_symbols = []
+        failed_symbols: list[str] = []
 
         logger.info("企業データ一括挿入開始: %d件", len(companies))
 
-        for company in companies:
-            if self.insert_company(company):
-                successful += 1
-            else:
-                failed += 1
-                failed_symbols.append(company.symbol)
+        try:
+            # 1件ごとにコミットせず、全件を1トランザクションで書き込む
+            with self.db_connection.batch_transaction() as connection:
+                # 既存シンボルと入力内の重複はUNIQUE制約違反になるため先に除外する
+                seen_symbols = self._get_existing_symbols(
+                    [company.symbol for company in companies]
+                )
+                pending: list[Company] = []
+                for company in companies:
+                    if company.symbol in seen_symbols:
+                        logger.debug("企業データ挿入失敗（重複）: %s", company.symbol)
+                        failed_symbols.append(company.symbol)
+                    else:
+                        seen_symbols.add(company.symbol)
+                        pending.append(company)
+
+                # 複数行VALUESの INSERT 文で一括挿入し、文の実行回数を減らす
+                failed_symbols.extend(
+                    execute_chunks_with_fallback(
+                        connection.execute,
+                        multi_row_inserts(pending),
+                        self.insert_company,
+                    )
+                )
+        except (sqlite3.Error, RuntimeError) as e:
+            # トランザクション全体が取り消されたため全件を失敗として扱う
+            logger.error("企業データ一括挿入エラー: %s", e)
+            failed_symbols = [company.symbol for company in companies]
+
+        failed = len(failed_symbols)
+        successful = len(companies) - failed
 
         logger.info("企業データ一括挿入完了: 成功 %d件, 失敗 %d件", successful, failed)
 
@@ -350,18 +379,40 @@ class DatabaseService:
         if not companies:
             return {"successful": 0, "failed": 0, "failed_symbols": []}
 
-        successful = 0
-        failed = 0
-        failed_symbols = []
+        symbols = [company.symbol for company in companies]
 
         logger.info("企業データ一括更新開始: %d件", len(companies))
 
-        for company in companies:
-            if self.update_company(company):
-                successful += 1
-            else:
-                failed += 1
-                failed_symbols.append(company.symbol)
+        try:
+            # CASE式でまとめた UPDATE 文を1トランザクションで実行する
+            with self.db_connection.batch_transaction() as connection:
+                # 書き込みロック取得後に存在確認し、確認後の削除を取りこぼさない
+                existing_symbols = self._get_existing_symbols(symbols)
+                # 同一シンボルが複数ある場合は1件ずつ更新した場合と同じく最後の値を採用
+                targets = {
+                    company.symbol: company
+                    for company in companies
+                    if company.symbol in existing_symbols
+                }
+                # 存在しない企業は更新対象外として失敗に数える
+                failed_set = set(symbols) - existing_symbols
+                failed_set.update(
+                    execute_chunks_with_fallback(
+                        connection.execute,
+                        case_updates(list(targets.values())),
+                        self.update_company,
+                    )
+                )
+        except (sqlite3.Error, RuntimeError) as e:
+            # トランザクション全体が取り消されたため全件を失敗として扱う
+            logger.error("企業データ一括更新エラー: %s", e)
+            failed_set = set(symbols)
+
+        failed_symbols = [
+            company.symbol for company in companies if company.symbol in failed_set
+        ]
+        failed = len(failed_symbols)
+        successful = len(companies) - failed
 
         logger.info("企業データ一括更新完了: 成功 %d件, 失敗 %d件", successful, failed)
 
@@ -391,31 +442,42 @@ class DatabaseService:
         if not companies:
             return {"inserted": 0, "updated": 0, "failed": 0, "failed_symbols": []}
 
-        inserted = 0
-        updated = 0
-        failed = 0
-        failed_symbols = []
+        symbols = [company.symbol for company in companies]
 
         logger.info("企業データupsert開始: %d件", len(companies))
 
-        for company in companies:
-            # 既存データの確認
-            existing = self.get_company_by_symbol(company.symbol)
+        try:
+            # ON CONFLICT による複数行upsertを1トランザクションで実行する
+            with self.db_connection.batch_transaction() as connection:
+                # 挿入・更新件数を数えるため、書き込みロック取得後に既存シンボルを取得
+                existing_symbols = self._get_existing_symbols(symbols)
+                failed_set = set(
+                    execute_chunks_with_fallback(
+                        connection.execute,
+                        multi_row_upserts(companies),
+                        partial(upsert_row, connection.execute),
+                    )
+                )
+        except (sqlite3.Error, RuntimeError) as e:
+            # トランザクション全体が取り消されたため全件を失敗として扱う
+            logger.error("企業データupsertエラー: %s", e)
+            existing_symbols = set()
+            failed_set = set(symbols)
 
-            if existing is None:
-                # 新規挿入
-                if self.insert_company(company):
-                    inserted += 1
-                else:
-                    failed += 1
-                    failed_symbols.append(company.symbol)
+        inserted = 0
+        updated = 0
+        failed_symbols: list[str] = []
+        seen_symbols = set(existing_symbols)
+        for company in companies:
+            if company.symbol in failed_set:
+                failed_symbols.append(company.symbol)
+            elif company.symbol in seen_symbols:
+                # 入力内で同じシンボルが再度現れた場合は先行行への更新になる
+                updated += 1
             else:
-                # 既存データ更新
-                if self.update_company(company):
-                    updated += 1
-                else:
-                    failed += 1
-                    failed_symbols.append(company.symbol)
+                inserted += 1
+                seen_symbols.add(company.symbol)
+        failed = len(failed_symbols)
 
         logger.info(
             "企業データupsert完了: 挿入 %d件, 更新 %d件, 失敗 %d件",
@@ -453,9 +515,11 @@ class DatabaseService:
         """
         logger.info("差分分析開始: CSV %d件", len(csv_companies))
 
-        # 既存の全企業データを取得
-        existing_companies = self.get_all_companies()
-        existing_dict = {comp.symbol: comp for comp in existing_companies}
+        # CSVに含まれるシンボルの既存データのみをIN句でまとめて取得
+        existing_dict = fetch_existing_companies(
+            self.db_connection.execute_read_query,
+            [company.symbol for company in csv_companies],
+        )
 
         to_insert = []
         to_update = []
@@ -501,23 +565,21 @@ class DatabaseService:
             >>> print(f"総企業数: {stats['total_companies']}")
         """
         try:
-            # 総企業数
-            cursor = self.db_connection.execute_query("SELECT COUNT(*) FROM company")
-            total_companies = cursor.fetchone()[0]
-
-            # 市場別分布
-            cursor = self.db_connection.execute_query(
-                "SELECT market, COUNT(*) FROM company GROUP BY market"
-            )
-            market_rows = cursor.fetchall()
-            markets = {row[0]: row[1] for row in market_rows}
-
-            # 最終更新日時
-            cursor = self.db_connection.execute_query(
-                "SELECT MAX(last_updated) FROM company"
+            # 市場別の件数と最終更新日時を1クエリで取得し、全体値はPythonで集計
+            cursor = self.db_connection.execute_read_query(
+                "SELECT market, COUNT(*), MAX(last_updated) "
+                "FROM company GROUP BY market"
             )
-            last_update_row = cursor.fetchone()
-            last_updated = last_update_row[0] if last_update_row[0] else None
+            markets: dict[str | None, int] = {}
+            total_companies = 0
+            last_updated = None
+            for market, count, market_last_updated in cursor:
+                markets[market] = count
+                total_companies += count
+                if market_last_updated and (
+                    last_updated is None or market_last_updated > last_updated
+                ):
+                    last_updated = market_last_updated
 
             stats = {
                 "total_companies": total_companies,
@@ -536,11 +598,30 @@ class DatabaseService:
                 "last_updated": None,
             }
 
+    def _get_existing_symbols(self, symbols: list[str]) -> set[str]:
+        """データベースに存在するシンボルを一括取得する
+
+        IN句をチャンクに分けた問い合わせは fetch_existing_symbols に委譲する。
+
+        Args:
+            symbols: 確認するシンボルのリスト
+
+        Returns:
+            データベースに存在するシンボルの集合
+
+        Example:
+            >>> existing = service._get_existing_symbols(["1332.T", "9999.T"])
+            >>> print(existing)
+            {"1332.T"}
+        """
+        return fetch_existing_symbols(self.db_connection.execute_read_query, symbols)
+
     def _has_significant_changes(self, existing: Company, new: Company) -> bool:
         """企業データに重要な変更があるかチェックする
 
         価格やビジネス要約の変更を検出する。
         軽微な変更（空白の違いなど）は無視する。
+        判定は Company.has_significant_changes に委譲する。
 
         Args:
             existing: 既存の企業データ
@@ -552,24 +633,4 @@ class DatabaseService:
         Example:
             >>> has_changes = service._has_significant_changes(old_data, new_data)
         """
-        # 価格の変更チェック（小数点以下の誤差を考慮）
-        if existing.price is not None and new.price is not None:
-            price_diff = abs(existing.price - new.price)
-            if price_diff > 0.01:  # 1銭以上の差
-                return True
-
-        # ビジネス要約の変更チェック
-        existing_summary = (existing.business_summary or "").strip()
-        new_summary = (new.business_summary or "").strip()
-        if existing_summary != new_summary:
-            return True
-
-        # 企業名の変更チェック
-        if existing.name.strip() != new.name.strip():
-            return True
-
-        # 市場の変更チェック
-        if (existing.market or "").strip() != (new.market or "").strip():
-            return True
-
-        return False
+        return existing.has_significant_changes(new)
@@ -13,13 +13,14 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Any
 
-import psutil
-
 from stock_batch.models.company import Company
 from stock_batch.services.thread_safe_database_service import ThreadSafeDatabaseService
 
 logger = logging.getLogger(__name__)
 
+# RSS（バイト）をMB単位に換算する除数
+_BYTES_PER_MB = 1 << 20
+
 
 @dataclass
 class ProcessingResult:
@@ -324,13 +325,14 @@ class DifferentialProcessor:
         # チャンク内のシンボルリストを取得
         symbols = [company.symbol for company in chunk]
 
-        # 既存データを一括取得（効率化）
+        # 既存データを一括取得（1つの読み取りトランザクション内で実行）
         existing_companies = {}
-        for symbol in symbols:
-            existing = self.db_service.get_company_by_symbol(symbol)
-            if existing:
-                existing_companies[symbol] = existing
-            database_queries += 1
+        with self.db_service.read_transaction():
+            for symbol in symbols:
+                existing = self.db_service.get_company_by_symbol(symbol)
+                if existing:
+                    existing_companies[symbol] = existing
+                database_queries += 1
 
         # 差分判定
         for company in chunk:
@@ -385,27 +387,7 @@ class DifferentialProcessor:
         Returns:
             重要な変更がある場合True
         """
-        # 価格の変更チェック（小数点以下の誤差を考慮）
-        if existing.price is not None and new.price is not None:
-            price_diff = abs(existing.price - new.price)
-            if price_diff > 0.01:  # 1銭以上の差
-                return True
-
-        # ビジネス要約の変更チェック
-        existing_summary = (existing.business_summary or "").strip()
-        new_summary = (new.business_summary or "").strip()
-        if existing_summary != new_summary:
-            return True
-
-        # 企業名の変更チェック
-        if existing.name.strip() != new.name.strip():
-            return True
-
-        # 市場の変更チェック
-        if (existing.market or "").strip() != (new.market or "").strip():
-            return True
-
-        return False
+        return existing.has_significant_changes(new)
 
     def _create_chunks(
         self, companies: list[Company], chunk_size: int
@@ -431,9 +413,12 @@ class DifferentialProcessor:
         Returns:
             メモリ使用量（MB）
         """
+        # psutil は読み込みが重いため、メモリ使用量を初めて測定する時点で読み込む
+        import psutil
+
         try:
             process = psutil.Process()
-            return process.memory_info().rss / 1024 / 1024  # MB
+            return process.memory_info().rss / _BYTES_PER_MB
         except Exception:
             return 0.0
 
@@ -81,6 +81,7 @@ class StockFetcher:
         max_retries: int = 3,
         retry_delay: float = 1.0,
         rate_limit_delay: float = 0.5,
+        session: Any | None = None,
     ) -> None:
         """StockFetcher を初期化する
 
@@ -88,6 +89,8 @@ class StockFetcher:
             max_retries: 最大リトライ回数（デフォルト: 3）
             retry_delay: リトライ間隔秒数（デフォルト: 1.0）
             rate_limit_delay: API呼び出し間の待機時間秒数（デフォルト: 0.5）
+            session: 全銘柄で共有するHTTPセッション（デフォルト: None で
+                yfinance内部の共有セッションを使用）
 
         Example:
             >>> fetcher = StockFetcher(
@@ -97,6 +100,7 @@ class StockFetcher:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.rate_limit_delay = rate_limit_delay
+        self.session = session
         self._last_request_time = 0.0
         self._stats = {
             "total_requests": 0,
@@ -144,7 +148,7 @@ class StockFetcher:
                 )
 
                 # yfinance Ticker オブジェクト作成
-                ticker = yf.Ticker(symbol)
+                ticker = self._create_ticker(symbol)
 
                 # 直近の株価データ取得（1日分）
                 hist = ticker.history(period="1d")
@@ -331,6 +335,22 @@ class StockFetcher:
         """失敗統計を記録する"""
         self._stats["failed_requests"] += 1
 
+    def _create_ticker(self, symbol: str) -> yf.Ticker:
+        """yfinance Ticker を作成する
+
+        session が指定されていれば全銘柄で同じセッションを渡し、
+        接続プールを使い回す。
+
+        Args:
+            symbol: 株式シンボル
+
+        Returns:
+            yf.Ticker: Ticker オブジェクト
+        """
+        if self.session is None:
+            return yf.Ticker(symbol)
+        return yf.Ticker(symbol, session=self.session)
+
     def _safe_int(self, value: Any) -> int | None:
         """値を安全にint変換する
 
@@ -424,7 +444,7 @@ class StockFetcher:
 
                 # yfinance処理を非同期で実行
                 def _sync_yfinance_call():
-                    ticker = yf.Ticker(symbol)
+                    ticker = self._create_ticker(symbol)
                     hist = ticker.history(period="1d")
                     info = ticker.info or {}
                     return hist, info
@@ -523,22 +543,31 @@ class StockFetcher:
         semaphore = asyncio.Semaphore(max_concurrent)
 
         async def fetch_with_semaphore(symbol: str) -> StockData | None:
-            """セマフォ制御付きの株価取得"""
+            """セマフォ制御付きの株価取得（例外は記録して None を返す）"""
             async with semaphore:
-                return await self.fetch_stock_data_async(symbol)
+                try:
+                    return await self.fetch_stock_data_async(symbol)
+                except Exception as e:
+                    logger.error("株価取得で例外発生 %s: %s", symbol, e)
+                    return None
 
         # 全ての株価取得を並行実行
-        tasks = [fetch_with_semaphore(symbol) for symbol in symbols]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 各タスクの例外は fetch_with_semaphore 内で記録して None にするため、
+        # 1銘柄の失敗で他のタスクはキャンセルされない。gather(return_exceptions=True)
+        # と異なり、呼び出し元のキャンセル（CancelledError）は握りつぶさずに伝播する
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(fetch_with_semaphore(symbol))
+                for symbol in symbols
+            ]
 
         # 結果をフィルタリング
         stock_data_list = []
         successful_count = 0
 
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error("株価取得で例外発生 %s: %s", symbols[i], result)
-            elif result is not None:
+        for task in tasks:
+            result = task.result()
+            if result is not None:
                 stock_data_list.append(result)
                 successful_count += 1
 
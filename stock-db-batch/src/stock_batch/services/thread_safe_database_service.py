@@ -8,8 +8,22 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import partial
 from typing import Any
 
+from stock_batch.database.company_queries import (
+    INSERT_COMPANY_SQL,
+    case_updates,
+    execute_chunks_with_fallback,
+    fetch_existing_companies,
+    fetch_existing_symbols,
+    insert_parameters,
+    multi_row_inserts,
+    multi_row_upserts,
+    upsert_row,
+)
 from stock_batch.database.migration import DatabaseMigration
 from stock_batch.database.thread_safe_connection import ThreadSafeDatabaseConnection
 from stock_batch.models.company import Company
@@ -17,6 +31,45 @@ from stock_batch.models.company import Company
 logger = logging.getLogger(__name__)
 
 
+class _CompatConnection:
+    """DatabaseMigration 用の接続アダプター
+
+    ThreadSafeDatabaseConnection を MigrationConnection として扱えるようにする。
+    クエリごとに呼び出しスレッドの接続を取得する。
+
+    Attributes:
+        db_connection: スレッドセーフなデータベース接続管理オブジェクト
+    """
+
+    def __init__(self, db_connection: ThreadSafeDatabaseConnection) -> None:
+        self.db_connection = db_connection
+
+    def execute_query(
+        self, query: str, parameters: tuple[Any, ...] = ()
+    ) -> sqlite3.Cursor:
+        """SQLクエリを実行してコミットする
+
+        Args:
+            query: 実行するSQLクエリ
+            parameters: クエリパラメータ
+
+        Returns:
+            実行結果のカーソル
+        """
+        connection = self.db_connection.get_connection()
+        cursor = connection.execute(query, parameters)
+        connection.commit()
+        return cursor
+
+    def is_connected(self) -> bool:
+        """接続状態を確認する
+
+        Returns:
+            常にTrue（接続は必要に応じてスレッドごとに作成される）
+        """
+        return True
+
+
 class ThreadSafeDatabaseService:
     """スレッドセーフなデータベースサービスクラス
 
@@ -30,12 +83,12 @@ class ThreadSafeDatabaseService:
         >>> conn = ThreadSafeDatabaseConnection("stocks.db")
         >>> service = ThreadSafeDatabaseService(conn)
         >>> service.setup_database()
-        >>> 
+        >>>
         >>> # マルチスレッド環境での使用
         >>> def worker():
         ...     company = Company(symbol="1332.T", name="ニッスイ", ...)
         ...     service.insert_company(company)
-        >>> 
+        >>>
         >>> with ThreadPoolExecutor(max_workers=4) as executor:
         ...     futures = [executor.submit(worker) for _ in range(4)]
         ...     results = [f.result() for f in futures]
@@ -52,6 +105,7 @@ class ThreadSafeDatabaseService:
             >>> service = ThreadSafeDatabaseService(conn)
         """
         self.db_connection = db_connection
+        self._compat_conn = _CompatConnection(db_connection)
 
     def setup_database(self) -> None:
         """データベースを初期化する
@@ -64,26 +118,42 @@ class ThreadSafeDatabaseService:
             >>> service.setup_database()
         """
         # 各スレッドで独立した接続を使用してマイグレーション実行
-        connection = self.db_connection.get_connection()
-        
-        # マイグレーション用に一時的に従来のDatabaseConnection互換インターフェースを作成
-        class CompatConnection:
-            def __init__(self, sqlite_conn: sqlite3.Connection):
-                self.connection = sqlite_conn
-            
-            def execute_query(self, query: str, parameters: tuple = ()) -> sqlite3.Cursor:
-                cursor = self.connection.execute(query, parameters)
-                self.connection.commit()
-                return cursor
-            
-            def is_connected(self) -> bool:
-                return self.connection is not None
-        
-        compat_conn = CompatConnection(connection)
-        migration = DatabaseMigration(compat_conn)
+        migration = DatabaseMigration(self._compat_conn)
         migration.run_migrations()
         logger.info("データベース初期化完了")
 
+    @contextmanager
+    def read_transaction(self) -> Iterator[None]:
+        """複数の読み取りを1つのトランザクションにまとめる
+
+        SELECTごとに共有ロックを取得・解放せず、ブロック全体で1回だけ取得する。
+        既にトランザクション中の場合や開始できない場合はそのまま実行する。
+        ブロック内で例外が発生した場合はロールバックし、正常終了時のみコミットする。
+
+        Example:
+            >>> with service.read_transaction():
+            ...     for symbol in symbols:
+            ...         service.get_company_by_symbol(symbol)
+        """
+        connection = self.db_connection.get_connection()
+        if connection.in_transaction:
+            yield
+            return
+
+        try:
+            connection.execute("BEGIN")
+        except sqlite3.Error as e:
+            logger.debug("読み取りトランザクション開始失敗: %s", e)
+            yield
+            return
+
+        try:
+            yield
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+
     def insert_company(self, company: Company) -> bool:
         """企業データを挿入する
 
@@ -105,21 +175,9 @@ class ThreadSafeDatabaseService:
         """
         try:
             connection = self.db_connection.get_connection()
-            sql = """
-            INSERT INTO company (symbol, name, market, business_summary, price)
-            VALUES (?, ?, ?, ?, ?)
-            """
-            connection.execute(
-                sql,
-                (
-                    company.symbol,
-                    company.name,
-                    company.market,
-                    company.business_summary,
-                    company.price,
-                ),
-            )
-            connection.commit()
+            connection.execute(INSERT_COMPANY_SQL, insert_parameters(company))
+            if not self.db_connection.in_batch_transaction():
+                connection.commit()
             logger.debug("企業データ挿入成功: %s", company.symbol)
             return True
 
@@ -149,8 +207,7 @@ class ThreadSafeDatabaseService:
         try:
             connection = self.db_connection.get_connection()
             sql = """
-            SELECT symbol, name, market, business_summary, price,
-                   last_updated, created_at
+            SELECT symbol, name, market, business_summary, price
             FROM company
             WHERE symbol = ?
             """
@@ -158,13 +215,7 @@ class ThreadSafeDatabaseService:
             row = cursor.fetchone()
 
             if row:
-                return Company(
-                    symbol=row[0],
-                    name=row[1],
-                    market=row[2],
-                    business_summary=row[3],
-                    price=row[4],
-                )
+                return Company.from_row(row)
             return None
 
         except Exception as e:
@@ -206,7 +257,8 @@ class ThreadSafeDatabaseService:
                     company.symbol,
                 ),
             )
-            connection.commit()
+            if not self.db_connection.in_batch_transaction():
+                connection.commit()
 
             if cursor.rowcount > 0:
                 logger.debug("企業データ更新成功: %s", company.symbol)
@@ -237,7 +289,8 @@ class ThreadSafeDatabaseService:
             connection = self.db_connection.get_connection()
             sql = "DELETE FROM company WHERE symbol = ?"
             cursor = connection.execute(sql, (symbol,))
-            connection.commit()
+            if not self.db_connection.in_batch_transaction():
+                connection.commit()
 
             if cursor.rowcount > 0:
                 logger.debug("企業データ削除成功: %s", symbol)
@@ -270,18 +323,7 @@ class ThreadSafeDatabaseService:
             ORDER BY symbol
             """
             cursor = connection.execute(sql)
-            rows = cursor.fetchall()
-
-            companies = []
-            for row in rows:
-                company = Company(
-                    symbol=row[0],
-                    name=row[1],
-                    market=row[2],
-                    business_summary=row[3],
-                    price=row[4],
-                )
-                companies.append(company)
+            companies = [Company.from_row(row) for row in cursor]
 
             logger.debug("全企業データ取得完了: %d件", len(companies))
             return companies
@@ -313,18 +355,7 @@ class ThreadSafeDatabaseService:
             ORDER BY symbol
             """
             cursor = connection.execute(sql, (market,))
-            rows = cursor.fetchall()
-
-            companies = []
-            for row in rows:
-                company = Company(
-                    symbol=row[0],
-                    name=row[1],
-                    market=row[2],
-                    business_summary=row[3],
-                    price=row[4],
-                )
-                companies.append(company)
+            companies = [Company.from_row(row) for row in cursor]
 
             logger.debug("市場別企業データ取得完了: %s - %d件", market, len(companies))
             return companies
@@ -354,18 +385,41 @@ class ThreadSafeDatabaseService:
         if not companies:
             return {"successful": 0, "failed": 0, "failed_symbols": []}
 
-        successful = 0
-        failed = 0
-        failed_symbols = []
+        failed_symbols: list[str] = []
 
         logger.info("企業データ一括挿入開始: %d件", len(companies))
 
-        for company in companies:
-            if self.insert_company(company):
-                successful += 1
-            else:
-                failed += 1
-                failed_symbols.append(company.symbol)
+        try:
+            # 1件ごとにコミットせず、全件を1トランザクションで書き込む
+            with self.db_connection.batch_transaction() as connection:
+                # 既存シンボルと入力内の重複はUNIQUE制約違反になるため先に除外する
+                seen_symbols = self._get_existing_symbols(
+                    [company.symbol for company in companies]
+                )
+                pending: list[Company] = []
+                for company in companies:
+                    if company.symbol in seen_symbols:
+                        logger.debug("企業データ挿入失敗（重複）: %s", company.symbol)
+                        failed_symbols.append(company.symbol)
+                    else:
+                        seen_symbols.add(company.symbol)
+                        pending.append(company)
+
+                # 複数行VALUESの INSERT 文で一括挿入し、文の実行回数を減らす
+                failed_symbols.extend(
+                    execute_chunks_with_fallback(
+                        connection.execute,
+                        multi_row_inserts(pending),
+                        self.insert_company,
+                    )
+                )
+        except (sqlite3.Error, RuntimeError) as e:
+            # トランザクション全体が取り消されたため全件を失敗として扱う
+            logger.error("企業データ一括挿入エラー: %s", e)
+            failed_symbols = [company.symbol for company in companies]
+
+        failed = len(failed_symbols)
+        successful = len(companies) - failed
 
         logger.info("企業データ一括挿入完了: 成功 %d件, 失敗 %d件", successful, failed)
 
@@ -394,18 +448,40 @@ class ThreadSafeDatabaseService:
         if not companies:
             return {"successful": 0, "failed": 0, "failed_symbols": []}
 
-        successful = 0
-        failed = 0
-        failed_symbols = []
+        symbols = [company.symbol for company in companies]
 
         logger.info("企業データ一括更新開始: %d件", len(companies))
 
-        for company in companies:
-            if self.update_company(company):
-                successful += 1
-            else:
-                failed += 1
-                failed_symbols.append(company.symbol)
+        try:
+            # CASE式でまとめた UPDATE 文を1トランザクションで実行する
+            with self.db_connection.batch_transaction() as connection:
+                # 書き込みロック取得後に存在確認し、確認後の削除を取りこぼさない
+                existing_symbols = self._get_existing_symbols(symbols)
+                # 同一シンボルが複数ある場合は1件ずつ更新した場合と同じく最後の値を採用
+                targets = {
+                    company.symbol: company
+                    for company in companies
+                    if company.symbol in existing_symbols
+                }
+                # 存在しない企業は更新対象外として失敗に数える
+                failed_set = set(symbols) - existing_symbols
+                failed_set.update(
+                    execute_chunks_with_fallback(
+                        connection.execute,
+                        case_updates(list(targets.values())),
+                        self.update_company,
+                    )
+                )
+        except (sqlite3.Error, RuntimeError) as e:
+            # トランザクション全体が取り消されたため全件を失敗として扱う
+            logger.error("企業データ一括更新エラー: %s", e)
+            failed_set = set(symbols)
+
+        failed_symbols = [
+            company.symbol for company in companies if company.symbol in failed_set
+        ]
+        failed = len(failed_symbols)
+        successful = len(companies) - failed
 
         logger.info("企業データ一括更新完了: 成功 %d件, 失敗 %d件", successful, failed)
 
@@ -436,31 +512,42 @@ class ThreadSafeDatabaseService:
         if not companies:
             return {"inserted": 0, "updated": 0, "failed": 0, "failed_symbols": []}
 
-        inserted = 0
-        updated = 0
-        failed = 0
-        failed_symbols = []
+        symbols = [company.symbol for company in companies]
 
         logger.info("企業データupsert開始: %d件", len(companies))
 
-        for company in companies:
-            # 既存データの確認
-            existing = self.get_company_by_symbol(company.symbol)
+        try:
+            # ON CONFLICT による複数行upsertを1トランザクションで実行する
+            with self.db_connection.batch_transaction() as connection:
+                # 挿入・更新件数を数えるため、書き込みロック取得後に既存シンボルを取得
+                existing_symbols = self._get_existing_symbols(symbols)
+                failed_set = set(
+                    execute_chunks_with_fallback(
+                        connection.execute,
+                        multi_row_upserts(companies),
+                        partial(upsert_row, connection.execute),
+                    )
+                )
+        except (sqlite3.Error, RuntimeError) as e:
+            # トランザクション全体が取り消されたため全件を失敗として扱う
+            logger.error("企業データupsertエラー: %s", e)
+            existing_symbols = set()
+            failed_set = set(symbols)
 
-            if existing is None:
-                # 新規挿入
-                if self.insert_company(company):
-                    inserted += 1
-                else:
-                    failed += 1
-                    failed_symbols.append(company.symbol)
+        inserted = 0
+        updated = 0
+        failed_symbols: list[str] = []
+        seen_symbols = set(existing_symbols)
+        for company in companies:
+            if company.symbol in failed_set:
+                failed_symbols.append(company.symbol)
+            elif company.symbol in seen_symbols:
+                # 入力内で同じシンボルが再度現れた場合は先行行への更新になる
+                updated += 1
             else:
-                # 既存データ更新
-                if self.update_company(company):
-                    updated += 1
-                else:
-                    failed += 1
-                    failed_symbols.append(company.symbol)
+                inserted += 1
+                seen_symbols.add(company.symbol)
+        failed = len(failed_symbols)
 
         logger.info(
             "企業データupsert完了: 挿入 %d件, 更新 %d件, 失敗 %d件",
@@ -499,9 +586,11 @@ class ThreadSafeDatabaseService:
         """
         logger.info("差分分析開始: CSV %d件", len(csv_companies))
 
-        # 既存の全企業データを取得
-        existing_companies = self.get_all_companies()
-        existing_dict = {comp.symbol: comp for comp in existing_companies}
+        # CSVに含まれるシンボルの既存データのみをIN句でまとめて取得
+        existing_dict = fetch_existing_companies(
+            self.db_connection.get_connection().execute,
+            [company.symbol for company in csv_companies],
+        )
 
         to_insert = []
         to_update = []
@@ -549,22 +638,22 @@ class ThreadSafeDatabaseService:
         """
         try:
             connection = self.db_connection.get_connection()
-            
-            # 総企業数
-            cursor = connection.execute("SELECT COUNT(*) FROM company")
-            total_companies = cursor.fetchone()[0]
 
-            # 市場別分布
+            # 市場別の件数と最終更新日時を1クエリで取得し、全体値はPythonで集計
             cursor = connection.execute(
-                "SELECT market, COUNT(*) FROM company GROUP BY market"
+                "SELECT market, COUNT(*), MAX(last_updated) "
+                "FROM company GROUP BY market"
             )
-            market_rows = cursor.fetchall()
-            markets = {row[0]: row[1] for row in market_rows}
-
-            # 最終更新日時
-            cursor = connection.execute("SELECT MAX(last_updated) FROM company")
-            last_update_row = cursor.fetchone()
-            last_updated = last_update_row[0] if last_update_row[0] else None
+            markets: dict[str | None, int] = {}
+            total_companies = 0
+            last_updated = None
+            for market, count, market_last_updated in cursor:
+                markets[market] = count
+                total_companies += count
+                if market_last_updated and (
+                    last_updated is None or market_last_updated > last_updated
+                ):
+                    last_updated = market_last_updated
 
             stats = {
                 "total_companies": total_companies,
@@ -583,11 +672,31 @@ class ThreadSafeDatabaseService:
                 "last_updated": None,
             }
 
+    def _get_existing_symbols(self, symbols: list[str]) -> set[str]:
+        """データベースに存在するシンボルを一括取得する
+
+        IN句をチャンクに分けた問い合わせは fetch_existing_symbols に委譲する。
+
+        Args:
+            symbols: 確認するシンボルのリスト
+
+        Returns:
+            データベースに存在するシンボルの集合
+
+        Example:
+            >>> existing = service._get_existing_symbols(["1332.T", "9999.T"])
+            >>> print(existing)
+            {"1332.T"}
+        """
+        connection = self.db_connection.get_connection()
+        return fetch_existing_symbols(connection.execute, symbols)
+
     def _has_significant_changes(self, existing: Company, new: Company) -> bool:
         """企業データに重要な変更があるかチェックする
 
         価格やビジネス要約の変更を検出する。
         軽微な変更（空白の違いなど）は無視する。
+        判定は Company.has_significant_changes に委譲する。
 
         Args:
             existing: 既存の企業データ
@@ -599,24 +708,4 @@ class ThreadSafeDatabaseService:
         Example:
             >>> has_changes = service._has_significant_changes(old_data, new_data)
         """
-        # 価格の変更チェック（小数点以下の誤差を考慮）
-        if existing.price is not None and new.price is not None:
-            price_diff = abs(existing.price - new.price)
-            if price_diff > 0.01:  # 1銭以上の差
-                return True
-
-        # ビジネス要約の変更チェック
-        existing_summary = (existing.business_summary or "").strip()
-        new_summary = (new.business_summary or "").strip()
-        if existing_summary != new_summary:
-            return True
-
-        # 企業名の変更チェック
-        if existing.name.strip() != new.name.strip():
-            return True
-
-        # 市場の変更チェック
-        if (existing.market or "").strip() != (new.market or "").strip():
-            return True
-
-        return False
\ No newline at end of file
+        return existing.has_significant_changes(new)
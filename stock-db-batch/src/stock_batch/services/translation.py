@@ -7,7 +7,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
+import threading
 import time
+from collections import OrderedDict
 from typing import Any
 
 from googletrans import Translator
@@ -25,6 +28,9 @@ class TranslationService:
         max_retries: 最大リトライ回数
         retry_delay: リトライ間隔（秒）
         _stats: 翻訳統計情報
+        cache_size: 翻訳結果キャッシュの最大件数
+        _translator_local: スレッドごとのTranslatorインスタンス保持用
+        _cache: 翻訳結果のLRUキャッシュ（原文 → 翻訳文）
 
     Example:
         >>> service = TranslationService()
@@ -47,24 +53,182 @@ class TranslationService:
         "ru": "Russian",
     }
 
-    def __init__(self, max_retries: int = 3, retry_delay: float = 1.0) -> None:
+    # リトライ待機時間の上限（秒）
+    MAX_RETRY_DELAY = 30.0
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        cache_size: int = 10000,
+    ) -> None:
         """TranslationService を初期化する
 
         Args:
             max_retries: 最大リトライ回数（デフォルト: 3）
             retry_delay: リトライ間隔秒数（デフォルト: 1.0）
+            cache_size: 翻訳結果キャッシュの最大件数（デフォルト: 10000、0で無効）
 
         Example:
             >>> service = TranslationService(max_retries=5, retry_delay=2.0)
         """
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.cache_size = cache_size
         self._stats = {
             "total_requests": 0,
             "successful_translations": 0,
             "failed_translations": 0,
             "total_response_time": 0.0,
+            "cache_hits": 0,
         }
+        # 同一のビジネス要約を何度も翻訳しないよう結果をキャッシュする
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Translator生成時のHTTPクライアント作成・トークン取得を毎回行わないよう
+        # スレッドごとに1インスタンスを再利用する
+        self._translator_local = threading.local()
+
+    def _translator_state(self) -> Any:
+        """現在のスレッド・イベントループ用のTranslator保持状態を取得する
+
+        TranslatorのHTTPクライアントは作成時のイベントループに紐づくため、
+        別のイベントループから呼び出された場合は状態を初期化する。
+
+        Returns:
+            tx（Translator）、owner、lock、retired（破棄済みのowner）を持つ状態
+        """
+        loop = asyncio.get_running_loop()
+        state = self._translator_local
+        if getattr(state, "loop", None) is not loop:
+            if getattr(state, "tx", None) is not None:
+                # 他のイベントループのクライアントはこのループからクローズできない
+                logger.debug("イベントループが変わったためTranslatorを再作成します")
+            state.loop = loop
+            state.lock = asyncio.Lock()
+            state.owner = None
+            state.tx = None
+            state.retired = []
+        return state
+
+    async def _get_translator(self) -> Any:
+        """現在のスレッド・イベントループ用のTranslatorを取得する
+
+        未作成の場合のみロックを取得して新しく作成し、以降は同じインスタンスを
+        再利用する。並行して呼び出されても作成されるTranslatorは1つだけとなる。
+
+        Returns:
+            翻訳に使用するTranslatorインスタンス
+        """
+        state = self._translator_state()
+        translator = state.tx
+        if translator is None:
+            async with state.lock:
+                if state.tx is None:
+                    owner = Translator()
+                    state.tx = await owner.__aenter__()
+                    state.owner = owner
+                    logger.debug("Translator作成: thread_id=%s", threading.get_ident())
+                translator = state.tx
+        return translator
+
+    def _discard_translator(self, translator: Any) -> None:
+        """翻訳に失敗したTranslatorを以降の取得対象から外す
+
+        同じTranslatorを並行して使用中の翻訳があるため、ここではクローズせず
+        参照を外すのみとし、HTTPクライアントは close() でまとめてクローズする。
+        既に別のTranslatorに置き換えられている場合は何もしない。
+
+        Args:
+            translator: 失敗した翻訳で使用したTranslator（未取得の場合はNone）
+        """
+        state = self._translator_local
+        if translator is None or getattr(state, "tx", None) is not translator:
+            return
+        state.retired.append(state.owner)
+        state.owner = None
+        state.tx = None
+
+    async def close(self) -> None:
+        """現在のスレッドで保持しているTranslatorのHTTPクライアントをクローズする
+
+        失敗により破棄したTranslatorも含めてクローズする。翻訳処理の終了時に、
+        Translatorを作成したのと同じイベントループ上で呼び出す。
+
+        Example:
+            >>> service = TranslationService()
+            >>> try:
+            ...     await service.translate_to_japanese("Hello")
+            ... finally:
+            ...     await service.close()
+        """
+        state = self._translator_local
+        owners = list(getattr(state, "retired", []))
+        if getattr(state, "owner", None) is not None:
+            owners.append(state.owner)
+        state.owner = None
+        state.tx = None
+        state.retired = []
+
+        for owner in owners:
+            try:
+                await owner.__aexit__(None, None, None)
+            except Exception as e:
+                logger.debug("Translatorクローズ時にエラー: %s", e)
+
+    def _get_cached_translation(self, text: str) -> str | None:
+        """キャッシュ済みの翻訳結果を取得する
+
+        Args:
+            text: 翻訳元テキスト
+
+        Returns:
+            キャッシュ済みの翻訳テキスト、未キャッシュの場合はNone
+        """
+        with self._cache_lock:
+            translated_text = self._cache.get(text)
+            if translated_text is None:
+                return None
+            self._cache.move_to_end(text)
+            self._stats["cache_hits"] += 1
+        return translated_text
+
+    def _store_cached_translation(self, text: str, translated_text: str) -> None:
+        """翻訳結果をキャッシュに保存する
+
+        最大件数を超えた場合は最も古く参照されたエントリを削除する。
+
+        Args:
+            text: 翻訳元テキスト
+            translated_text: 翻訳結果テキスト
+        """
+        if self.cache_size <= 0:
+            return
+
+        with self._cache_lock:
+            self._cache[text] = translated_text
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _get_retry_wait_time(self, attempt: int) -> float:
+        """リトライまでの待機時間を計算する
+
+        指数バックオフにジッターを加え、MAX_RETRY_DELAY で上限を設ける。
+
+        Args:
+            attempt: 失敗した試行回数（1始まり）
+
+        Returns:
+            待機時間（秒）
+
+        Example:
+            >>> service = TranslationService(retry_delay=1.0)
+            >>> service._get_retry_wait_time(3)  # 4.0〜4.5秒
+        """
+        backoff = self.retry_delay * (2 ** (attempt - 1))
+        jitter = random.uniform(0, min(0.5, self.retry_delay))
+        return float(min(backoff + jitter, self.MAX_RETRY_DELAY))
 
     async def translate_to_japanese(self, text: str | None) -> str:
         """英語テキストを日本語に翻訳する
@@ -87,10 +251,16 @@ class TranslationService:
         if not text or not text.strip():
             return ""
 
+        cached_text = self._get_cached_translation(text)
+        if cached_text is not None:
+            logger.debug("翻訳キャッシュヒット: %s文字", len(text))
+            return cached_text
+
         start_time = time.time()
         self._stats["total_requests"] += 1
 
         for attempt in range(1, self.max_retries + 1):
+            translator = None
             try:
                 logger.debug(
                     "翻訳開始: %s文字 (試行 %d/%d)",
@@ -100,11 +270,12 @@ class TranslationService:
                 )
 
                 # Google翻訳API呼び出し
-                async with Translator() as translator:
-                    result = await translator.translate(text, dest="ja", src="en")
+                translator = await self._get_translator()
+                result = await translator.translate(text, dest="ja", src="en")
 
                 # 翻訳結果取得
                 translated_text = result.text or text
+                self._store_cached_translation(text, translated_text)
 
                 # 統計情報更新
                 response_time = time.time() - start_time
@@ -131,9 +302,13 @@ class TranslationService:
                     e,
                 )
 
+                # 失敗したTranslatorは再利用せず、次の試行で作り直す
+                self._discard_translator(translator)
+
                 if attempt < self.max_retries:
-                    logger.debug("リトライまで %s秒待機", self.retry_delay)
-                    time.sleep(self.retry_delay)
+                    wait_time = self._get_retry_wait_time(attempt)
+                    logger.debug("リトライまで %.2f秒待機", wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
                     logger.error(
                         "翻訳失敗（リトライ上限到達）: %s...",
@@ -244,6 +419,7 @@ class TranslationService:
             "failed_translations": self._stats["failed_translations"],
             "success_rate": success_rate,
             "average_response_time": avg_response_time,
+            "cache_hits": self._stats["cache_hits"],
         }
 
     def _record_success(self, response_time: float) -> None:
@@ -282,10 +458,16 @@ class TranslationService:
         if not text or not text.strip():
             return ""
 
+        cached_text = self._get_cached_translation(text)
+        if cached_text is not None:
+            logger.debug("翻訳キャッシュヒット: %s文字", len(text))
+            return cached_text
+
         start_time = time.time()
         self._stats["total_requests"] += 1
 
         for attempt in range(1, self.max_retries + 1):
+            translator = None
             try:
                 logger.debug(
                     "非同期翻訳開始: %s文字 (試行 %d/%d)",
@@ -295,11 +477,12 @@ class TranslationService:
                 )
 
                 # Google翻訳API非同期呼び出し
-                async with Translator() as translator:
-                    result = await translator.translate(text, dest="ja", src="en")
+                translator = await self._get_translator()
+                result = await translator.translate(text, dest="ja", src="en")
 
                 # 翻訳結果取得
                 translated_text = result.text or text
+                self._store_cached_translation(text, translated_text)
 
                 # 統計情報更新
                 response_time = time.time() - start_time
@@ -326,9 +509,13 @@ class TranslationService:
                     e,
                 )
 
+                # 失敗したTranslatorは再利用せず、次の試行で作り直す
+                self._discard_translator(translator)
+
                 if attempt < self.max_retries:
-                    logger.debug("リトライまで %s秒待機", self.retry_delay)
-                    await asyncio.sleep(self.retry_delay)
+                    wait_time = self._get_retry_wait_time(attempt)
+                    logger.debug("リトライまで %.2f秒待機", wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
                     logger.error(
                         "非同期翻訳失敗（リトライ上限到達）: %s...",
@@ -0,0 +1,38 @@
+"""テスト共通設定
+
+テスト間で独立した共有メモリDBと読み取り専用のサンプルCSVを提供する
+"""
+
+from __future__ import annotations
+
+import uuid
+from pathlib import Path
+
+import pytest
+
+# スクリーニング結果CSV（BOM付き、3社分）。書き込み用にエンコード済みで保持する
+SAMPLE_CSV_CONTENT: bytes = '''\ufeff"コード","銘柄名","市場","現在値","前日比(%)"
+"1332","ニッスイ","東P","877.8","+3.5(+0.40%)"
+"1418","インターライフＨＬＤＧ","東S","405","-1.0(-0.25%)"
+"130A","Ｖｅｒｉｔａｓ　Ｉｎ　Ｓｉｌｉ","東G","646","-33.0(-4.86%)"'''.encode()
+
+
+@pytest.fixture
+def shared_memory_uri() -> str:
+    """テストごとに一意な名前を持つ共有キャッシュのメモリDB URI
+
+    固定名のURIは同一プロセス内で接続が残っていると別テストとDBを共有してしまうため、
+    UUIDで名前を分けてテスト間の状態を独立させる。
+    """
+    return f"file:memdb_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+
+@pytest.fixture(scope="session")
+def sample_csv(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """セッション内で1回だけ作成する読み取り専用のサンプルCSV
+
+    内容を変更するテストでは使用せず、tmp_path に個別のCSVを作成する。
+    """
+    csv_path: Path = tmp_path_factory.mktemp("csv") / "sample.csv"
+    csv_path.write_bytes(SAMPLE_CSV_CONTENT)
+    return str(csv_path)
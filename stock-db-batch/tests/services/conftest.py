@@ -0,0 +1,102 @@
+"""非同期サービステスト共通のフィクスチャ
+
+生成コストのかかるサービスをセッション内で共有する
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from types import SimpleNamespace
+
+import pytest
+
+from stock_batch.models.company import Company
+from stock_batch.services.stock_fetcher import StockFetcher
+from stock_batch.services.translation import TranslationService
+
+
+@pytest.fixture(scope="session")
+def stock_fetcher():
+    """テスト用StockFetcher"""
+    return StockFetcher()
+
+
+@pytest.fixture(scope="session")
+def translation_service():
+    """テスト用TranslationService"""
+    return TranslationService(max_retries=2, retry_delay=0.1)
+
+
+@pytest.fixture(scope="session")
+def base_companies():
+    """テスト用企業データリスト（セッション内で共有）
+
+    テストからは直接変更せず、コピーを返す派生フィクスチャ経由で利用する。
+    """
+    companies_data = [
+        ("1332.T", "日本水産", "Leading fisheries and food company"),
+        ("7203.T", "トヨタ自動車", "Global automotive manufacturer"),
+        ("6758.T", "ソニー", "Electronics and entertainment company"),
+        ("7267.T", "ホンダ", "Motorcycle and automotive manufacturer"),
+        ("6861.T", "キーエンス", "Industrial automation equipment company"),
+    ]
+    return [
+        Company(
+            symbol=symbol,
+            name=name,
+            market="Tokyo",
+            price=1000.0 + i * 100,
+            business_summary=summary,
+        )
+        for i, (symbol, name, summary) in enumerate(companies_data)
+    ]
+
+
+@pytest.fixture
+def mock_companies(base_companies):
+    """テスト用企業データリスト（5社）
+
+    パイプラインが stock_data / business_summary_ja を書き換えるため、
+    共有データの浅いコピーを返す。
+    """
+    return [copy.copy(company) for company in base_companies]
+
+
+@pytest.fixture
+def mock_companies_small(mock_companies):
+    """テスト用企業データリスト（先頭3社）"""
+    return mock_companies[:3]
+
+
+@pytest.fixture
+def mock_companies_lite(base_companies):
+    """symbolとbusiness_summaryのみを持つ軽量な企業データリスト"""
+    return [
+        SimpleNamespace(
+            symbol=company.symbol, business_summary=company.business_summary
+        )
+        for company in base_companies
+    ]
+
+
+@pytest.fixture
+def fast_sleep(monkeypatch):
+    """asyncio.sleepを実際には待機しない記録用スタブに差し替える
+
+    リトライ待機やレート制限の待機時間を消費せずにテストを実行する。
+    イベントループへの制御の受け渡しは維持する。
+
+    Returns:
+        要求された待機秒数のリスト（呼び出し順）
+    """
+    delays: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def record_sleep(delay, result=None):
+        delays.append(delay)
+        await real_sleep(0)
+        return result
+
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+    return delays
@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 import pytest
 
@@ -16,7 +16,7 @@ from stock_batch.services.async_batch_processor import AsyncBatchProcessor
 class TestAsyncBatchProcessor:
     """AsyncBatchProcessorのテストクラス"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def processor_config(self):
         """テスト用プロセッサ設定"""
         return {
@@ -28,49 +28,39 @@ class TestAsyncBatchProcessor:
         }
 
     @pytest.fixture
-    def mock_companies(self):
-        """テスト用企業データ"""
-        companies = []
-        for i in range(5):
-            mock_company = MagicMock()
-            mock_company.symbol = f"TEST{i}.T"
-            mock_company.business_summary = f"Test company {i}"
-            companies.append(mock_company)
-        return companies
-
-    def test_async_batch_processor_initialization(self, processor_config):
-        """AsyncBatchProcessor初期化テスト"""
-        processor = AsyncBatchProcessor(**processor_config)
+    def processor(self, processor_config):
+        """テスト用AsyncBatchProcessor
 
+        コールバックや進捗報告の設定をテスト間で持ち越さないよう、
+        生成コストの小さいプロセッサをテストごとに作成する
+        """
+        return AsyncBatchProcessor(**processor_config)
+
+    def test_async_batch_processor_initialization(self, processor):
+        """AsyncBatchProcessor初期化テスト"""
         assert processor.stock_workers == 1
         assert processor.translation_workers == 1
         assert processor.queue_max_size == 10
         assert processor.stock_rate_limit == 0.1
         assert processor.translation_rate_limit == 0.1
 
-    def test_queue_initialization(self, processor_config):
+    def test_queue_initialization(self, processor):
         """キュー初期化テスト"""
-        processor = AsyncBatchProcessor(**processor_config)
-
         # キューが初期化されていること
         assert processor.stock_queue is not None
         assert processor.translation_queue is not None
         assert processor.stock_queue.maxsize == 10
         assert processor.translation_queue.maxsize == 10
 
-    def test_semaphore_initialization(self, processor_config):
+    def test_semaphore_initialization(self, processor):
         """セマフォ初期化テスト"""
-        processor = AsyncBatchProcessor(**processor_config)
-
         # セマフォが正しく初期化されていること
         assert processor.stock_semaphore._value == 1
         assert processor.translation_semaphore._value == 1
 
     @pytest.mark.asyncio
-    async def test_start_and_stop_pipeline(self, processor_config):
+    async def test_start_and_stop_pipeline(self, processor):
         """パイプライン開始・停止テスト"""
-        processor = AsyncBatchProcessor(**processor_config)
-
         # パイプライン開始前は停止状態
         assert processor.is_running is False
 
@@ -83,9 +73,8 @@ class TestAsyncBatchProcessor:
         assert processor.is_running is False
 
     @pytest.mark.asyncio
-    async def test_basic_producer_consumer_flow(self, processor_config, mock_companies):
+    async def test_basic_producer_consumer_flow(self, processor, mock_companies_lite):
         """基本的なプロデューサー・コンシューマーフローテスト"""
-        processor = AsyncBatchProcessor(**processor_config)
 
         # モック関数設定
         async def mock_stock_fetcher(company):
@@ -105,7 +94,7 @@ class TestAsyncBatchProcessor:
         await processor.start_pipeline()
 
         # process_companies メソッドを使用してテスト
-        completed_companies = await processor.process_companies(mock_companies)
+        completed_companies = await processor.process_companies(mock_companies_lite)
 
         await processor.stop_pipeline()
 
@@ -116,9 +105,8 @@ class TestAsyncBatchProcessor:
             assert company.business_summary.startswith("翻訳済み:")
 
     @pytest.mark.asyncio
-    async def test_error_handling(self, processor_config):
+    async def test_error_handling(self, processor):
         """エラーハンドリングテスト"""
-        processor = AsyncBatchProcessor(**processor_config)
 
         # エラーを発生させるモック関数
         async def failing_stock_fetcher(company):
@@ -129,16 +117,12 @@ class TestAsyncBatchProcessor:
 
         await processor.start_pipeline()
 
-        # テストデータ投入
-        mock_company = MagicMock()
-        mock_company.symbol = "ERROR.T"
-        await processor.stock_queue.put(mock_company)
+        # テストデータと完了シグナルを投入（キューに空きがあるため待機不要）
+        processor.stock_queue.put_nowait(SimpleNamespace(symbol="ERROR.T"))
+        processor.stock_queue.put_nowait(None)
 
-        # 完了シグナル
-        await processor.stock_queue.put(None)
-
-        # 少し待機
-        await asyncio.sleep(0.3)
+        # 処理完了まで待機（ハング時はタイムアウトで失敗させる）
+        await asyncio.wait_for(processor.join_queues(), timeout=2.0)
 
         await processor.stop_pipeline()
 
@@ -146,11 +130,10 @@ class TestAsyncBatchProcessor:
         assert len(processor.errors) > 0
         assert "株価取得エラー" in str(processor.errors[0])
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
-    async def test_progress_reporting(self, processor_config, mock_companies):
+    async def test_progress_reporting(self, processor, mock_companies_lite):
         """進捗報告テスト"""
-        processor = AsyncBatchProcessor(**processor_config)
-
         # プログレス報告を有効化
         processor.enable_progress_reporting = True
         processor.progress_report_interval = 1  # 1件ごとに報告
@@ -165,19 +148,46 @@ class TestAsyncBatchProcessor:
 
         await processor.start_pipeline()
 
-        # テストデータ投入
-        for company in mock_companies:
-            await processor.stock_queue.put(company)
-
-        # 完了シグナル
-        for _ in range(processor.stock_workers):
-            await processor.stock_queue.put(None)
-
-        # 処理完了まで待機
-        await asyncio.sleep(1.0)
+        # テストデータ投入と株価取得完了待機（ハング時はタイムアウトで失敗させる）
+        await asyncio.wait_for(processor.submit_batch(mock_companies_lite), timeout=5.0)
 
         await processor.stop_pipeline()
 
-        # 進捗情報が記録されていること
+        # 全件の株価取得が完了し、進捗情報が記録されていること
+        assert processor.stats.stock_fetch_completed == len(mock_companies_lite)
         assert len(processor.progress_reports) > 0
         assert processor.progress_reports[0]["stage"] == "stock_fetch"
+
+    @pytest.mark.asyncio
+    async def test_submit_batch_requires_running_pipeline(
+        self, processor, mock_companies_lite
+    ):
+        """パイプライン停止中のsubmit_batchがエラーになることのテスト"""
+        with pytest.raises(RuntimeError):
+            await processor.submit_batch(mock_companies_lite)
+
+    @pytest.mark.asyncio
+    async def test_join_queues_waits_for_completion(
+        self, processor, mock_companies_lite
+    ):
+        """join_queuesが全データの処理完了まで待機することのテスト"""
+        processed = []
+
+        async def mock_stock_fetcher(company):
+            await asyncio.sleep(0.01)
+            processed.append(company.symbol)
+            return company
+
+        processor.stock_fetcher_func = mock_stock_fetcher
+
+        await processor.start_pipeline()
+        for company in mock_companies_lite:
+            await processor.stock_queue.put(company)
+        await processor.stock_queue.put(None)
+
+        await asyncio.wait_for(processor.join_queues(), timeout=5.0)
+        await processor.stop_pipeline()
+
+        assert len(processed) == len(mock_companies_lite)
+        assert processor.stock_queue.empty()
+        assert processor.translation_queue.empty()
@@ -6,62 +6,140 @@ AsyncBatchProcessorとStockFetcher、TranslationServiceの統合テスト
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+import copy
+import functools
+import inspect
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from typing import Any
+from unittest.mock import patch
 
 import pytest
 
 from stock_batch.models.company import Company
 from stock_batch.services.stock_fetcher import StockData
 from stock_batch.services.async_batch_processor import AsyncBatchProcessor
-from stock_batch.services.stock_fetcher import StockFetcher
-from stock_batch.services.translation import TranslationService
+
+
+# テスト用の英日翻訳対応表
+MOCK_TRANSLATIONS = {
+    "Leading fisheries and food company": "水産食品業界のリーディング企業",
+    "Global automotive manufacturer": "グローバル自動車メーカー",
+    "Electronics and entertainment company": "エレクトロニクス・エンターテインメント企業",
+    "Motorcycle and automotive manufacturer": "二輪・自動車メーカー",
+    "Industrial automation equipment company": "産業オートメーション機器企業",
+}
+
+
+def create_mock_stock_data(symbol: str) -> StockData:
+    """テスト用株価データを生成する
+
+    StockDataは変更可能なため、銘柄ごとにキャッシュした値のコピーを返す。
+    """
+    return copy.copy(_mock_stock_data(symbol))
+
+
+def create_varied_stock_data(symbol: str) -> StockData:
+    """銘柄ごとに値の異なるテスト用株価データを生成する（キャッシュのコピーを返す）"""
+    return copy.copy(_varied_stock_data(symbol))
+
+
+@functools.cache
+def _mock_stock_data(symbol: str) -> StockData:
+    """create_mock_stock_data 用の株価データ（銘柄ごとにキャッシュ）"""
+    return StockData(
+        symbol=symbol,
+        current_price=1500.0,
+        business_summary="Mock business summary for " + symbol,
+        volume=100000,
+        day_high=1800.0,
+        day_low=900.0,
+        sector="Mock Sector",
+        industry="Mock Industry",
+    )
+
+
+@functools.cache
+def _varied_stock_data(symbol: str) -> StockData:
+    """create_varied_stock_data 用の株価データ（銘柄ごとにキャッシュ）"""
+    symbol_hash = hash(symbol)
+    return StockData(
+        symbol=symbol,
+        current_price=1500.0 + symbol_hash % 500,
+        business_summary="Mock business summary for " + symbol,
+        volume=100000 + symbol_hash % 50000,
+        day_high=1800.0 + symbol_hash % 200,
+        day_low=900.0 + symbol_hash % 200,
+        sector="Mock Sector",
+        industry="Mock Industry",
+    )
+
+
+class CountingAsync:
+    """呼び出し回数を記録する非同期関数ラッパー
+
+    AsyncMockより軽量な、呼び出し回数のみを追跡するテスト用スタブ。
+
+    Attributes:
+        calls: 呼び出し回数
+        fn: ラップ対象の非同期関数
+    """
+
+    __slots__ = ("calls", "fn")
+
+    def __init__(self, fn: Callable[..., Awaitable[Any]]) -> None:
+        self.calls = 0
+        self.fn = fn
+
+    async def __call__(self, *args: Any) -> Any:
+        self.calls += 1
+        return await self.fn(*args)
+
+
+@contextmanager
+def pipeline_mocks(
+    processor: AsyncBatchProcessor, stock_func: Any, translate_func: Any
+) -> Iterator[None]:
+    """パイプラインの株価取得・翻訳メソッドをまとめて差し替える
+
+    Args:
+        processor: 対象のAsyncBatchProcessor
+        stock_func: fetch_stock_data_async の代替関数
+        translate_func: translate_to_japanese_async の代替関数
+    """
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch.object(processor.stock_fetcher, "fetch_stock_data_async", stock_func)
+        )
+        stack.enter_context(
+            patch.object(
+                processor.translation_service,
+                "translate_to_japanese_async",
+                translate_func,
+            )
+        )
+        yield
 
 
 class TestAsyncPipelineIntegration:
     """パイプライン統合機能のテストクラス"""
 
-    @pytest.fixture
-    def mock_companies(self):
-        """テスト用企業データリスト"""
-        companies = []
-        symbols = ["1332.T", "7203.T", "6758.T", "7267.T", "6861.T"]
-        names = ["日本水産", "トヨタ自動車", "ソニー", "ホンダ", "キーエンス"]
-        summaries = [
-            "Leading fisheries and food company",
-            "Global automotive manufacturer",
-            "Electronics and entertainment company",
-            "Motorcycle and automotive manufacturer",
-            "Industrial automation equipment company",
-        ]
-        
-        for i, (symbol, name, summary) in enumerate(zip(symbols, names, summaries)):
-            company = Company(
-                symbol=symbol,
-                name=name,
-                market="Tokyo",
-                price=1000.0 + i * 100,
-                business_summary=summary,
-            )
-            companies.append(company)
-        return companies
-
-    @pytest.fixture
-    def stock_fetcher(self):
-        """テスト用StockFetcher"""
-        return StockFetcher()
-
-    @pytest.fixture
-    def translation_service(self):
-        """テスト用TranslationService"""
-        return TranslationService(max_retries=2, retry_delay=0.1)
-
-    @pytest.fixture
-    def async_processor(self, stock_fetcher, translation_service):
-        """テスト用AsyncBatchProcessor"""
+    @pytest.fixture(
+        params=[(2, 2, 10), (5, 5, 20)],
+        ids=["workers2", "workers5"],
+    )
+    def async_processor(self, request, stock_fetcher, translation_service):
+        """テスト用AsyncBatchProcessor
+
+        (株価取得ワーカー数, 翻訳ワーカー数, キューサイズ) の組み合わせで
+        パラメータ化する。設定をテスト間で持ち越さないようテストごとに作成する
+        """
+        stock_workers, translation_workers, queue_max_size = request.param
         return AsyncBatchProcessor(
-            stock_workers=2,
-            translation_workers=2,
-            queue_max_size=10,
+            stock_workers=stock_workers,
+            translation_workers=translation_workers,
+            queue_max_size=queue_max_size,
             stock_fetcher=stock_fetcher,
             translation_service=translation_service,
         )
@@ -72,42 +150,16 @@ class TestAsyncPipelineIntegration:
     ):
         """エンドツーエンドパイプライン処理テスト"""
         # StockFetcherのモック設定
-        def create_mock_stock_data(symbol):
-            stock_data = StockData(
-                symbol=symbol,
-                current_price=1500.0 + hash(symbol) % 500,
-                business_summary="Mock business summary for " + symbol,
-                volume=100000 + hash(symbol) % 50000,
-                day_high=1800.0 + hash(symbol) % 200,
-                day_low=900.0 + hash(symbol) % 200,
-                sector="Mock Sector",
-                industry="Mock Industry",
-            )
-            return stock_data
-
-        mock_stock_fetcher_async = AsyncMock()
-        mock_stock_fetcher_async.side_effect = lambda symbol: create_mock_stock_data(symbol)
+        async def mock_stock_fetcher_async(symbol):
+            return create_varied_stock_data(symbol)
 
         # TranslationServiceのモック設定
-        def create_mock_translation(text):
-            translations = {
-                "Leading fisheries and food company": "水産食品業界のリーディング企業",
-                "Global automotive manufacturer": "グローバル自動車メーカー",
-                "Electronics and entertainment company": "エレクトロニクス・エンターテインメント企業",
-                "Motorcycle and automotive manufacturer": "二輪・自動車メーカー",
-                "Industrial automation equipment company": "産業オートメーション機器企業",
-            }
-            return translations.get(text, f"翻訳済み: {text}")
-
-        mock_translation_async = AsyncMock()
-        mock_translation_async.side_effect = create_mock_translation
-
-        with patch.object(
-            async_processor.stock_fetcher, "fetch_stock_data_async", mock_stock_fetcher_async
-        ), patch.object(
-            async_processor.translation_service, "translate_to_japanese_async", mock_translation_async
+        async def mock_translation_async(text):
+            return MOCK_TRANSLATIONS.get(text, f"翻訳済み: {text}")
+
+        with pipeline_mocks(
+            async_processor, mock_stock_fetcher_async, mock_translation_async
         ):
-            
             # パイプライン実行
             results = await async_processor.process_pipeline(mock_companies)
 
@@ -130,38 +182,26 @@ class TestAsyncPipelineIntegration:
         self, async_processor, mock_companies
     ):
         """株価取得エラー時のパイプライン処理テスト"""
-        call_count = 0
-
         async def mock_stock_fetch_with_errors(symbol):
-            nonlocal call_count
-            call_count += 1
             if "1332" in symbol:  # 特定の銘柄でエラー
                 raise Exception(f"Stock fetch error for {symbol}")
             
-            return StockData(
-                symbol=symbol,
-                current_price=1500.0,
-                business_summary="Mock business summary for " + symbol,
-                volume=100000,
-                day_high=1800.0,
-                day_low=900.0,
-                sector="Mock Sector",
-                industry="Mock Industry",
-            )
+            return create_mock_stock_data(symbol)
 
-        mock_translation_async = AsyncMock()
-        mock_translation_async.side_effect = lambda text: f"翻訳済み: {text}"
+        async def mock_translation_async(text):
+            return f"翻訳済み: {text}"
 
-        with patch.object(
-            async_processor.stock_fetcher, "fetch_stock_data_async", mock_stock_fetch_with_errors
-        ), patch.object(
-            async_processor.translation_service, "translate_to_japanese_async", mock_translation_async
-        ):
-            
+        stock_tracker = CountingAsync(mock_stock_fetch_with_errors)
+        translation_tracker = CountingAsync(mock_translation_async)
+
+        with pipeline_mocks(async_processor, stock_tracker, translation_tracker):
             results = await async_processor.process_pipeline(mock_companies)
 
         # エラーがあっても処理が続行されることを確認
         assert len(results) == 5
+        # 株価取得エラーの企業も含め、全社分の呼び出しが行われる
+        assert stock_tracker.calls == 5
+        assert translation_tracker.calls == 5
         # エラーのあった企業もリストに含まれる（stock_dataがNone）
         error_company = next((r for r in results if r.symbol == "1332.T"), None)
         assert error_company is not None
@@ -173,32 +213,17 @@ class TestAsyncPipelineIntegration:
         self, async_processor, mock_companies
     ):
         """翻訳エラー時のパイプライン処理テスト"""
-        def create_mock_stock_data(symbol):
-            return StockData(
-                symbol=symbol,
-                current_price=1500.0,
-                business_summary="Mock business summary for " + symbol,
-                volume=100000,
-                day_high=1800.0,
-                day_low=900.0,
-                sector="Mock Sector",
-                industry="Mock Industry",
-            )
-
         async def mock_translation_with_errors(text):
             if "Leading fisheries" in text:  # 特定のテキストでエラー
                 raise Exception(f"Translation error for: {text}")
             return f"翻訳済み: {text}"
 
-        mock_stock_fetcher_async = AsyncMock()
-        mock_stock_fetcher_async.side_effect = create_mock_stock_data
+        async def mock_stock_fetcher_async(symbol):
+            return create_mock_stock_data(symbol)
 
-        with patch.object(
-            async_processor.stock_fetcher, "fetch_stock_data_async", mock_stock_fetcher_async
-        ), patch.object(
-            async_processor.translation_service, "translate_to_japanese_async", mock_translation_with_errors
+        with pipeline_mocks(
+            async_processor, mock_stock_fetcher_async, mock_translation_with_errors
         ):
-            
             results = await async_processor.process_pipeline(mock_companies)
 
         # エラーがあっても処理が続行されることを確認
@@ -216,30 +241,18 @@ class TestAsyncPipelineIntegration:
         # モック設定
         async def mock_stock_fetch_with_delay(symbol):
             await asyncio.sleep(0.01)  # 小さな遅延でリアルな処理時間をシミュレート
-            return StockData(
-                symbol=symbol,
-                current_price=1500.0,
-                business_summary="Mock business summary for " + symbol,
-                volume=100000,
-                day_high=1800.0,
-                day_low=900.0,
-                sector="Mock Sector",
-                industry="Mock Industry",
-            )
+            return create_mock_stock_data(symbol)
 
         async def mock_translation_with_delay(text):
             await asyncio.sleep(0.01)  # 小さな遅延
             return f"翻訳済み: {text}"
 
-        with patch.object(
-            async_processor.stock_fetcher, "fetch_stock_data_async", mock_stock_fetch_with_delay
-        ), patch.object(
-            async_processor.translation_service, "translate_to_japanese_async", mock_translation_with_delay
+        with pipeline_mocks(
+            async_processor, mock_stock_fetch_with_delay, mock_translation_with_delay
         ):
-            
-            start_time = asyncio.get_event_loop().time()
+            start_time = time.perf_counter()
             results = await async_processor.process_pipeline(mock_companies)
-            end_time = asyncio.get_event_loop().time()
+            end_time = time.perf_counter()
 
         # 処理時間の検証（並列処理により高速化されているはず）
         processing_time = end_time - start_time
@@ -253,41 +266,26 @@ class TestAsyncPipelineIntegration:
 
     @pytest.mark.asyncio
     async def test_pipeline_concurrent_processing(
-        self, stock_fetcher, translation_service, mock_companies
+        self, async_processor, mock_companies
     ):
         """並行処理数制限のテスト"""
-        # より高い並行数で処理
-        high_concurrency_processor = AsyncBatchProcessor(
-            stock_workers=5,
-            translation_workers=5,
-            queue_max_size=20,
-            stock_fetcher=stock_fetcher,
-            translation_service=translation_service,
-        )
+        active = 0
+        max_active = 0
 
-        # モック設定
+        # モック設定（同時実行数を記録）
         async def mock_stock_fetch(symbol):
-            return StockData(
-                symbol=symbol,
-                current_price=1500.0,
-                business_summary="Mock business summary for " + symbol,
-                volume=100000,
-                day_high=1800.0,
-                day_low=900.0,
-                sector="Mock Sector",
-                industry="Mock Industry",
-            )
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return create_mock_stock_data(symbol)
 
         async def mock_translation(text):
             return f"翻訳済み: {text}"
 
-        with patch.object(
-            high_concurrency_processor.stock_fetcher, "fetch_stock_data_async", mock_stock_fetch
-        ), patch.object(
-            high_concurrency_processor.translation_service, "translate_to_japanese_async", mock_translation
-        ):
-            
-            results = await high_concurrency_processor.process_pipeline(mock_companies)
+        with pipeline_mocks(async_processor, mock_stock_fetch, mock_translation):
+            results = await async_processor.process_pipeline(mock_companies)
 
         # 結果検証
         assert len(results) == 5
@@ -295,6 +293,11 @@ class TestAsyncPipelineIntegration:
             assert result.stock_data is not None
             assert result.business_summary_ja is not None
 
+        # 同時実行数がワーカー数の上限を超えないこと
+        assert 1 < max_active <= min(
+            async_processor.stock_workers, async_processor.translation_workers
+        )
+
     @pytest.mark.asyncio
     async def test_empty_company_list_pipeline(self, async_processor):
         """空の企業リストでのパイプライン処理テスト"""
@@ -314,26 +317,12 @@ class TestAsyncPipelineIntegration:
 
         # モック設定
         async def mock_stock_fetch(symbol):
-            return StockData(
-                symbol=symbol,
-                current_price=1500.0,
-                business_summary="Mock business summary for " + symbol,
-                volume=100000,
-                day_high=1800.0,
-                day_low=900.0,
-                sector="Mock Sector",
-                industry="Mock Industry",
-            )
+            return create_mock_stock_data(symbol)
 
         async def mock_translation(text):
             return "水産食品業界のリーディング企業"
 
-        with patch.object(
-            async_processor.stock_fetcher, "fetch_stock_data_async", mock_stock_fetch
-        ), patch.object(
-            async_processor.translation_service, "translate_to_japanese_async", mock_translation
-        ):
-            
+        with pipeline_mocks(async_processor, mock_stock_fetch, mock_translation):
             results = await async_processor.process_pipeline([company])
 
         # 結果検証
@@ -349,7 +338,6 @@ class TestAsyncPipelineIntegration:
         assert hasattr(async_processor, "process_pipeline")
         
         # メソッドがコルーチン関数であることを確認
-        import inspect
         assert inspect.iscoroutinefunction(async_processor.process_pipeline)
 
     @pytest.mark.asyncio
@@ -365,16 +353,7 @@ class TestAsyncPipelineIntegration:
             call_count_stock += 1
             if call_count_stock % 2 == 0:  # 偶数回目はエラー
                 raise Exception(f"Stock fetch error for {symbol}")
-            return StockData(
-                symbol=symbol,
-                current_price=1500.0,
-                business_summary="Mock business summary for " + symbol,
-                volume=100000,
-                day_high=1800.0,
-                day_low=900.0,
-                sector="Mock Sector",
-                industry="Mock Industry",
-            )
+            return create_mock_stock_data(symbol)
 
         async def mock_translation_mixed(text):
             nonlocal call_count_translation
@@ -383,12 +362,9 @@ class TestAsyncPipelineIntegration:
                 raise Exception(f"Translation error for: {text}")
             return f"翻訳済み: {text}"
 
-        with patch.object(
-            async_processor.stock_fetcher, "fetch_stock_data_async", mock_stock_fetch_mixed
-        ), patch.object(
-            async_processor.translation_service, "translate_to_japanese_async", mock_translation_mixed
+        with pipeline_mocks(
+            async_processor, mock_stock_fetch_mixed, mock_translation_mixed
         ):
-            
             results = await async_processor.process_pipeline(mock_companies)
 
         # エラーがあっても全ての企業が処理されることを確認
@@ -6,16 +6,108 @@ StockFetcherの非同期機能をテストする
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import MagicMock, patch
+import functools
+import inspect
+from types import SimpleNamespace
+from typing import Any
 
 import pytest
 
 from stock_batch.services.stock_fetcher import StockFetcher
 
+# 応答未設定の銘柄が返す株価
+DEFAULT_PRICE = 100.0
 
+# 既定の株価履歴（1日分）と企業情報
+DEFAULT_HIST_ROW = {"Close": DEFAULT_PRICE, "Volume": 1000, "High": 110.0, "Low": 90.0}
+DEFAULT_INFO = {"longBusinessSummary": "Test summary"}
+
+
+@functools.cache
+def _history_row(price: float) -> dict[str, Any]:
+    """指定価格の株価履歴の1行を生成する（価格ごとにキャッシュ）"""
+    if price == DEFAULT_PRICE:
+        return DEFAULT_HIST_ROW
+    return DEFAULT_HIST_ROW | {"Close": price, "High": price + 10, "Low": price - 10}
+
+
+def make_history(price: float) -> SimpleNamespace:
+    """指定価格の株価履歴を生成する（キャッシュした行のコピーを使う）"""
+    return SimpleNamespace(empty=False, iloc=[dict(_history_row(price))])
+
+
+def make_ticker(price: float) -> SimpleNamespace:
+    """既定の企業情報を持つTickerを生成する"""
+    return make_ticker_with_info(price, DEFAULT_INFO)
+
+
+def make_ticker_with_info(price: float, info: dict[str, Any]) -> SimpleNamespace:
+    """指定価格・企業情報のTickerを生成する
+
+    テストでの変更が他のテストに影響しないよう、企業情報と履歴はコピーを渡す。
+    """
+    hist = make_history(price)
+    return SimpleNamespace(info=dict(info), history=lambda *args, **kwargs: hist)
+
+
+class FakeYFinance:
+    """yfinance.Tickerを差し替える軽量なフェイク
+
+    銘柄ごとの応答（価格、例外、またはそれらを呼び出し順に並べたリスト）を
+    set_behavior で設定する。未設定の銘柄は DEFAULT_PRICE を返す。
+    """
+
+    def __init__(self) -> None:
+        self.behaviors: dict[str, Any] = {}
+        self.info: dict[str, Any] | None = None
+        self.calls = 0
+        self.sessions: list[Any] = []
+
+    def set_behavior(
+        self, behaviors: dict[str, Any], info: dict[str, Any] | None = None
+    ) -> None:
+        """銘柄ごとの応答と企業情報を設定し、呼び出し回数をリセットする"""
+        self.behaviors = {
+            symbol: list(outcome) if isinstance(outcome, list) else outcome
+            for symbol, outcome in behaviors.items()
+        }
+        self.info = info
+        self.calls = 0
+        self.sessions = []
+
+    def ticker(self, symbol: str, session: Any = None) -> SimpleNamespace:
+        """yfinance.Tickerの代替（渡されたセッションを記録する）"""
+        self.calls += 1
+        self.sessions.append(session)
+        outcome = self.behaviors.get(symbol, DEFAULT_PRICE)
+        if isinstance(outcome, list):
+            outcome = outcome.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        if self.info is None:
+            return make_ticker(outcome)
+        return make_ticker_with_info(outcome, self.info)
+
+
+@pytest.mark.usefixtures("fast_sleep")
 class TestAsyncStockFetcher:
     """非同期株価取得機能のテストクラス"""
 
+    @pytest.fixture(scope="module")
+    def fake_yfinance(self):
+        """モジュール内で一度だけyfinance.Tickerをフェイクに差し替える"""
+        fake = FakeYFinance()
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr("yfinance.Ticker", fake.ticker)
+            yield fake
+
+    @pytest.fixture(autouse=True)
+    def fake_yf(self, fake_yfinance):
+        """応答設定をリセットしたyfinanceフェイク"""
+        fake_yfinance.set_behavior({})
+        return fake_yfinance
+
     @pytest.fixture
     def stock_fetcher(self):
         """テスト用StockFetcher"""
@@ -24,41 +116,35 @@ class TestAsyncStockFetcher:
     @pytest.fixture
     def mock_company(self):
         """テスト用企業データ"""
-        company = MagicMock()
-        company.symbol = "1332.T"  # 有効な日本株式シンボル
-        company.business_summary = "Test company"
-        return company
+        # 有効な日本株式シンボルを使用
+        return SimpleNamespace(symbol="1332.T", business_summary="Test company")
 
     @pytest.fixture
     def mock_companies(self):
         """テスト用企業データリスト"""
-        companies = []
         # 有効な日本株式シンボル形式を使用
         symbols = ["1332.T", "7203.T", "6758.T", "9437.T", "9984.T"]
-        for i, symbol in enumerate(symbols):
-            company = MagicMock()
-            company.symbol = symbol
-            company.business_summary = f"Test company {i}"
-            companies.append(company)
-        return companies
+        return [
+            SimpleNamespace(symbol=symbol, business_summary=f"Test company {i}")
+            for i, symbol in enumerate(symbols)
+        ]
 
     @pytest.mark.asyncio
-    async def test_fetch_stock_data_async_success(self, stock_fetcher, mock_company):
+    async def test_fetch_stock_data_async_success(
+        self, stock_fetcher, mock_company, fake_yf
+    ):
         """非同期株価取得成功テスト"""
         # yfinanceのモック
-        mock_ticker = MagicMock()
-        mock_hist = MagicMock()
-        mock_hist.empty = False
-        mock_hist.iloc = [{"Close": 100.0, "Volume": 1000, "High": 110.0, "Low": 90.0}]
-        mock_ticker.history.return_value = mock_hist
-        mock_ticker.info = {
-            "longBusinessSummary": "Test business summary",
-            "sector": "Technology",
-            "industry": "Software",
-        }
+        fake_yf.set_behavior(
+            {},
+            info={
+                "longBusinessSummary": "Test business summary",
+                "sector": "Technology",
+                "industry": "Software",
+            },
+        )
 
-        with patch("yfinance.Ticker", return_value=mock_ticker):
-            stock_data = await stock_fetcher.fetch_stock_data_async(mock_company.symbol)
+        stock_data = await stock_fetcher.fetch_stock_data_async(mock_company.symbol)
 
         # 結果検証
         assert stock_data is not None
@@ -70,79 +156,57 @@ class TestAsyncStockFetcher:
 
     @pytest.mark.asyncio
     async def test_fetch_stock_data_async_error_handling(
-        self, stock_fetcher, mock_company
+        self, stock_fetcher, mock_company, fake_yf
     ):
         """非同期株価取得エラーハンドリングテスト"""
         # yfinanceでエラーが発生するモック
-        with patch("yfinance.Ticker", side_effect=Exception("Network error")):
-            stock_data = await stock_fetcher.fetch_stock_data_async(mock_company.symbol)
+        fake_yf.set_behavior({mock_company.symbol: Exception("Network error")})
+
+        stock_data = await stock_fetcher.fetch_stock_data_async(mock_company.symbol)
 
         # エラー時はNoneが返されること
         assert stock_data is None
 
     @pytest.mark.asyncio
     async def test_fetch_stock_data_async_retry_mechanism(
-        self, stock_fetcher, mock_company
+        self, stock_fetcher, mock_company, fake_yf, fast_sleep
     ):
         """非同期株価取得リトライメカニズムテスト"""
-        call_count = 0
-
-        def mock_ticker_with_retry(symbol):
-            nonlocal call_count
-            call_count += 1
-            if call_count < 2:
-                raise Exception("Temporary error")
-
-            # 2回目は成功
-            mock_ticker = MagicMock()
-            mock_hist = MagicMock()
-            mock_hist.empty = False
-            mock_hist.iloc = [
-                {"Close": 100.0, "Volume": 1000, "High": 110.0, "Low": 90.0}
-            ]
-            mock_ticker.history.return_value = mock_hist
-            mock_ticker.info = {"longBusinessSummary": "Test summary"}
-            return mock_ticker
+        # レート制限の待機を除外し、リトライ待機のみを記録する
+        stock_fetcher.rate_limit_delay = 0.0
+        # 1回目は一時エラー、2回目は成功
+        fake_yf.set_behavior(
+            {mock_company.symbol: [Exception("Temporary error"), 100.0]}
+        )
 
-        with patch("yfinance.Ticker", side_effect=mock_ticker_with_retry):
-            stock_data = await stock_fetcher.fetch_stock_data_async(mock_company.symbol)
+        stock_data = await stock_fetcher.fetch_stock_data_async(mock_company.symbol)
 
         # リトライ後に成功すること
         assert stock_data is not None
         assert stock_data.current_price == 100.0
-        assert call_count == 2
+        assert fake_yf.calls == 2
+        # 1回のリトライにつき retry_delay だけ待機が要求されること
+        assert fast_sleep == [stock_fetcher.retry_delay]
 
     @pytest.mark.asyncio
     async def test_fetch_multiple_stocks_async_success(
-        self, stock_fetcher, mock_companies
+        self, stock_fetcher, mock_companies, fake_yf
     ):
         """複数株価非同期取得成功テスト"""
-
-        # yfinanceのモック
-        def create_mock_ticker(symbol):
-            mock_ticker = MagicMock()
-            mock_hist = MagicMock()
-            mock_hist.empty = False
-            # シンボルごとに異なる価格を設定
-            symbol_prices = {
+        # シンボルごとに異なる価格を設定
+        fake_yf.set_behavior(
+            {
                 "1332.T": 100.0,
                 "7203.T": 110.0,
                 "6758.T": 120.0,
                 "9437.T": 130.0,
                 "9984.T": 140.0,
             }
-            price = symbol_prices.get(symbol, 100.0)
-            mock_hist.iloc = [
-                {"Close": price, "Volume": 1000, "High": price + 10, "Low": price - 10}
-            ]
-            mock_ticker.history.return_value = mock_hist
-            mock_ticker.info = {"longBusinessSummary": f"Business summary for {symbol}"}
-            return mock_ticker
+        )
 
-        with patch("yfinance.Ticker", side_effect=create_mock_ticker):
-            stock_data_list = await stock_fetcher.fetch_multiple_stocks_async(
-                [company.symbol for company in mock_companies]
-            )
+        stock_data_list = await stock_fetcher.fetch_multiple_stocks_async(
+            [company.symbol for company in mock_companies]
+        )
 
         # 結果検証
         assert len(stock_data_list) == 5
@@ -156,51 +220,71 @@ class TestAsyncStockFetcher:
             assert stock_data.symbol in symbols
 
     @pytest.mark.asyncio
-    async def test_fetch_multiple_stocks_async_with_errors(self, stock_fetcher):
+    async def test_fetch_multiple_stocks_async_with_errors(
+        self, stock_fetcher, fake_yf
+    ):
         """複数株価非同期取得（一部エラー）テスト"""
-
-        def create_mock_ticker_with_errors(symbol):
-            if symbol == "9999.T":  # エラーシンボル
-                raise Exception("Network error")
-
-            mock_ticker = MagicMock()
-            mock_hist = MagicMock()
-            mock_hist.empty = False
-            mock_hist.iloc = [
-                {"Close": 100.0, "Volume": 1000, "High": 110.0, "Low": 90.0}
-            ]
-            mock_ticker.history.return_value = mock_hist
-            mock_ticker.info = {"longBusinessSummary": f"Business summary for {symbol}"}
-            return mock_ticker
+        # エラーシンボル
+        fake_yf.set_behavior({"9999.T": Exception("Network error")})
 
         symbols = ["1332.T", "9999.T", "7203.T"]
 
-        with patch("yfinance.Ticker", side_effect=create_mock_ticker_with_errors):
-            stock_data_list = await stock_fetcher.fetch_multiple_stocks_async(symbols)
+        stock_data_list = await stock_fetcher.fetch_multiple_stocks_async(symbols)
 
         # エラーの株式を除いて2件成功すること
         assert len(stock_data_list) == 2
         assert all(data.current_price == 100.0 for data in stock_data_list)
 
     @pytest.mark.asyncio
-    async def test_fetch_stocks_with_rate_limit(self, stock_fetcher, mock_companies):
+    async def test_fetch_multiple_stocks_async_skips_raised_exceptions(
+        self, stock_fetcher, monkeypatch
+    ):
+        """1銘柄の取得で例外が送出されても他の銘柄の結果が返されることのテスト"""
+        fetch_stock_data_async = stock_fetcher.fetch_stock_data_async
+
+        async def fetch_or_raise(symbol):
+            if symbol == "9999.T":
+                raise RuntimeError("Unexpected error")
+            return await fetch_stock_data_async(symbol)
+
+        monkeypatch.setattr(stock_fetcher, "fetch_stock_data_async", fetch_or_raise)
+
+        stock_data_list = await stock_fetcher.fetch_multiple_stocks_async(
+            ["1332.T", "9999.T", "7203.T"]
+        )
+
+        # 例外の銘柄のみ除外され、他のタスクはキャンセルされないこと
+        assert sorted(data.symbol for data in stock_data_list) == ["1332.T", "7203.T"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_multiple_stocks_async_reuses_session(
+        self, mock_companies, fake_yf
+    ):
+        """複数株価取得で単一のHTTPセッションが使い回されることのテスト"""
+        session = object()
+        stock_fetcher = StockFetcher(rate_limit_delay=0.05, session=session)
+
+        stock_data_list = await stock_fetcher.fetch_multiple_stocks_async(
+            [company.symbol for company in mock_companies]
+        )
+
+        # 全銘柄のTickerに同一のセッションが渡されること
+        assert len(stock_data_list) == 5
+        assert len(fake_yf.sessions) == 5
+        assert all(used is session for used in fake_yf.sessions)
+
+    @pytest.mark.asyncio
+    async def test_fetch_stocks_with_rate_limit(
+        self, stock_fetcher, mock_companies, fast_sleep
+    ):
         """レート制限付き株価取得テスト"""
-        # モック設定
-        def create_mock_ticker(symbol):
-            mock_ticker = MagicMock()
-            mock_hist = MagicMock()
-            mock_hist.empty = False
-            mock_hist.iloc = [
-                {"Close": 100.0, "Volume": 1000, "High": 110.0, "Low": 90.0}
-            ]
-            mock_ticker.history.return_value = mock_hist
-            mock_ticker.info = {"longBusinessSummary": "Test summary"}
-            return mock_ticker
+        stock_data_list = await stock_fetcher.fetch_multiple_stocks_async(
+            [company.symbol for company in mock_companies[:3]]  # 3件のテスト
+        )
 
-        with patch("yfinance.Ticker", side_effect=create_mock_ticker):
-            stock_data_list = await stock_fetcher.fetch_multiple_stocks_async(
-                [company.symbol for company in mock_companies[:3]]  # 3件のテスト
-            )
+        # 2件目以降はレート制限の待機が要求されること
+        assert len(fast_sleep) >= 2
+        assert all(0 < delay <= stock_fetcher.rate_limit_delay for delay in fast_sleep)
 
         # 結果検証
         assert len(stock_data_list) == 3
@@ -213,22 +297,13 @@ class TestAsyncStockFetcher:
         """並行株価取得テスト"""
         symbols = ["1332.T", "7203.T", "6758.T"]
 
-        # モック設定
-        def create_mock_ticker(symbol):
-            mock_ticker = MagicMock()
-            mock_hist = MagicMock()
-            mock_hist.empty = False
-            mock_hist.iloc = [
-                {"Close": 100.0, "Volume": 1000, "High": 110.0, "Low": 90.0}
+        # 並行実行
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(stock_fetcher.fetch_stock_data_async(symbol))
+                for symbol in symbols
             ]
-            mock_ticker.history.return_value = mock_hist
-            mock_ticker.info = {"longBusinessSummary": "Test summary"}
-            return mock_ticker
-
-        with patch("yfinance.Ticker", side_effect=create_mock_ticker):
-            # 並行実行
-            tasks = [stock_fetcher.fetch_stock_data_async(symbol) for symbol in symbols]
-            results = await asyncio.gather(*tasks)
+        results = [task.result() for task in tasks]
 
         # 結果検証
         assert len(results) == 3
@@ -237,15 +312,11 @@ class TestAsyncStockFetcher:
 
     def test_validate_async_methods_exist(self, stock_fetcher):
         """非同期メソッドの存在確認テスト"""
-        # 非同期メソッドが定義されていることを確認
-        assert hasattr(stock_fetcher, "fetch_stock_data_async")
-        assert hasattr(stock_fetcher, "fetch_multiple_stocks_async")
-
-        # メソッドがコルーチン関数であることを確認
-        import inspect
-
-        assert inspect.iscoroutinefunction(stock_fetcher.fetch_stock_data_async)
-        assert inspect.iscoroutinefunction(stock_fetcher.fetch_multiple_stocks_async)
+        # 非同期メソッドが定義され、コルーチン関数であることを確認
+        for name in ("fetch_stock_data_async", "fetch_multiple_stocks_async"):
+            method = getattr(stock_fetcher, name, None)
+            assert method is not None, name
+            assert inspect.iscoroutinefunction(method), name
 
     @pytest.mark.asyncio
     async def test_async_stats_tracking(self, stock_fetcher, mock_company):
@@ -254,16 +325,7 @@ class TestAsyncStockFetcher:
         initial_stats = stock_fetcher.get_stats()
         assert initial_stats["total_requests"] == 0
 
-        # モック設定
-        mock_ticker = MagicMock()
-        mock_hist = MagicMock()
-        mock_hist.empty = False
-        mock_hist.iloc = [{"Close": 100.0, "Volume": 1000, "High": 110.0, "Low": 90.0}]
-        mock_ticker.history.return_value = mock_hist
-        mock_ticker.info = {"longBusinessSummary": "Test summary"}
-
-        with patch("yfinance.Ticker", return_value=mock_ticker):
-            await stock_fetcher.fetch_stock_data_async(mock_company.symbol)
+        await stock_fetcher.fetch_stock_data_async(mock_company.symbol)
 
         # 統計が更新されていることを確認
         final_stats = stock_fetcher.get_stats()
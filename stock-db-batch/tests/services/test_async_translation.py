@@ -6,13 +6,16 @@ TranslationServiceの非同期機能をテストする
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+import inspect
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from stock_batch.services.translation import TranslationService
 
 
+@pytest.mark.usefixtures("fast_sleep")
 class TestAsyncTranslation:
     """非同期翻訳機能のテストクラス"""
 
@@ -21,18 +24,31 @@ class TestAsyncTranslation:
         """テスト用TranslationService"""
         return TranslationService(max_retries=2, retry_delay=0.1)
 
+    @pytest.fixture
+    def translator_class(self, monkeypatch):
+        """googletrans.Translatorを差し替えるモッククラス"""
+        translator_class = MagicMock()
+        translator_class.return_value.__aenter__.return_value = AsyncMock()
+        monkeypatch.setattr(
+            "stock_batch.services.translation.Translator", translator_class
+        )
+        return translator_class
+
+    @pytest.fixture
+    def fake_translator(self, translator_class):
+        """async with Translator() で得られる翻訳モック"""
+        return translator_class.return_value.__aenter__.return_value
+
     @pytest.fixture
     def mock_company(self):
         """テスト用企業データ"""
-        company = MagicMock()
-        company.symbol = "1332.T"
-        company.business_summary = "Test business summary in English"
-        return company
+        return SimpleNamespace(
+            symbol="1332.T", business_summary="Test business summary in English"
+        )
 
     @pytest.fixture
     def mock_companies(self):
         """テスト用企業データリスト"""
-        companies = []
         summaries = [
             "Technology company specializing in software",
             "Manufacturing company with global presence", 
@@ -40,55 +56,44 @@ class TestAsyncTranslation:
             "Retail chain with multiple locations",
             "Healthcare solutions company",
         ]
-        for i, summary in enumerate(summaries):
-            company = MagicMock()
-            company.symbol = f"{1332 + i}.T"
-            company.business_summary = summary
-            companies.append(company)
-        return companies
+        return [
+            SimpleNamespace(symbol=f"{1332 + i}.T", business_summary=summary)
+            for i, summary in enumerate(summaries)
+        ]
 
     @pytest.mark.asyncio
     async def test_translate_to_japanese_async_success(
-        self, translation_service, mock_company
+        self, translation_service, mock_company, fake_translator
     ):
         """非同期翻訳成功テスト"""
         # googletransのモック
-        mock_translator = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.text = "テスト用ビジネス要約"
-        mock_translator.translate.return_value = mock_result
-
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
+        mock_result = SimpleNamespace(text="テスト用ビジネス要約")
+        fake_translator.translate.return_value = mock_result
 
-            translated_text = await translation_service.translate_to_japanese_async(
-                mock_company.business_summary
-            )
+        translated_text = await translation_service.translate_to_japanese_async(
+            mock_company.business_summary
+        )
 
         # 結果検証
         assert translated_text == "テスト用ビジネス要約"
 
     @pytest.mark.asyncio
     async def test_translate_to_japanese_async_error_handling(
-        self, translation_service, mock_company
+        self, translation_service, mock_company, fake_translator
     ):
         """非同期翻訳エラーハンドリングテスト"""
         # googletransでエラーが発生するモック
-        mock_translator = AsyncMock()
-        mock_translator.translate.side_effect = Exception("Translation error")
+        fake_translator.translate.side_effect = Exception("Translation error")
 
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
-
-            # エラー時は元のテキストが返されること
-            translated_text = await translation_service.translate_to_japanese_async(
-                mock_company.business_summary
-            )
-            assert translated_text == mock_company.business_summary
+        # エラー時は元のテキストが返されること
+        translated_text = await translation_service.translate_to_japanese_async(
+            mock_company.business_summary
+        )
+        assert translated_text == mock_company.business_summary
 
     @pytest.mark.asyncio
     async def test_translate_to_japanese_async_retry_mechanism(
-        self, translation_service, mock_company
+        self, translation_service, mock_company, fake_translator
     ):
         """非同期翻訳リトライメカニズムテスト"""
         call_count = 0
@@ -100,19 +105,14 @@ class TestAsyncTranslation:
                 raise Exception("Temporary translation error")
             
             # 2回目は成功
-            mock_result = MagicMock()
-            mock_result.text = "リトライ後の翻訳結果"
+            mock_result = SimpleNamespace(text="リトライ後の翻訳結果")
             return mock_result
 
-        mock_translator = AsyncMock()
-        mock_translator.translate.side_effect = mock_translate_with_retry
-
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
+        fake_translator.translate.side_effect = mock_translate_with_retry
 
-            translated_text = await translation_service.translate_to_japanese_async(
-                mock_company.business_summary
-            )
+        translated_text = await translation_service.translate_to_japanese_async(
+            mock_company.business_summary
+        )
 
         # リトライ後に成功すること
         assert translated_text == "リトライ後の翻訳結果"
@@ -120,7 +120,7 @@ class TestAsyncTranslation:
 
     @pytest.mark.asyncio
     async def test_translate_multiple_texts_async_success(
-        self, translation_service, mock_companies
+        self, translation_service, mock_companies, fake_translator
     ):
         """複数テキスト非同期翻訳成功テスト"""
         # googletransのモック
@@ -133,18 +133,14 @@ class TestAsyncTranslation:
                 "Retail chain with multiple locations": "多店舗展開小売チェーン",
                 "Healthcare solutions company": "ヘルスケアソリューション会社",
             }
-            mock_result = MagicMock()
-            mock_result.text = translations.get(text, f"翻訳済み: {text}")
-            return mock_result
+            return SimpleNamespace(text=translations.get(text, f"翻訳済み: {text}"))
 
-        mock_translator = AsyncMock()
-        mock_translator.translate.side_effect = create_mock_translate
+        fake_translator.translate.side_effect = create_mock_translate
 
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
-
-            texts = [company.business_summary for company in mock_companies]
-            translated_texts = await translation_service.translate_multiple_texts_async(texts)
+        texts = [company.business_summary for company in mock_companies]
+        translated_texts = await translation_service.translate_multiple_texts_async(
+            texts
+        )
 
         # 結果検証
         assert len(translated_texts) == 5
@@ -152,25 +148,24 @@ class TestAsyncTranslation:
         assert translated_texts[1] == "グローバル展開製造会社"
 
     @pytest.mark.asyncio
-    async def test_translate_multiple_texts_async_with_errors(self, translation_service):
+    async def test_translate_multiple_texts_async_with_errors(
+        self, translation_service, fake_translator
+    ):
         """複数テキスト非同期翻訳（一部エラー）テスト"""
         def create_mock_translate_with_errors(text, **kwargs):
             if "error" in text.lower():
                 raise Exception("Translation error")
             
-            mock_result = MagicMock()
-            mock_result.text = f"翻訳済み: {text}"
+            mock_result = SimpleNamespace(text=f"翻訳済み: {text}")
             return mock_result
 
-        mock_translator = AsyncMock()
-        mock_translator.translate.side_effect = create_mock_translate_with_errors
+        fake_translator.translate.side_effect = create_mock_translate_with_errors
 
         texts = ["Good text", "Error text", "Another good text"]
         
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
-
-            translated_texts = await translation_service.translate_multiple_texts_async(texts)
+        translated_texts = await translation_service.translate_multiple_texts_async(
+            texts
+        )
 
         # エラーのテキストは元のまま、成功分は翻訳されること
         assert len(translated_texts) == 3
@@ -179,87 +174,196 @@ class TestAsyncTranslation:
         assert translated_texts[2] == "翻訳済み: Another good text"
 
     @pytest.mark.asyncio
-    async def test_translate_with_rate_limit_async(self, translation_service, mock_companies):
+    async def test_translate_with_rate_limit_async(
+        self, translation_service, mock_companies, fake_translator
+    ):
         """レート制限付き翻訳テスト"""
         # モック設定
         def create_mock_translate(text, **kwargs):
-            mock_result = MagicMock()
-            mock_result.text = f"翻訳済み: {text}"
+            mock_result = SimpleNamespace(text=f"翻訳済み: {text}")
             return mock_result
 
-        mock_translator = AsyncMock()
-        mock_translator.translate.side_effect = create_mock_translate
-
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
+        fake_translator.translate.side_effect = create_mock_translate
 
-            texts = [company.business_summary for company in mock_companies[:3]]
-            translated_texts = await translation_service.translate_multiple_texts_async(
-                texts, max_concurrent=2  # 並行数制限
-            )
+        texts = [company.business_summary for company in mock_companies[:3]]
+        translated_texts = await translation_service.translate_multiple_texts_async(
+            texts, max_concurrent=2  # 並行数制限
+        )
 
         # 結果検証
         assert len(translated_texts) == 3
         assert all(text.startswith("翻訳済み:") for text in translated_texts)
 
     @pytest.mark.asyncio
-    async def test_concurrent_translation(self, translation_service):
+    async def test_concurrent_translation(self, translation_service, fake_translator):
         """並行翻訳テスト"""
         texts = ["Text 1", "Text 2", "Text 3"]
         
         # モック設定
         def create_mock_translate(text, **kwargs):
-            mock_result = MagicMock()
-            mock_result.text = f"翻訳済み: {text}"
+            mock_result = SimpleNamespace(text=f"翻訳済み: {text}")
             return mock_result
 
-        mock_translator = AsyncMock()
-        mock_translator.translate.side_effect = create_mock_translate
-
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
+        fake_translator.translate.side_effect = create_mock_translate
 
-            # 並行実行
+        # 並行実行
+        async with asyncio.TaskGroup() as task_group:
             tasks = [
-                translation_service.translate_to_japanese_async(text)
+                task_group.create_task(
+                    translation_service.translate_to_japanese_async(text)
+                )
                 for text in texts
             ]
-            results = await asyncio.gather(*tasks)
+        results = [task.result() for task in tasks]
 
         # 結果検証
         assert len(results) == 3
         assert all(result.startswith("翻訳済み:") for result in results)
 
+    @pytest.mark.asyncio
+    async def test_translator_instance_reused(
+        self, translation_service, translator_class, fake_translator
+    ):
+        """Translatorインスタンス再利用テスト"""
+        mock_result = SimpleNamespace(text="翻訳済みテキスト")
+        fake_translator.translate.return_value = mock_result
+
+        for text in ["Text 1", "Text 2", "Text 3"]:
+            await translation_service.translate_to_japanese_async(text)
+
+        # 複数回の翻訳でもTranslatorは1回だけ生成されること
+        assert translator_class.call_count == 1
+        assert fake_translator.translate.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_translator_recreated_after_failure_and_closed(
+        self, translation_service, translator_class, fake_translator
+    ):
+        """失敗時のTranslator再作成とclose()によるクローズのテスト"""
+        fake_translator.translate.side_effect = [
+            Exception("Temporary translation error"),
+            SimpleNamespace(text="リトライ後の翻訳結果"),
+        ]
+
+        translated_text = await translation_service.translate_to_japanese_async(
+            "Retry text"
+        )
+        await translation_service.close()
+
+        # 1回目の失敗でTranslatorを破棄し、リトライ時に作り直すこと
+        assert translated_text == "リトライ後の翻訳結果"
+        assert translator_class.call_count == 2
+        # 破棄したTranslatorも含め、close()で両方のHTTPクライアントがクローズされること
+        assert translator_class.return_value.__aexit__.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_failure_keeps_shared_translator_open(
+        self, translation_service, monkeypatch
+    ):
+        """並行翻訳中の1件の失敗で共有Translatorがクローズされないことのテスト"""
+        created = []
+        failed = False
+
+        class FakeTranslator:
+            """クローズ後の使用で失敗するTranslator"""
+
+            def __init__(self):
+                self.closed = False
+                created.append(self)
+
+            async def __aenter__(self):
+                await asyncio.sleep(0)  # 並行する初回呼び出しを競合させる
+                return self
+
+            async def __aexit__(self, *exc_info):
+                self.closed = True
+
+            async def translate(self, text, **kwargs):
+                nonlocal failed
+                await asyncio.sleep(0)
+                if self.closed:
+                    raise RuntimeError("client closed")
+                if not failed:
+                    failed = True
+                    raise RuntimeError("429 Too Many Requests")
+                return SimpleNamespace(text=f"翻訳済み: {text}")
+
+        monkeypatch.setattr(
+            "stock_batch.services.translation.Translator", FakeTranslator
+        )
+
+        texts = [f"Text {i}" for i in range(6)]
+        results = await asyncio.gather(
+            *(translation_service.translate_to_japanese_async(text) for text in texts)
+        )
+
+        # 1件の失敗は自身のリトライで回復し、他の翻訳は影響を受けないこと
+        assert results == [f"翻訳済み: {text}" for text in texts]
+        # 並行する初回作成は1つにまとめられ、失敗後の再作成で1つ増えるのみ
+        assert len(created) == 2
+        assert not any(translator.closed for translator in created)
+
+        await translation_service.close()
+        assert all(translator.closed for translator in created)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_text_uses_cache(
+        self, translation_service, fake_translator
+    ):
+        """重複テキストの翻訳キャッシュテスト"""
+        mock_result = SimpleNamespace(text="共通の事業概要")
+        fake_translator.translate.return_value = mock_result
+
+        first = await translation_service.translate_to_japanese_async("Shared summary")
+        second = await translation_service.translate_to_japanese_async("Shared summary")
+
+        # 2回目はAPIを呼び出さずキャッシュから返されること
+        assert first == second == "共通の事業概要"
+        assert fake_translator.translate.call_count == 1
+
+        stats = translation_service.get_stats()
+        assert stats["total_requests"] == 1
+        assert stats["cache_hits"] == 1
+
+    def test_retry_wait_time_exponential_backoff(self):
+        """リトライ待機時間の指数バックオフテスト"""
+        service = TranslationService(max_retries=10, retry_delay=1.0)
+
+        # 試行ごとに倍増し、ジッターは0.5秒以内であること
+        for attempt, base in [(1, 1.0), (2, 2.0), (3, 4.0)]:
+            wait_time = service._get_retry_wait_time(attempt)
+            assert base <= wait_time <= base + 0.5
+
+        # 上限を超えないこと
+        assert service._get_retry_wait_time(10) == service.MAX_RETRY_DELAY
+
+        # retry_delay=0 の場合は待機しないこと
+        assert TranslationService(retry_delay=0)._get_retry_wait_time(3) == 0
+
     def test_validate_async_methods_exist(self, translation_service):
         """非同期メソッドの存在確認テスト"""
-        # 非同期メソッドが定義されていることを確認
-        assert hasattr(translation_service, "translate_to_japanese_async")
-        assert hasattr(translation_service, "translate_multiple_texts_async")
-        
-        # メソッドがコルーチン関数であることを確認
-        import inspect
-        assert inspect.iscoroutinefunction(translation_service.translate_to_japanese_async)
-        assert inspect.iscoroutinefunction(translation_service.translate_multiple_texts_async)
+        # 非同期メソッドが定義され、コルーチン関数であることを確認
+        for name in ("translate_to_japanese_async", "translate_multiple_texts_async"):
+            method = getattr(translation_service, name, None)
+            assert method is not None, name
+            assert inspect.iscoroutinefunction(method), name
 
     @pytest.mark.asyncio
-    async def test_async_stats_tracking(self, translation_service, mock_company):
+    async def test_async_stats_tracking(
+        self, translation_service, mock_company, fake_translator
+    ):
         """非同期処理の統計追跡テスト"""
         # 初期状態の統計確認
         initial_stats = translation_service.get_stats()
         assert initial_stats["total_requests"] == 0
 
         # モック設定
-        mock_translator = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.text = "翻訳済みテキスト"
-        mock_translator.translate.return_value = mock_result
-
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
+        mock_result = SimpleNamespace(text="翻訳済みテキスト")
+        fake_translator.translate.return_value = mock_result
 
-            await translation_service.translate_to_japanese_async(
-                mock_company.business_summary
-            )
+        await translation_service.translate_to_japanese_async(
+            mock_company.business_summary
+        )
 
         # 統計が更新されていることを確認
         final_stats = translation_service.get_stats()
@@ -282,24 +386,21 @@ class TestAsyncTranslation:
         assert result == ""
 
     @pytest.mark.asyncio
-    async def test_translate_companies_async(self, translation_service, mock_companies):
+    async def test_translate_companies_async(
+        self, translation_service, mock_companies, fake_translator
+    ):
         """企業リスト翻訳テスト"""
         # モック設定
         def create_mock_translate(text, **kwargs):
-            mock_result = MagicMock()
-            mock_result.text = f"翻訳済み企業: {text[:20]}..."
+            mock_result = SimpleNamespace(text=f"翻訳済み企業: {text[:20]}...")
             return mock_result
 
-        mock_translator = AsyncMock()
-        mock_translator.translate.side_effect = create_mock_translate
-
-        with patch("stock_batch.services.translation.Translator") as mock_translator_class:
-            mock_translator_class.return_value.__aenter__.return_value = mock_translator
+        fake_translator.translate.side_effect = create_mock_translate
 
-            # 企業リストの翻訳
-            translated_companies = await translation_service.translate_companies_async(
-                mock_companies
-            )
+        # 企業リストの翻訳
+        translated_companies = await translation_service.translate_companies_async(
+            mock_companies
+        )
 
         # 結果検証
         assert len(translated_companies) == 5
@@ -4,7 +4,6 @@ SQLite接続の作成、管理、切断の機能をテストします。
 """
 
 import sqlite3
-import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -13,20 +12,21 @@ import pytest
 from stock_batch.database.connection import DatabaseConnection
 
 
+def _pragma(connection: sqlite3.Connection, name: str) -> object:
+    """PRAGMAの現在値を取得する"""
+    return connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+
 class TestDatabaseConnection:
     """DatabaseConnection クラスのテスト"""
 
-    def test_create_connection_with_file_path(self) -> None:
+    def test_create_connection_with_file_path(self, tmp_path: Path) -> None:
         """ファイルパスを指定したデータベース接続作成のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_file:
-            db_path = tmp_file.name
+        db_path = str(tmp_path / "test.db")
 
-        try:
-            conn = DatabaseConnection(db_path)
-            assert conn.db_path == db_path
-            assert conn.connection is None  # 初期状態では未接続
-        finally:
-            Path(db_path).unlink(missing_ok=True)
+        conn = DatabaseConnection(db_path)
+        assert conn.db_path == db_path
+        assert conn.connection is None  # 初期状態では未接続
 
     def test_create_connection_with_memory_database(self) -> None:
         """メモリデータベース接続作成のテスト"""
@@ -45,6 +45,71 @@ class TestDatabaseConnection:
         assert conn.connection is connection  # インスタンス変数に保存される
         assert conn.is_connected() is True
 
+    def test_connect_with_shared_memory_uri(self, shared_memory_uri: str) -> None:
+        """共有キャッシュのメモリDB URIで複数接続がデータを共有することのテスト"""
+        writer = DatabaseConnection(shared_memory_uri)
+        reader = DatabaseConnection(shared_memory_uri)
+
+        try:
+            writer.connect()
+            reader.connect()
+            writer.execute_query("CREATE TABLE test (id INTEGER)")
+            writer.execute_query("INSERT INTO test (id) VALUES (1)")
+
+            cursor = reader.execute_query("SELECT id FROM test")
+            assert cursor.fetchall() == [(1,)]
+        finally:
+            writer.disconnect()
+            reader.disconnect()
+
+    def test_connect_applies_default_pragmas(self, tmp_path: Path) -> None:
+        """接続時に既定の性能向けPRAGMA設定が適用されることのテスト"""
+        conn = DatabaseConnection(str(tmp_path / "test.db"))
+
+        try:
+            connection = conn.connect()
+
+            assert _pragma(connection, "foreign_keys") == 1
+            assert _pragma(connection, "journal_mode") == "wal"
+            assert _pragma(connection, "synchronous") == 1  # NORMAL
+            assert _pragma(connection, "temp_store") == 2  # MEMORY
+            assert _pragma(connection, "cache_size") == -20000
+            assert _pragma(connection, "mmap_size") == 268435456
+        finally:
+            conn.disconnect()
+
+    def test_connect_applies_pragmas(self, tmp_path: Path) -> None:
+        """指定したPRAGMA設定が既定値を上書きして適用されることのテスト"""
+        conn = DatabaseConnection(
+            str(tmp_path / "test.db"),
+            pragmas={
+                "journal_mode": "MEMORY",
+                "synchronous": "OFF",
+                "temp_store": "MEMORY",
+            },
+        )
+
+        try:
+            connection = conn.connect()
+
+            assert _pragma(connection, "journal_mode") == "memory"
+            assert _pragma(connection, "synchronous") == 0  # OFF
+            assert _pragma(connection, "temp_store") == 2  # MEMORY
+        finally:
+            conn.disconnect()
+
+    def test_connect_enlarges_statement_cache(self) -> None:
+        """接続時にプリペアドステートメントのキャッシュ数が指定されることのテスト"""
+        conn = DatabaseConnection(":memory:")
+
+        with patch("sqlite3.connect", wraps=sqlite3.connect) as mock_connect:
+            conn.connect()
+
+        try:
+            assert mock_connect.call_args.kwargs["cached_statements"] == 256
+        finally:
+            conn.disconnect()
+
     def test_connect_returns_existing_connection(self) -> None:
         """既存の接続が存在する場合は同じ接続を返すことのテスト"""
         conn = DatabaseConnection(":memory:")
@@ -74,6 +139,31 @@ class TestDatabaseConnection:
         assert conn.connection is None
         assert conn.is_connected() is False
 
+    def test_disconnect_runs_optimize_for_file_database(self, tmp_path: Path) -> None:
+        """ファイルDBの切断時に PRAGMA optimize が実行されることのテスト"""
+        conn = DatabaseConnection(str(tmp_path / "test.db"))
+        statements: list[str] = []
+        conn.connect().set_trace_callback(statements.append)
+
+        conn.disconnect()
+
+        assert conn.optimize_on_close is True
+        assert statements == ["PRAGMA optimize"]
+
+    @pytest.mark.parametrize("use_uri", [False, True], ids=["memory", "uri"])
+    def test_disconnect_skips_optimize_for_memory_database(
+        self, use_uri: bool, shared_memory_uri: str
+    ) -> None:
+        """メモリDBの切断時は PRAGMA optimize を実行しないことのテスト"""
+        conn = DatabaseConnection(shared_memory_uri if use_uri else ":memory:")
+        statements: list[str] = []
+        conn.connect().set_trace_callback(statements.append)
+
+        conn.disconnect()
+
+        assert conn.optimize_on_close is False
+        assert statements == []
+
     def test_context_manager_auto_connects_and_disconnects(self) -> None:
         """コンテキストマネージャーで自動接続・切断されることのテスト"""
         conn = DatabaseConnection(":memory:")
@@ -131,6 +221,25 @@ class TestDatabaseConnection:
         with pytest.raises(sqlite3.Error):
             conn.execute_query("INVALID SQL STATEMENT")
 
+    def test_execute_read_query_does_not_commit(self) -> None:
+        """読み取りクエリ実行でトランザクションが維持されることのテスト"""
+        conn = DatabaseConnection(":memory:")
+        conn.connect()
+        assert conn.connection is not None
+
+        conn.connection.execute("BEGIN")
+        cursor = conn.execute_read_query("SELECT 1")
+
+        assert cursor.fetchone()[0] == 1
+        assert conn.connection.in_transaction is True
+
+    def test_execute_read_query_without_connection_raises_error(self) -> None:
+        """未接続状態での読み取りクエリ実行エラーのテスト"""
+        conn = DatabaseConnection(":memory:")
+
+        with pytest.raises(RuntimeError, match="データベースに接続されていません"):
+            conn.execute_read_query("SELECT 1")
+
     def test_execute_many_with_parameters(self) -> None:
         """パラメータ付きバッチ実行のテスト"""
         conn = DatabaseConnection(":memory:")
@@ -160,6 +269,47 @@ class TestDatabaseConnection:
         with pytest.raises(RuntimeError, match="データベースに接続されていません"):
             conn.execute_many("INSERT INTO test VALUES (?, ?)", [("a", "b")])
 
+    def test_batch_transaction_commits_once(self) -> None:
+        """バッチトランザクション内の書き込みが1回のコミットにまとまることのテスト"""
+        conn = DatabaseConnection(":memory:")
+        connection = conn.connect()
+        conn.execute_query("CREATE TABLE test (id INTEGER UNIQUE)")
+        statements: list[str] = []
+        connection.set_trace_callback(statements.append)
+
+        with conn.batch_transaction():
+            conn.execute_query("INSERT INTO test (id) VALUES (1)")
+            # 失敗した文のみ取り消され、トランザクションは継続する
+            with pytest.raises(sqlite3.IntegrityError):
+                conn.execute_query("INSERT INTO test (id) VALUES (1)")
+            conn.execute_many("INSERT INTO test (id) VALUES (?)", [(2,), (3,)])
+
+        assert statements.count("COMMIT") == 1
+        cursor = conn.execute_query("SELECT COUNT(*) FROM test")
+        assert cursor.fetchone()[0] == 3
+
+    def test_batch_transaction_rolls_back_on_error(self) -> None:
+        """バッチトランザクション内で例外が発生した場合にロールバックされることのテスト"""
+        conn = DatabaseConnection(":memory:")
+        conn.connect()
+        conn.execute_query("CREATE TABLE test (id INTEGER)")
+
+        with pytest.raises(ValueError):
+            with conn.batch_transaction():
+                conn.execute_query("INSERT INTO test (id) VALUES (1)")
+                raise ValueError("中断")
+
+        cursor = conn.execute_query("SELECT COUNT(*) FROM test")
+        assert cursor.fetchone()[0] == 0
+
+    def test_batch_transaction_without_connection_raises_error(self) -> None:
+        """未接続状態でのバッチトランザクション開始エラーのテスト"""
+        conn = DatabaseConnection(":memory:")
+
+        with pytest.raises(RuntimeError, match="データベースに接続されていません"):
+            with conn.batch_transaction():
+                pass
+
     @patch("sqlite3.connect")
     def test_connection_error_handling(self, mock_connect: Mock) -> None:
         """データベース接続エラーのハンドリングテスト"""
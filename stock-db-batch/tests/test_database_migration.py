@@ -4,7 +4,7 @@
 """
 
 import sqlite3
-import tempfile
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -13,6 +13,36 @@ from stock_batch.database.connection import DatabaseConnection
 from stock_batch.database.migration import DatabaseMigration
 
 
+@pytest.fixture(scope="session")
+def migrated_template() -> Iterator[sqlite3.Connection]:
+    """マイグレーション済みのテンプレートDB（セッション内で1回だけ構築）"""
+    template = DatabaseConnection(":memory:")
+    connection = template.connect()
+    DatabaseMigration(template).run_migrations()
+    yield connection
+    template.disconnect()
+
+
+@pytest.fixture
+def migrated_db(migrated_template: sqlite3.Connection) -> Iterator[DatabaseConnection]:
+    """テンプレートDBをバックアップAPIで複製した接続済みのメモリDB"""
+    conn = DatabaseConnection(":memory:")
+    migrated_template.backup(conn.connect())
+    yield conn
+    conn.disconnect()
+
+
+Migrated = tuple[DatabaseMigration, DatabaseConnection]
+
+
+@pytest.fixture
+def mig() -> Iterator[Migrated]:
+    """接続済みの空のメモリDBとマイグレーション管理オブジェクト"""
+    conn = DatabaseConnection(":memory:")
+    with conn:
+        yield DatabaseMigration(conn), conn
+
+
 class TestDatabaseMigration:
     """DatabaseMigration クラスのテスト"""
 
@@ -23,241 +53,253 @@ class TestDatabaseMigration:
 
         assert migration.db_connection is conn
 
-    def test_get_schema_version_from_new_database(self) -> None:
+    def test_get_schema_version_from_new_database(self, mig: Migrated) -> None:
         """新規データベースからのスキーマバージョン取得テスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration, _ = mig
 
-        with conn:
-            version = migration.get_schema_version()
-            # 新規データベースではバージョン0
-            assert version == 0
+        version = migration.get_schema_version()
+        # 新規データベースではバージョン0
+        assert version == 0
 
-    def test_set_schema_version(self) -> None:
+    def test_set_schema_version(self, mig: Migrated) -> None:
         """スキーマバージョン設定のテスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration, _ = mig
 
-        with conn:
-            migration.set_schema_version(1)
-            version = migration.get_schema_version()
-            assert version == 1
+        migration.set_schema_version(1)
+        version = migration.get_schema_version()
+        assert version == 1
 
-    def test_create_company_table(self) -> None:
+    def test_create_company_table(self, mig: Migrated) -> None:
         """companyテーブル作成のテスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration, conn = mig
 
-        with conn:
-            migration.create_company_table()
+        migration.create_company_table()
 
-            # テーブルが作成されたことを確認
-            cursor = conn.execute_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='company'"
-            )
-            tables = cursor.fetchall()
-            assert len(tables) == 1
-            assert tables[0][0] == "company"
+        # テーブルが作成されたことを確認
+        cursor = conn.execute_query(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='company'"
+        )
+        tables = cursor.fetchall()
+        assert len(tables) == 1
+        assert tables[0][0] == "company"
 
-    def test_create_company_table_schema(self) -> None:
+    def test_create_company_table_schema(self, mig: Migrated) -> None:
         """companyテーブルのスキーマ検証テスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
-
-        with conn:
-            migration.create_company_table()
-
-            # テーブルスキーマを取得
-            cursor = conn.execute_query("PRAGMA table_info(company)")
-            columns = cursor.fetchall()
-
-            # カラム名と型を検証
-            column_info = {col[1]: col[2] for col in columns}  # (name, type)
-
-            expected_columns = {
-                "id": "INTEGER",
-                "symbol": "TEXT",
-                "name": "TEXT",
-                "market": "TEXT",
-                "business_summary": "TEXT",
-                "price": "REAL",
-                "last_updated": "TIMESTAMP",
-                "created_at": "TIMESTAMP",
-            }
-
-            for col_name, col_type in expected_columns.items():
-                assert col_name in column_info
-                assert column_info[col_name] == col_type
-
-    def test_create_company_table_primary_key(self) -> None:
+        migration, conn = mig
+
+        migration.create_company_table()
+
+        expected_columns = {
+            "id": "INTEGER",
+            "symbol": "TEXT",
+            "name": "TEXT",
+            "market": "TEXT",
+            "business_summary": "TEXT",
+            "price": "REAL",
+            "last_updated": "TIMESTAMP",
+            "created_at": "TIMESTAMP",
+        }
+
+        # カラム名と型を1回のクエリで取得して検証
+        cursor = conn.execute_query(
+            "SELECT name, type FROM pragma_table_info('company')"
+        )
+        assert set(expected_columns.items()) <= set(cursor.fetchall())
+
+    def test_create_company_table_primary_key(self, mig: Migrated) -> None:
         """companyテーブルの主キー設定テスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration, conn = mig
 
-        with conn:
-            migration.create_company_table()
+        migration.create_company_table()
 
-            # 主キー情報を取得
-            cursor = conn.execute_query("PRAGMA table_info(company)")
-            columns = cursor.fetchall()
+        # 主キー情報を取得
+        cursor = conn.execute_query("PRAGMA table_info(company)")
+        columns = cursor.fetchall()
 
-            # id カラムが主キーであることを確認
-            id_column = next(col for col in columns if col[1] == "id")
-            assert id_column[5] == 1  # pk フィールドが1（主キー）
+        # id カラムが主キーであることを確認
+        id_column = next(col for col in columns if col[1] == "id")
+        assert id_column[5] == 1  # pk フィールドが1（主キー）
 
-    def test_create_company_table_unique_constraint(self) -> None:
+    def test_create_company_table_unique_constraint(self, mig: Migrated) -> None:
         """companyテーブルのUNIQUE制約テスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration, conn = mig
 
-        with conn:
-            migration.create_company_table()
+        migration.create_company_table()
 
-            # 同じシンボルの挿入テスト
+        # 同じシンボルの挿入テスト
+        conn.execute_query(
+            "INSERT INTO company (symbol, name) VALUES ('1332.T', 'ニッスイ')"
+        )
+
+        # 重複挿入は失敗することを確認
+        with pytest.raises((sqlite3.IntegrityError, Exception)):  # UNIQUE制約違反
             conn.execute_query(
-                "INSERT INTO company (symbol, name) VALUES ('1332.T', 'ニッスイ')"
+                "INSERT INTO company (symbol, name) VALUES ('1332.T', '重複企業')"
             )
 
-            # 重複挿入は失敗することを確認
-            with pytest.raises((sqlite3.IntegrityError, Exception)):  # UNIQUE制約違反
-                conn.execute_query(
-                    "INSERT INTO company (symbol, name) VALUES ('1332.T', '重複企業')"
-                )
+    def test_symbol_index_exists(self, migrated_db: DatabaseConnection) -> None:
+        """symbol検索用インデックスが作成され、検索で使用されることのテスト"""
+        cursor = migrated_db.execute_query("PRAGMA index_list(company)")
+        index_names = [row[1] for row in cursor.fetchall()]
+        assert "idx_company_symbol" in index_names
+
+        cursor = migrated_db.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM company WHERE symbol = ?", ("1332.T",)
+        )
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+        assert "USING INDEX" in plan
+        assert "SCAN" not in plan
 
-    def test_create_schema_version_table(self) -> None:
+    def test_create_schema_version_table(self, mig: Migrated) -> None:
         """schema_versionテーブル作成のテスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration, conn = mig
 
-        with conn:
-            migration.create_schema_version_table()
+        migration.create_schema_version_table()
 
-            # テーブルが作成されたことを確認
-            cursor = conn.execute_query(
-                "SELECT name FROM sqlite_master WHERE type='table' "
-                "AND name='schema_version'"
-            )
-            tables = cursor.fetchall()
-            assert len(tables) == 1
-            assert tables[0][0] == "schema_version"
+        # テーブルが作成されたことを確認
+        cursor = conn.execute_query(
+            "SELECT name FROM sqlite_master WHERE type='table' "
+            "AND name='schema_version'"
+        )
+        tables = cursor.fetchall()
+        assert len(tables) == 1
+        assert tables[0][0] == "schema_version"
 
-    def test_run_initial_migration(self) -> None:
+    def test_run_initial_migration(self, mig: Migrated) -> None:
         """初回マイグレーション実行のテスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration, _ = mig
 
-        with conn:
-            migration.run_migrations()
+        migration.run_migrations()
 
-            # スキーマバージョンが1になっていることを確認
-            version = migration.get_schema_version()
-            assert version == 1
+        # スキーマバージョンが最新(2)になっていることを確認
+        version = migration.get_schema_version()
+        assert version == 2
 
-            # companyテーブルが作成されていることを確認
-            cursor = conn.execute_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='company'"
-            )
-            tables = cursor.fetchall()
-            assert len(tables) == 1
+        # 両テーブルが作成されていることを1回のクエリで確認
+        tables = migration.tables_exist(["company", "schema_version"])
+        assert tables == {"company", "schema_version"}
 
-    def test_run_migrations_is_idempotent(self) -> None:
+    def test_run_migrations_is_idempotent(
+        self, migrated_db: DatabaseConnection
+    ) -> None:
         """マイグレーションが冪等であることのテスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
-
-        with conn:
-            # 複数回実行してもエラーが出ない
-            migration.run_migrations()
-            migration.run_migrations()
-            migration.run_migrations()
-
-            # バージョンは1のまま
-            version = migration.get_schema_version()
-            assert version == 1
-
-    def test_check_table_exists_true(self) -> None:
+        migration = DatabaseMigration(migrated_db)
+
+        # マイグレーション済みのDBに複数回実行してもエラーが出ない
+        migration.run_migrations()
+        migration.run_migrations()
+
+        # バージョンは2のまま
+        version = migration.get_schema_version()
+        assert version == 2
+
+    def test_run_migrations_runs_optimize(
+        self, migrated_db: DatabaseConnection
+    ) -> None:
+        """マイグレーション完了後に PRAGMA optimize が実行されることのテスト"""
+        assert migrated_db.connection is not None
+        statements: list[str] = []
+        migrated_db.connection.set_trace_callback(statements.append)
+
+        DatabaseMigration(migrated_db).run_migrations()
+
+        assert statements[-1] == "PRAGMA optimize"
+
+    def test_run_migrations_upgrades_v1_database(self, mig: Migrated) -> None:
+        """v1データベースへの市場別インデックス追加のテスト"""
+        migration, conn = mig
+
+        # v1時点のデータベースを再現
+        migration._run_migration_v1()
+        assert migration.get_schema_version() == 1
+
+        migration.run_migrations()
+        assert migration.get_schema_version() == 2
+
+        # 市場別検索が複合インデックスを使用し、ソートが不要であること
+        cursor = conn.execute_query(
+            "EXPLAIN QUERY PLAN "
+            "SELECT symbol FROM company WHERE market = ? ORDER BY symbol",
+            ("東P",),
+        )
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+        assert "idx_company_market_symbol" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_check_table_exists_true(self, migrated_db: DatabaseConnection) -> None:
         """存在するテーブルのチェックテスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration = DatabaseMigration(migrated_db)
 
-        with conn:
-            migration.create_company_table()
-
-            exists = migration.table_exists("company")
-            assert exists is True
+        exists = migration.table_exists("company")
+        assert exists is True
 
-    def test_check_table_exists_false(self) -> None:
+    def test_check_table_exists_false(self, mig: Migrated) -> None:
         """存在しないテーブルのチェックテスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration, _ = mig
 
-        with conn:
-            exists = migration.table_exists("nonexistent_table")
-            assert exists is False
-
-    def test_migration_with_file_database(self) -> None:
-        """ファイルベースデータベースでのマイグレーションテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_file:
-            db_path = tmp_file.name
+        exists = migration.table_exists("nonexistent_table")
+        assert exists is False
 
-        try:
-            conn = DatabaseConnection(db_path)
-            migration = DatabaseMigration(conn)
+    def test_tables_exist(self, migrated_db: DatabaseConnection) -> None:
+        """存在するテーブルのみが返されることのテスト"""
+        migration = DatabaseMigration(migrated_db)
 
-            with conn:
-                migration.run_migrations()
+        tables = migration.tables_exist(["company", "schema_version", "nonexistent"])
 
-                # データベースファイルが作成され、テーブルが存在することを確認
-                cursor = conn.execute_query(
-                    "SELECT COUNT(*) FROM sqlite_master WHERE type='table'"
-                )
-                table_count = cursor.fetchone()[0]
-                assert table_count >= 2  # company + schema_version テーブル
+        assert tables == {"company", "schema_version"}
+        assert migration.tables_exist([]) == set()
 
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-
-    def test_get_migration_info(self) -> None:
-        """マイグレーション情報取得のテスト"""
-        conn = DatabaseConnection(":memory:")
+    @pytest.mark.slow
+    @pytest.mark.filesystem
+    def test_migration_with_file_database(self, tmp_path: Path) -> None:
+        """ファイルベースデータベースでのマイグレーションテスト"""
+        conn = DatabaseConnection(str(tmp_path / "test.db"))
         migration = DatabaseMigration(conn)
 
         with conn:
             migration.run_migrations()
 
-            info = migration.get_migration_info()
+            # データベースファイルが作成され、テーブルが存在することを確認
+            cursor = conn.execute_query(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type='table'"
+            )
+            table_count = cursor.fetchone()[0]
+            assert table_count >= 2  # company + schema_version テーブル
+
+    def test_get_migration_info(self, migrated_db: DatabaseConnection) -> None:
+        """マイグレーション情報取得のテスト"""
+        migration = DatabaseMigration(migrated_db)
+
+        info = migration.get_migration_info()
 
-            assert "current_version" in info
-            assert "available_migrations" in info
-            assert "tables" in info
+        assert "current_version" in info
+        assert "available_migrations" in info
+        assert "tables" in info
 
-            assert info["current_version"] == 1
-            assert "company" in info["tables"]
-            assert "schema_version" in info["tables"]
+        assert info["current_version"] == 2
+        assert "company" in info["tables"]
+        assert "schema_version" in info["tables"]
 
-    def test_reset_database(self) -> None:
+    def test_reset_database(self, migrated_db: DatabaseConnection) -> None:
         """データベースリセット機能のテスト"""
-        conn = DatabaseConnection(":memory:")
-        migration = DatabaseMigration(conn)
+        migration = DatabaseMigration(migrated_db)
 
-        with conn:
-            # マイグレーション実行とデータ挿入
-            migration.run_migrations()
-            conn.execute_query(
-                "INSERT INTO company (symbol, name) VALUES ('1332.T', 'ニッスイ')"
-            )
+        # マイグレーション済みDBへのデータ挿入
+        migrated_db.execute_query(
+            "INSERT INTO company (symbol, name) VALUES ('1332.T', 'ニッスイ')"
+        )
 
-            # データが存在することを確認
-            cursor = conn.execute_query("SELECT COUNT(*) FROM company")
-            count = cursor.fetchone()[0]
-            assert count == 1
+        # データが存在することを確認
+        cursor = migrated_db.execute_query("SELECT COUNT(*) FROM company")
+        count = cursor.fetchone()[0]
+        assert count == 1
 
-            # データベースリセット
-            migration.reset_database()
+        # データベースリセット
+        migration.reset_database()
 
-            # テーブルが削除され、バージョンが0に戻ることを確認
-            version = migration.get_schema_version()
-            assert version == 0
+        # テーブルが削除され、バージョンが0に戻ることを確認
+        version = migration.get_schema_version()
+        assert version == 0
 
-            exists = migration.table_exists("company")
-            assert exists is False
+        exists = migration.table_exists("company")
+        assert exists is False
@@ -4,45 +4,194 @@
 設定管理、ロギング、エラーハンドリング、Kubernetes対応をテストします。
 """
 
+import itertools
+import logging
 import os
-import tempfile
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
+from stock_batch.database.connection import DatabaseConnection
+from stock_batch.database.migration import DatabaseMigration
 from stock_batch.main_batch_application import (
     BatchConfig,
+    BatchResult,
     MainBatchApplication,
 )
+from stock_batch.models.company import Company
+from stock_batch.services.stock_fetcher import StockData
+
+# 全CSVで共通のヘッダー（UTF-8エンコード済み）
+CSV_HEADER: bytes = "コード,銘柄名,市場,現在値,前日比(%)\n".encode()
+
+
+def _write_company_csv(path: Path, codes: range) -> str:
+    """連番の企業コードからCSVを一括で作成し、パスを返す"""
+    rows = "".join(f"{i},企業{i},東P,{i}.0,+1.0\n" for i in codes)
+    path.write_bytes(CSV_HEADER + rows.encode())
+    return str(path)
+
+
+def _paths(tmp_path: Path, csv_content: bytes = b"") -> tuple[str, str]:
+    """テスト用のDBパスとCSVパスを返す
+
+    CSVは指定したバイト列で作成し、DBファイルは初回接続時にSQLiteが作成する。
+    どちらも tmp_path 配下のため後片付けは不要。
+    """
+    csv_path = tmp_path / "t.csv"
+    csv_path.write_bytes(csv_content)
+    return str(tmp_path / "t.db"), str(csv_path)
+
+
+@pytest.fixture(autouse=True)
+def stock_batch_logger() -> Iterator[logging.Logger]:
+    """アプリ初期化で変更される stock_batch ロガーのレベルをテスト後に戻す"""
+    logger = logging.getLogger("stock_batch")
+    previous_level = logger.level
+    yield logger
+    logger.setLevel(previous_level)
+
+
+@pytest.fixture(scope="module")
+def pooled_db_path(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """マイグレーション済みのDBファイルをモジュール内で共有する"""
+    db_path = str(tmp_path_factory.mktemp("pool") / "pool.db")
+    conn = DatabaseConnection(db_path)
+    with conn:
+        DatabaseMigration(conn).run_migrations()
+    return db_path
+
+
+@pytest.fixture
+def app_db(pooled_db_path: str) -> Iterator[str]:
+    """共有DBのパスを返し、テスト後に企業データを削除する
+
+    スキーマは作り直さず、データのみを1トランザクションで削除する。
+    """
+    yield pooled_db_path
+
+    conn = DatabaseConnection(pooled_db_path)
+    with conn:
+        with conn.batch_transaction():
+            conn.execute_query("DELETE FROM company")
+
+
+@pytest.fixture(scope="session")
+def csv_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """読み取り専用で共有するCSVの作成先ディレクトリ"""
+    return tmp_path_factory.mktemp("csv")
+
+
+@pytest.fixture(scope="session")
+def batch_csv_path(csv_dir: Path) -> str:
+    """設定違いのテストで共有する10社分のCSVを作成する"""
+    return _write_company_csv(csv_dir / "c10.csv", range(1400, 1410))
+
+
+@pytest.fixture(scope="session")
+def parallel_csv_path(csv_dir: Path) -> str:
+    """並列処理テストで使用する20社分のCSVを作成する"""
+    return _write_company_csv(csv_dir / "c20.csv", range(1300, 1320))
+
+
+@pytest.fixture(scope="session")
+def single_csv_path(csv_dir: Path) -> str:
+    """1社分のCSVを作成する"""
+    csv_path = csv_dir / "c1.csv"
+    csv_path.write_bytes(CSV_HEADER + "1332,ニッスイ,東P,877.8,+2.5\n".encode())
+    return str(csv_path)
+
+
+def _has_progress_reports(result: BatchResult) -> bool:
+    """株価取得の進捗報告がリソース監視情報付きで3件あるか判定する"""
+    return len(result.progress_reports) == 3 and all(
+        isinstance(report["memory_usage_mb"], float)
+        and report["memory_usage_mb"] >= 0.0
+        and "processing_time" in report
+        and "records_per_second" in report
+        for report in result.progress_reports
+    )
+
+
+@pytest.fixture
+def patched_services() -> Iterator[tuple[Mock, Mock, Mock]]:
+    """CSV読み取り・株価取得・翻訳をまとめてモックする
+
+    Yields:
+        (CSV読み取り, 株価取得, 翻訳) のモック。テストごとに戻り値を設定する。
+    """
+    with (
+        patch("stock_batch.services.csv_reader.CSVReader.read_and_convert") as csv_read,
+        patch(
+            "stock_batch.services.stock_fetcher.StockFetcher.fetch_stock_data"
+        ) as stock_fetch,
+        patch(
+            "stock_batch.services.translation.TranslationService.translate_to_japanese"
+        ) as translate,
+    ):
+        yield csv_read, stock_fetch, translate
+
+
+# (設定の上書き内容, 実行結果の検証) の組
+BATCH_CONFIG_CASES = [
+    pytest.param(
+        {"dry_run": True},
+        # ドライランでは実際の更新は行われない
+        lambda r: r.companies_inserted == 0 and r.companies_updated == 0,
+        id="dry_run",
+    ),
+    pytest.param(
+        {"log_level": "DEBUG"},
+        lambda r: logging.getLogger("stock_batch").level == logging.DEBUG,
+        id="debug_log",
+    ),
+    pytest.param(
+        {"enable_graceful_shutdown": True},
+        lambda r: r.companies_inserted == 10,
+        id="graceful_shutdown",
+    ),
+    pytest.param(
+        {
+            "enable_progress_reporting": True,
+            "progress_report_interval": 3,  # 3件ごとに報告
+            "enable_stock_data_fetch": True,  # 進捗報告のために有効化
+        },
+        _has_progress_reports,
+        id="progress_reporting",
+    ),
+    pytest.param(
+        {"enable_performance_monitoring": True},
+        lambda r: (
+            r.processing_time > 0
+            and r.memory_usage_mb >= 0
+            and r.records_per_second > 0
+            and r.database_operations_count > 0
+        ),
+        id="performance_monitoring",
+    ),
+]
 
 
 class TestMainBatchApplication:
     """MainBatchApplication クラスのテスト"""
 
-    def test_create_main_batch_application(self) -> None:
+    def test_create_main_batch_application(self, tmp_path: Path) -> None:
         """MainBatchApplication 作成のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                chunk_size=100,
-                enable_parallel=False,
-            )
+        db_path, csv_path = _paths(tmp_path)
 
-            app = MainBatchApplication(config)
-            assert app is not None
-            assert app.config.database_path == db_path
-            assert app.config.csv_file_path == csv_path
+        config = BatchConfig(
+            database_path=db_path,
+            csv_file_path=csv_path,
+            chunk_size=100,
+            enable_parallel=False,
+        )
 
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
+        app = MainBatchApplication(config)
+        assert app is not None
+        assert app.config.database_path == db_path
+        assert app.config.csv_file_path == csv_path
 
     def test_configuration_validation(self) -> None:
         """設定検証のテスト"""
@@ -62,501 +211,311 @@ class TestMainBatchApplication:
             )
             MainBatchApplication(config)
 
-    @patch("stock_batch.services.csv_reader.CSVReader.read_and_convert")
-    @patch("stock_batch.services.stock_fetcher.StockFetcher.fetch_stock_data")
-    @patch("stock_batch.services.translation.TranslationService.translate_to_japanese")
     def test_full_batch_processing_success(
         self,
-        mock_translate: Mock,
-        mock_stock_fetch: Mock,
-        mock_csv_read: Mock,
+        patched_services: tuple[Mock, Mock, Mock],
+        tmp_path: Path,
+        app_db: str,
     ) -> None:
         """完全バッチ処理成功のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            # CSVファイルに実際のデータを書き込み
-            tmp_csv.write("コード,銘柄名,市場,現在値,前日比(%)\n".encode())
-            tmp_csv.write("1332,ニッスイ,東P,877.8,+2.5\n".encode())
-            tmp_csv.write("1418,インターライフ,東S,405.0,-1.2\n".encode())
-
-        try:
-            # CSVReader のモック
-            from stock_batch.models.company import Company
-
-            mock_csv_companies = [
-                Company(
-                    symbol="1332.T",
-                    name="ニッスイ",
-                    market="東P",
-                    business_summary="",
-                    price=877.8,
-                ),
-                Company(
-                    symbol="1418.T",
-                    name="インターライフ",
-                    market="東S",
-                    business_summary="",
-                    price=405.0,
-                ),
-            ]
-            mock_csv_read.return_value = mock_csv_companies
-
-            # StockFetcher のモック
-            def mock_fetch_side_effect(symbol: str):
-                from stock_batch.services.stock_fetcher import StockData
-
-                if symbol == "1332.T":
-                    return StockData(
-                        symbol=symbol,
-                        current_price=877.8,
-                        business_summary=(
-                            "Nissui Corporation is a Japanese fishery company."
-                        ),
-                        volume=1000000,
-                        day_high=890.0,
-                        day_low=870.0,
-                        sector="Consumer Defensive",
-                        industry="Packaged Foods",
-                    )
-                elif symbol == "1418.T":
-                    return StockData(
-                        symbol=symbol,
-                        current_price=405.0,
-                        business_summary="InterLife Corporation provides IT services.",
-                        volume=500000,
-                        sector="Technology",
-                        industry="Software",
-                    )
-                return None
-
-            mock_stock_fetch.side_effect = mock_fetch_side_effect
-
-            # TranslationService のモック
-            def mock_translate_side_effect(text: str) -> str:
-                if "fishery" in text:
-                    return "日水株式会社は日本の水産会社です。"
-                elif "IT services" in text:
-                    return "インターライフ株式会社はITサービスを提供しています。"
-                return f"翻訳済み: {text}"
-
-            mock_translate.side_effect = mock_translate_side_effect
-
-            # バッチ処理実行
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                chunk_size=50,
-                enable_parallel=False,
-                enable_stock_data_fetch=True,
-                enable_translation=True,
-                max_retries=3,
-            )
-
-            app = MainBatchApplication(config)
-            result = app.run_batch()
-
-            # 結果検証
-            assert result.success is True
-            assert result.total_processed == 2
-            assert result.companies_inserted >= 0
-            assert result.companies_updated >= 0
-            assert result.processing_time > 0
-            assert len(result.error_details) == 0
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_batch_processing_with_existing_data(self) -> None:
+        mock_csv_read, mock_stock_fetch, mock_translate = patched_services
+        # CSVファイルに実際のデータを書き込み
+        _, csv_path = _paths(
+            tmp_path,
+            CSV_HEADER
+            + (
+                "1332,ニッスイ,東P,877.8,+2.5\n1418,インターライフ,東S,405.0,-1.2\n"
+            ).encode(),
+        )
+        db_path = app_db
+
+        # CSVReader のモック
+        mock_csv_companies = [
+            Company(
+                symbol="1332.T",
+                name="ニッスイ",
+                market="東P",
+                business_summary="",
+                price=877.8,
+            ),
+            Company(
+                symbol="1418.T",
+                name="インターライフ",
+                market="東S",
+                business_summary="",
+                price=405.0,
+            ),
+        ]
+        mock_csv_read.return_value = mock_csv_companies
+
+        # StockFetcher のモック（未登録のシンボルは None）
+        stock_data_table = {
+            "1332.T": StockData(
+                symbol="1332.T",
+                current_price=877.8,
+                business_summary="Nissui Corporation is a Japanese fishery company.",
+                volume=1000000,
+                day_high=890.0,
+                day_low=870.0,
+                sector="Consumer Defensive",
+                industry="Packaged Foods",
+            ),
+            "1418.T": StockData(
+                symbol="1418.T",
+                current_price=405.0,
+                business_summary="InterLife Corporation provides IT services.",
+                volume=500000,
+                sector="Technology",
+                industry="Software",
+            ),
+        }
+        mock_stock_fetch.side_effect = stock_data_table.get
+
+        # TranslationService のモック（未登録の文は接頭辞付きで返す）
+        translation_table = {
+            "Nissui Corporation is a Japanese fishery company.": (
+                "日水株式会社は日本の水産会社です。"
+            ),
+            "InterLife Corporation provides IT services.": (
+                "インターライフ株式会社はITサービスを提供しています。"
+            ),
+        }
+        mock_translate.side_effect = lambda text: translation_table.get(
+            text, f"翻訳済み: {text}"
+        )
+
+        # バッチ処理実行
+        config = BatchConfig(
+            database_path=db_path,
+            csv_file_path=csv_path,
+            chunk_size=50,
+            enable_parallel=False,
+            enable_stock_data_fetch=True,
+            enable_translation=True,
+            max_retries=3,
+        )
+
+        app = MainBatchApplication(config)
+        result = app.run_batch()
+
+        # 結果検証
+        assert result.success is True
+        assert result.total_processed == 2
+        assert result.companies_inserted >= 0
+        assert result.companies_updated >= 0
+        assert result.processing_time > 0
+        assert len(result.error_details) == 0
+
+    def test_batch_processing_with_existing_data(self, tmp_path: Path) -> None:
         """既存データありでのバッチ処理テスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名,市場,現在値,前日比(%)\n".encode())
-            tmp_csv.write("1332,ニッスイ,東P,890.0,+1.5\n".encode())  # 価格変更
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_stock_data_fetch=False,  # 高速化のため無効
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-
-            # 1回目の実行（新規挿入）
-            result1 = app.run_batch()
-            assert result1.companies_inserted == 1
-
-            # 2回目の実行（更新）
-            result2 = app.run_batch()
-            assert result2.companies_updated >= 0  # 価格変更により更新される可能性
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    @patch("stock_batch.services.csv_reader.CSVReader.read_and_convert")
-    def test_batch_processing_with_csv_error(self, mock_csv_read: Mock) -> None:
+        db_path, csv_path = _paths(
+            tmp_path,
+            CSV_HEADER + "1332,ニッスイ,東P,890.0,+1.5\n".encode(),  # 価格変更
+        )
+
+        config = BatchConfig(
+            database_path=db_path,
+            csv_file_path=csv_path,
+            enable_stock_data_fetch=False,  # 高速化のため無効
+            enable_translation=False,
+        )
+
+        app = MainBatchApplication(config)
+
+        # 1回目の実行（新規挿入）
+        result1 = app.run_batch()
+        assert result1.companies_inserted == 1
+
+        # 2回目の実行（更新）
+        result2 = app.run_batch()
+        assert result2.companies_updated >= 0  # 価格変更により更新される可能性
+
+    def test_batch_processing_with_csv_error(
+        self, patched_services: tuple[Mock, Mock, Mock], tmp_path: Path, app_db: str
+    ) -> None:
         """CSV読み取りエラー時のバッチ処理テスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
+        mock_csv_read, _, _ = patched_services
+        _, csv_path = _paths(tmp_path)
+        db_path = app_db
 
-        try:
-            # CSV読み取りエラーをモック
-            mock_csv_read.side_effect = Exception("CSV読み取りエラー")
+        # CSV読み取りエラーをモック
+        mock_csv_read.side_effect = Exception("CSV読み取りエラー")
 
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-            )
-
-            app = MainBatchApplication(config)
-            result = app.run_batch()
+        config = BatchConfig(
+            database_path=db_path,
+            csv_file_path=csv_path,
+        )
 
-            assert result.success is False
-            assert "CSV読み取りエラー" in str(result.error_details)
+        app = MainBatchApplication(config)
+        result = app.run_batch()
 
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
+        assert result.success is False
+        assert "CSV読み取りエラー" in str(result.error_details)
 
-    @patch("stock_batch.services.stock_fetcher.StockFetcher.fetch_stock_data")
     def test_batch_processing_with_stock_fetch_errors(
-        self, mock_stock_fetch: Mock
+        self, patched_services: tuple[Mock, Mock, Mock], tmp_path: Path, app_db: str
     ) -> None:
         """株価取得エラー時のバッチ処理テスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名,市場,現在値,前日比(%)\n".encode())
-            tmp_csv.write("1332,ニッスイ,東P,877.8,+2.5\n".encode())
-            tmp_csv.write("9999,存在しない,東P,100.0,+0.0\n".encode())  # 存在しない企業
-
-        try:
-            # 一部の企業で株価取得エラー
-            def mock_fetch_side_effect(symbol: str):
-                if symbol == "1332.T":
-                    from stock_batch.services.stock_fetcher import StockData
-
-                    return StockData(
-                        symbol=symbol,
-                        current_price=877.8,
-                        business_summary="Nissui Corporation",
-                    )
-                else:
-                    return None  # 存在しない企業
-
-            mock_stock_fetch.side_effect = mock_fetch_side_effect
-
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_stock_data_fetch=True,
-                enable_translation=False,
-                continue_on_error=True,
-            )
-
-            app = MainBatchApplication(config)
-            result = app.run_batch()
-
-            # 一部成功、一部失敗
-            assert result.success is True  # continue_on_error=True
-            assert result.total_processed == 2
-            assert result.companies_inserted >= 1
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_dry_run_mode(self) -> None:
-        """ドライランモードのテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名,市場,現在値,前日比(%)\n".encode())
-            tmp_csv.write("1332,ニッスイ,東P,877.8,+2.5\n".encode())
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                dry_run=True,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-            result = app.run_batch()
-
-            # ドライランでは実際の更新は行われない
-            assert result.success is True
-            assert result.total_processed >= 1
-            assert result.companies_inserted == 0  # ドライランなので0
-            assert result.companies_updated == 0
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_parallel_processing_mode(self) -> None:
+        mock_csv_read, mock_stock_fetch, _ = patched_services
+        _, csv_path = _paths(tmp_path)
+        db_path = app_db
+
+        mock_csv_read.return_value = [
+            Company(symbol="1332.T", name="ニッスイ", market="東P", price=877.8),
+            # 存在しない企業
+            Company(symbol="9999.T", name="存在しない", market="東P", price=100.0),
+        ]
+
+        # 一部の企業で株価取得エラー（存在しない企業は None）
+        stock_data_table = {
+            "1332.T": StockData(
+                symbol="1332.T",
+                current_price=877.8,
+                business_summary="Nissui Corporation",
+            ),
+        }
+        mock_stock_fetch.side_effect = stock_data_table.get
+
+        config = BatchConfig(
+            database_path=db_path,
+            csv_file_path=csv_path,
+            enable_stock_data_fetch=True,
+            enable_translation=False,
+            continue_on_error=True,
+        )
+
+        app = MainBatchApplication(config)
+        result = app.run_batch()
+
+        # 一部成功、一部失敗
+        assert result.success is True  # continue_on_error=True
+        assert result.total_processed == 2
+        assert result.companies_inserted >= 1
+
+    def test_parallel_processing_mode(
+        self, tmp_path: Path, parallel_csv_path: str
+    ) -> None:
         """並列処理モードのテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            # 複数企業のCSVデータ
-            csv_data = "コード,銘柄名,市場,現在値,前日比(%)\n"
-            for i in range(1300, 1320):  # 20社
-                csv_data += f"{i},企業{i},東P,{i}.0,+1.0\n"
-            tmp_csv.write(csv_data.encode())
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                chunk_size=5,
-                enable_parallel=True,
-                max_workers=2,
-                enable_stock_data_fetch=False,  # 高速化
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-            result = app.run_batch()
-
-            assert result.success is True
-            assert result.total_processed == 20
-            assert result.parallel_processing_used is True
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_logging_configuration(self) -> None:
-        """ログ設定のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名,市場,現在値,前日比(%)\n".encode())
-            tmp_csv.write("1332,ニッスイ,東P,877.8,+2.5\n".encode())
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                log_level="DEBUG",
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-
-            # ログレベルが設定されているか確認
-            import logging
-
-            logger = logging.getLogger("stock_batch")
-            assert logger.level == logging.DEBUG
-
-            result = app.run_batch()
-            assert result.success is True
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_progress_reporting(self) -> None:
-        """進捗報告のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            # 進捗確認用の複数データ
-            csv_data = "コード,銘柄名,市場,現在値,前日比(%)\n"
-            for i in range(1400, 1410):  # 10社
-                csv_data += f"{i},企業{i},東P,{i}.0,+1.0\n"
-            tmp_csv.write(csv_data.encode())
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_progress_reporting=True,
-                progress_report_interval=3,  # 3件ごとに報告
-                enable_stock_data_fetch=True,  # 進捗報告のために有効化
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-            result = app.run_batch()
-
-            assert result.success is True
-            assert result.total_processed == 10
-            assert len(result.progress_reports) >= 0  # 進捗報告は条件次第
-
-            # 進捗報告にリソース監視情報が含まれているかチェック
-            if result.progress_reports:
-                for report in result.progress_reports:
-                    assert "memory_usage_mb" in report
-                    assert "processing_time" in report
-                    assert "records_per_second" in report
-                    assert isinstance(report["memory_usage_mb"], float)
-                    assert report["memory_usage_mb"] >= 0.0
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_kubernetes_compatibility(self) -> None:
+        config = BatchConfig(
+            database_path=str(tmp_path / "t.db"),
+            csv_file_path=parallel_csv_path,
+            chunk_size=5,
+            enable_parallel=True,
+            max_workers=2,
+            enable_stock_data_fetch=False,  # 高速化
+            enable_translation=False,
+        )
+
+        app = MainBatchApplication(config)
+        result = app.run_batch()
+
+        assert result.success is True
+        assert result.total_processed == 20
+        assert result.parallel_processing_used is True
+
+    @pytest.mark.parametrize(("overrides", "check"), BATCH_CONFIG_CASES)
+    async def test_batch_config_variant(
+        self,
+        app_db: str,
+        batch_csv_path: str,
+        overrides: dict[str, object],
+        check: Callable[[BatchResult], bool],
+    ) -> None:
+        """BatchConfig のフラグ違いでバッチ処理が成功することのテスト"""
+        # 外部APIを使う処理は既定で無効にし、ケースごとの設定で上書きする
+        options = {
+            "enable_stock_data_fetch": False,
+            "enable_translation": False,
+            **overrides,
+        }
+        config = BatchConfig(
+            database_path=app_db, csv_file_path=batch_csv_path, **options
+        )
+        app = MainBatchApplication(config)
+
+        # 株価取得を有効にするケースでも外部APIにはアクセスしない
+        with patch(
+            "stock_batch.services.stock_fetcher.StockFetcher.fetch_stock_data",
+            return_value=None,
+        ):
+            result = await app.run_batch()
+
+        assert result.success is True
+        assert result.total_processed == 10
+        assert check(result)
+
+    async def test_processing_time_uses_injected_clock(
+        self, app_db: str, batch_csv_path: str
+    ) -> None:
+        """注入した時計で処理時間と処理速度が決定的に計算されることのテスト"""
+        config = BatchConfig(
+            database_path=app_db,
+            csv_file_path=batch_csv_path,
+            enable_stock_data_fetch=False,
+            enable_translation=False,
+            clock=itertools.count(0.0, 0.5).__next__,  # 呼び出しごとに0.5秒進む
+        )
+        app = MainBatchApplication(config)
+
+        result = await app.run_batch()
+
+        assert result.success is True
+        assert result.processing_time == 0.5
+        assert result.records_per_second == 20.0  # 10件 / 0.5秒
+
+    def test_kubernetes_compatibility(self, app_db: str, single_csv_path: str) -> None:
         """Kubernetes対応のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名,市場,現在値,前日比(%)\n".encode())
-            tmp_csv.write("1332,ニッスイ,東P,877.8,+2.5\n".encode())
-
-        try:
-            # Kubernetes環境変数のモック
-            with patch.dict(
-                "os.environ",
-                {
-                    "KUBERNETES_SERVICE_HOST": "kubernetes.default.svc",
-                    "BATCH_DATABASE_PATH": db_path,
-                    "BATCH_CSV_PATH": csv_path,
-                    "BATCH_LOG_LEVEL": "INFO",
-                },
-            ):
-                config = BatchConfig.from_environment()
-                assert config.database_path == db_path
-                assert config.csv_file_path == csv_path
-                assert config.log_level == "INFO"
-
-                app = MainBatchApplication(config)
-                result = app.run_batch()
-
-                # Kubernetes対応の確認
-                assert result.success is True
-                assert result.environment == "kubernetes"
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_performance_monitoring(self) -> None:
-        """パフォーマンス監視のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            csv_data = "コード,銘柄名,市場,現在値,前日比(%)\n"
-            for i in range(1500, 1600):  # 100社
-                csv_data += f"{i},企業{i},東P,{i}.0,+1.0\n"
-            tmp_csv.write(csv_data.encode())
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_performance_monitoring=True,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
+        db_path, csv_path = app_db, single_csv_path
+
+        # Kubernetes環境変数のモック
+        with patch.dict(
+            "os.environ",
+            {
+                "KUBERNETES_SERVICE_HOST": "kubernetes.default.svc",
+                "BATCH_DATABASE_PATH": db_path,
+                "BATCH_CSV_PATH": csv_path,
+                "BATCH_LOG_LEVEL": "INFO",
+            },
+        ):
+            config = BatchConfig.from_environment()
+            assert config.database_path == db_path
+            assert config.csv_file_path == csv_path
+            assert config.log_level == "INFO"
 
             app = MainBatchApplication(config)
             result = app.run_batch()
 
+            # Kubernetes対応の確認
             assert result.success is True
-            assert result.processing_time > 0
-            assert result.memory_usage_mb >= 0
-            assert result.records_per_second > 0
-            assert result.database_operations_count > 0
+            assert result.environment == "kubernetes"
 
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_graceful_shutdown(self) -> None:
-        """Graceful Shutdown のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名,市場,現在値,前日比(%)\n".encode())
-            tmp_csv.write("1332,ニッスイ,東P,877.8,+2.5\n".encode())
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_graceful_shutdown=True,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-
-            # シグナルハンドラーが登録されているか確認
-            assert app.shutdown_requested is False
-
-            result = app.run_batch()
-            assert result.success is True
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_get_application_stats(self) -> None:
+    def test_get_application_stats(self, tmp_path: Path, single_csv_path: str) -> None:
         """アプリケーション統計情報取得のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名,市場,現在値,前日比(%)\n".encode())
-            tmp_csv.write("1332,ニッスイ,東P,877.8,+2.5\n".encode())
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-
-            # 複数回実行
-            for _ in range(3):
-                app.run_batch()
-
-            stats = app.get_application_stats()
-            assert stats["total_runs"] == 3
-            assert stats["total_records_processed"] >= 3
-            assert stats["average_processing_time"] > 0
-            assert "last_run_result" in stats
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_liveness_marker_management(self) -> None:
+        config = BatchConfig(
+            database_path=str(tmp_path / "t.db"),
+            csv_file_path=single_csv_path,
+            enable_stock_data_fetch=False,
+            enable_translation=False,
+        )
+
+        app = MainBatchApplication(config)
+
+        # 複数回実行
+        for _ in range(3):
+            app.run_batch()
+
+        stats = app.get_application_stats()
+        assert stats["total_runs"] == 3
+        assert stats["total_records_processed"] >= 3
+        assert stats["average_processing_time"] > 0
+        assert "last_run_result" in stats
+
+    def test_liveness_marker_management(self, tmp_path: Path) -> None:
         """Liveness Probe状態マーカー管理のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write(
-                "コード,銘柄名,市場,現在値,前日比(%)\n1332,テスト株式会社,東1,1000,+1.0%\n".encode()
-            )
+        db_path, csv_path = _paths(
+            tmp_path,
+            CSV_HEADER + "1332,テスト株式会社,東1,1000,+1.0%\n".encode(),
+        )
 
         try:
             config = BatchConfig(
@@ -584,18 +543,13 @@ class TestMainBatchApplication:
             # クリーンアップ
             marker_file = Path("/tmp/app/.batch_running")
             marker_file.unlink(missing_ok=True)
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
 
-    def test_liveness_marker_during_batch_processing(self) -> None:
+    def test_liveness_marker_during_batch_processing(self, tmp_path: Path) -> None:
         """バッチ処理中のLiveness Probe状態マーカーのテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write(
-                "コード,銘柄名,市場,現在値,前日比(%)\n1332,テスト株式会社,東1,1000,+1.0%\n".encode()
-            )
+        db_path, csv_path = _paths(
+            tmp_path,
+            CSV_HEADER + "1332,テスト株式会社,東1,1000,+1.0%\n".encode(),
+        )
 
         try:
             config = BatchConfig(
@@ -621,111 +575,84 @@ class TestMainBatchApplication:
             # クリーンアップ
             marker_file = Path("/tmp/app/.batch_running")
             marker_file.unlink(missing_ok=True)
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
 
 
 class TestMainBatchApplicationYfinanceCache:
     """MainBatchApplication のyfinanceキャッシュ設定テスト"""
 
     @patch("yfinance.set_tz_cache_location")
-    def test_yfinance_cache_setup_success(self, mock_set_cache: Mock) -> None:
+    def test_yfinance_cache_setup_success(
+        self, mock_set_cache: Mock, tmp_path: Path
+    ) -> None:
         """yfinanceキャッシュ設定成功のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名\n1332,テスト\n".encode())
-
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                cache_dir = str(Path(temp_dir) / "yfinance_cache")
+        db_path, csv_path = _paths(tmp_path, "コード,銘柄名\n1332,テスト\n".encode())
+        cache_dir = str(tmp_path / "yfinance_cache")
 
-                with patch.dict(os.environ, {"YFINANCE_CACHE_DIR": cache_dir}):
-                    config = BatchConfig(
-                        database_path=db_path,
-                        csv_file_path=csv_path,
-                        enable_stock_data_fetch=False,
-                        enable_translation=False,
-                    )
-
-                    # MainBatchApplication初期化時にキャッシュ設定が呼ばれることを確認
-                    MainBatchApplication(config)
+        with patch.dict(os.environ, {"YFINANCE_CACHE_DIR": cache_dir}):
+            config = BatchConfig(
+                database_path=db_path,
+                csv_file_path=csv_path,
+                enable_stock_data_fetch=False,
+                enable_translation=False,
+            )
 
-                    # yfinance.set_tz_cache_locationが正しいパスで呼ばれることを確認
-                    mock_set_cache.assert_called_once_with(cache_dir)
+            # MainBatchApplication初期化時にキャッシュ設定が呼ばれることを確認
+            MainBatchApplication(config)
 
-                    # キャッシュディレクトリが作成されることを確認
-                    assert Path(cache_dir).exists()
+            # yfinance.set_tz_cache_locationが正しいパスで呼ばれることを確認
+            mock_set_cache.assert_called_once_with(cache_dir)
 
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
+            # キャッシュディレクトリが作成されることを確認
+            assert Path(cache_dir).exists()
 
     @patch("yfinance.set_tz_cache_location")
-    def test_yfinance_cache_setup_with_default_path(self, mock_set_cache: Mock) -> None:
+    def test_yfinance_cache_setup_with_default_path(
+        self, mock_set_cache: Mock, tmp_path: Path
+    ) -> None:
         """デフォルトパスでのyfinanceキャッシュ設定テスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名\n1332,テスト\n".encode())
+        db_path, csv_path = _paths(tmp_path, "コード,銘柄名\n1332,テスト\n".encode())
 
-        try:
-            # YFINANCE_CACHE_DIR環境変数が設定されていない場合のテスト
-            with patch.dict(os.environ, {}, clear=True):
-                config = BatchConfig(
-                    database_path=db_path,
-                    csv_file_path=csv_path,
-                    enable_stock_data_fetch=False,
-                    enable_translation=False,
-                )
-
-                # MainBatchApplication初期化
-                with patch("pathlib.Path.mkdir") as mock_mkdir:
-                    MainBatchApplication(config)
-
-                    # デフォルトパス("/tmp/app/yfinance_cache")で呼ばれることを確認
-                    mock_set_cache.assert_called_once_with("/tmp/app/yfinance_cache")
-                    # ディレクトリ作成が試行されることを確認
-                    mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        # YFINANCE_CACHE_DIR環境変数が設定されていない場合のテスト
+        with patch.dict(os.environ, {}, clear=True):
+            config = BatchConfig(
+                database_path=db_path,
+                csv_file_path=csv_path,
+                enable_stock_data_fetch=False,
+                enable_translation=False,
+            )
 
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
+            # MainBatchApplication初期化
+            with patch("pathlib.Path.mkdir") as mock_mkdir:
+                MainBatchApplication(config)
+
+                # デフォルトパス("/tmp/app/yfinance_cache")で呼ばれることを確認
+                mock_set_cache.assert_called_once_with("/tmp/app/yfinance_cache")
+                # ディレクトリ作成が試行されることを確認
+                mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
 
     @patch("yfinance.set_tz_cache_location")
     @patch("pathlib.Path.mkdir")
     def test_yfinance_cache_setup_failure_handling(
-        self, mock_mkdir: Mock, mock_set_cache: Mock
+        self, mock_mkdir: Mock, mock_set_cache: Mock, tmp_path: Path
     ) -> None:
         """yfinanceキャッシュ設定失敗時の処理テスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write("コード,銘柄名\n1332,テスト\n".encode())
+        db_path, csv_path = _paths(tmp_path, "コード,銘柄名\n1332,テスト\n".encode())
 
-        try:
-            # ディレクトリ作成でエラーを発生させる
-            mock_mkdir.side_effect = PermissionError("Permission denied")
+        # ディレクトリ作成でエラーを発生させる
+        mock_mkdir.side_effect = PermissionError("Permission denied")
 
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
+        config = BatchConfig(
+            database_path=db_path,
+            csv_file_path=csv_path,
+            enable_stock_data_fetch=False,
+            enable_translation=False,
+        )
 
-            # エラーが発生してもMainBatchApplicationは正常に作成される
-            MainBatchApplication(config)
-
-            # ディレクトリ作成が試行されることを確認
-            mock_mkdir.assert_called_once()
+        # エラーが発生してもMainBatchApplicationは正常に作成される
+        MainBatchApplication(config)
 
-            # エラーのためyfinance設定は呼ばれない
-            mock_set_cache.assert_not_called()
+        # ディレクトリ作成が試行されることを確認
+        mock_mkdir.assert_called_once()
 
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
+        # エラーのためyfinance設定は呼ばれない
+        mock_set_cache.assert_not_called()
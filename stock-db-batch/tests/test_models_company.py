@@ -8,7 +8,15 @@ from datetime import datetime
 import pytest
 from pydantic import ValidationError
 
-from stock_batch.models.company import Company, CSVCompanyData
+from stock_batch.models.company import (
+    Company,
+    CSVCompanyData,
+    _parse_price,
+    _yfinance_symbol,
+)
+
+# 時計に依存しない固定の日時
+FROZEN_NOW = datetime(2024, 1, 1, 12, 0, 0)
 
 
 class TestCompany:
@@ -48,37 +56,74 @@ class TestCompany:
 
     def test_company_validation_empty_symbol(self) -> None:
         """空のsymbolでのバリデーションエラーのテスト"""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match=r"\nsymbol\n.*string_too_short"):
             Company(symbol="", name="テスト企業")
 
-        errors = exc_info.value.errors()
-        assert any(error["type"] == "string_too_short" for error in errors)
-
     def test_company_validation_empty_name(self) -> None:
         """空のnameでのバリデーションエラーのテスト"""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match=r"\nname\n.*string_too_short"):
             Company(symbol="1234.T", name="")
 
-        errors = exc_info.value.errors()
-        assert any(error["type"] == "string_too_short" for error in errors)
-
     def test_company_validation_negative_price(self) -> None:
         """負の価格でのバリデーションエラーのテスト"""
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match=r"\nprice\n.*greater_than_equal"):
             Company(symbol="1234.T", name="テスト企業", price=-100.0)
 
-        errors = exc_info.value.errors()
-        assert any(error["type"] == "greater_than_equal" for error in errors)
-
     def test_company_set_timestamps(self) -> None:
         """タイムスタンプ設定のテスト"""
         company = Company(symbol="1234.T", name="テスト企業")
-        now = datetime.now()
 
-        company.set_timestamps(created_at=now, last_updated=now)
+        company.set_timestamps(created_at=FROZEN_NOW, last_updated=FROZEN_NOW)
+
+        assert company.created_at == FROZEN_NOW
+        assert company.last_updated == FROZEN_NOW
+
+    def test_company_from_row(self) -> None:
+        """データベース行からのCompany作成のテスト"""
+        row = ("1332.T", "ニッスイ", "東P", "水産会社", 877.8)
+
+        company = Company.from_row(row)
+
+        assert company.symbol == "1332.T"
+        assert company.name == "ニッスイ"
+        assert company.market == "東P"
+        assert company.business_summary == "水産会社"
+        assert company.price == 877.8
+
+    def test_company_has_significant_changes(self) -> None:
+        """重要な変更の検出テスト"""
+        existing = Company(symbol="1332.T", name="ニッスイ", market="東P", price=877.8)
 
-        assert company.created_at == now
-        assert company.last_updated == now
+        # 1銭以下の価格差や空白のみの差異は変更なし
+        assert existing.has_significant_changes(existing) is False
+        assert (
+            existing.has_significant_changes(
+                Company(symbol="1332.T", name=" ニッスイ", market="東P", price=877.805)
+            )
+            is False
+        )
+
+        # 価格・市場の変更は検出されること
+        assert (
+            existing.has_significant_changes(
+                Company(symbol="1332.T", name="ニッスイ", market="東P", price=880.0)
+            )
+            is True
+        )
+        assert (
+            existing.has_significant_changes(
+                Company(symbol="1332.T", name="ニッスイ", market="東S", price=877.8)
+            )
+            is True
+        )
+
+    def test_company_uses_slots(self) -> None:
+        """Companyがインスタンス辞書を持たないことのテスト"""
+        company = Company(symbol="1234.T", name="テスト企業")
+
+        assert not hasattr(company, "__dict__")
+        with pytest.raises(AttributeError):
+            company.unknown_field = "value"  # type: ignore[attr-defined]
 
 
 class TestCSVCompanyData:
@@ -100,6 +145,14 @@ class TestCSVCompanyData:
         assert csv_data.current_value == "877.8"
         assert csv_data.change_percent == "+3.5(+0.40%)"
 
+    def test_csv_company_data_uses_slots(self) -> None:
+        """CSVCompanyDataがインスタンス辞書を持たないことのテスト"""
+        csv_data = CSVCompanyData("1332", "ニッスイ", "東P", "877.8", "0")
+
+        assert not hasattr(csv_data, "__dict__")
+        with pytest.raises(AttributeError):
+            csv_data.unknown_field = "value"  # type: ignore[attr-defined]
+
     def test_csv_to_symbol_conversion_japanese_stock(self) -> None:
         """日本株式のシンボル変換テスト（XXXX → XXXX.T）"""
         csv_data = CSVCompanyData(
@@ -243,6 +296,20 @@ class TestCSVCompanyData:
         with pytest.raises(ValueError):
             csv_data.parse_current_price()
 
+    def test_csv_conversions_are_cached(self) -> None:
+        """同一銘柄のシンボル・価格変換がキャッシュから返されることのテスト"""
+        first = CSVCompanyData("9999", "キャッシュ企業", "名P", "123.4", "0")
+        second = CSVCompanyData("9999", "キャッシュ企業", "名M", "123.4", "0")
+        first.to_yfinance_symbol()
+        first.parse_current_price()
+        symbol_hits = _yfinance_symbol.cache_info().hits
+        price_hits = _parse_price.cache_info().hits
+
+        assert second.to_yfinance_symbol() == "9999.N"
+        assert second.parse_current_price() == 123.4
+        assert _yfinance_symbol.cache_info().hits == symbol_hits + 1
+        assert _parse_price.cache_info().hits == price_hits + 1
+
     def test_csv_to_company_conversion(self) -> None:
         """CSVDataからCompanyへの変換テスト"""
         csv_data = CSVCompanyData(
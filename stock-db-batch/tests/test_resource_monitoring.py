@@ -3,9 +3,12 @@
 CPU、メモリ使用量の監視とログ出力機能をテストします。
 """
 
-import tempfile
+from dataclasses import replace
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock
+
+import psutil
+import pytest
 
 from stock_batch.main_batch_application import (
     BatchConfig,
@@ -13,139 +16,93 @@ from stock_batch.main_batch_application import (
 )
 
 
+@pytest.fixture
+def monitoring_config(tmp_path: Path, sample_csv: str) -> BatchConfig:
+    """パフォーマンス監視を有効にしたバッチ設定
+
+    CSVはセッション共有の読み取り専用ファイルを使い、DBはテストごとに
+    tmp_path 配下へSQLiteが作成する。
+    """
+    return BatchConfig(
+        database_path=str(tmp_path / "test.db"),
+        csv_file_path=sample_csv,
+        enable_performance_monitoring=True,
+        enable_stock_data_fetch=False,
+        enable_translation=False,
+    )
+
+
+@pytest.fixture
+def process_factory() -> MagicMock:
+    """メモリ使用量100MBを返すプロセス情報の生成関数（psutil.Process の代替）"""
+    factory = MagicMock(spec=psutil.Process)
+    factory.return_value.memory_info.return_value.rss = 104857600  # 100MB
+    return factory
+
+
 class TestResourceMonitoring:
     """リソース使用量監視機能のテスト"""
 
-    def test_memory_usage_measurement(self) -> None:
+    def test_memory_usage_measurement(self, monitoring_config: BatchConfig) -> None:
         """メモリ使用量測定のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write(
-                "コード,銘柄名,市場,現在値,前日比(%)\n1332,テスト,東P,877.8,+2.5\n".encode()
-            )
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_performance_monitoring=True,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-
-            # メモリ使用量測定メソッドのテスト
-            memory_usage = app._get_memory_usage()
-
-            # メモリ使用量は0以上のfloat値
-            assert isinstance(memory_usage, float)
-            assert memory_usage >= 0.0
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    @patch("psutil.Process")
-    def test_memory_usage_with_mock(self, mock_process_class: Mock) -> None:
+        app = MainBatchApplication(monitoring_config)
+
+        # メモリ使用量測定メソッドのテスト
+        memory_usage = app._get_memory_usage()
+
+        # メモリ使用量は0以上のfloat値
+        assert isinstance(memory_usage, float)
+        assert memory_usage >= 0.0
+
+    def test_memory_usage_with_mock(
+        self, process_factory: MagicMock, monitoring_config: BatchConfig
+    ) -> None:
         """メモリ使用量測定（モック使用）のテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write(
-                "コード,銘柄名,市場,現在値,前日比(%)\n1332,テスト,東P,877.8,+2.5\n".encode()
-            )
-
-        try:
-            # メモリ使用量をモック（100MB）
-            mock_process = Mock()
-            mock_memory_info = Mock()
-            mock_memory_info.rss = 104857600  # 100MB in bytes
-            mock_process.memory_info.return_value = mock_memory_info
-            mock_process_class.return_value = mock_process
-
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_performance_monitoring=True,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-            memory_usage = app._get_memory_usage()
-
-            # 100MB = 100.0 MiB
-            assert memory_usage == 100.0
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    @patch("psutil.Process")
-    def test_memory_usage_error_handling(self, mock_process_class: Mock) -> None:
+        app = MainBatchApplication(monitoring_config, process_factory=process_factory)
+        memory_usage = app._get_memory_usage()
+
+        # 100MB = 100.0 MiB
+        assert memory_usage == 100.0
+
+    def test_memory_usage_sampling_interval(
+        self, process_factory: MagicMock, monitoring_config: BatchConfig
+    ) -> None:
+        """進捗報告用の測定は間隔内では直前の値を再利用することのテスト"""
+        clock = iter([0.0, 0.2, 0.6]).__next__
+        app = MainBatchApplication(
+            replace(monitoring_config, clock=clock), process_factory=process_factory
+        )
+
+        usages = [
+            app._get_memory_usage(max_age=app.MEMORY_SAMPLE_INTERVAL) for _ in range(3)
+        ]
+
+        assert usages == [100.0, 100.0, 100.0]
+        # 0.2秒時点は再利用、0.6秒時点で再測定
+        assert process_factory.call_count == 2
+
+    def test_memory_usage_error_handling(
+        self, process_factory: MagicMock, monitoring_config: BatchConfig
+    ) -> None:
         """メモリ使用量測定エラーハンドリングのテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write(
-                "コード,銘柄名,市場,現在値,前日比(%)\n1332,テスト,東P,877.8,+2.5\n".encode()
-            )
-
-        try:
-            # psutilでエラーを発生させる
-            mock_process_class.side_effect = Exception("Process error")
-
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_performance_monitoring=True,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-            memory_usage = app._get_memory_usage()
-
-            # エラー時は0.0を返す
-            assert memory_usage == 0.0
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
-
-    def test_batch_result_includes_memory_usage(self) -> None:
+        # プロセス情報の取得でエラーを発生させる
+        process_factory.side_effect = Exception("Process error")
+
+        app = MainBatchApplication(monitoring_config, process_factory=process_factory)
+        memory_usage = app._get_memory_usage()
+
+        # エラー時は0.0を返す
+        assert memory_usage == 0.0
+
+    def test_batch_result_includes_memory_usage(
+        self, monitoring_config: BatchConfig
+    ) -> None:
         """バッチ結果にメモリ使用量が含まれることのテスト"""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp_db:
-            db_path = tmp_db.name
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp_csv:
-            csv_path = tmp_csv.name
-            tmp_csv.write(
-                "コード,銘柄名,市場,現在値,前日比(%)\n1332,テスト,東P,877.8,+2.5\n".encode()
-            )
-
-        try:
-            config = BatchConfig(
-                database_path=db_path,
-                csv_file_path=csv_path,
-                enable_performance_monitoring=True,
-                enable_stock_data_fetch=False,
-                enable_translation=False,
-            )
-
-            app = MainBatchApplication(config)
-            result = app.run_batch()
-
-            # バッチ結果にメモリ使用量が含まれる
-            assert result.success is True
-            assert hasattr(result, "memory_usage_mb")
-            assert isinstance(result.memory_usage_mb, float)
-            assert result.memory_usage_mb >= 0.0
-
-        finally:
-            Path(db_path).unlink(missing_ok=True)
-            Path(csv_path).unlink(missing_ok=True)
+        app = MainBatchApplication(monitoring_config)
+        result = app.run_batch()
+
+        # バッチ結果にメモリ使用量が含まれる
+        assert result.success is True
+        assert hasattr(result, "memory_usage_mb")
+        assert isinstance(result.memory_usage_mb, float)
+        assert result.memory_usage_mb >= 0.0
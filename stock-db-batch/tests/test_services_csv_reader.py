@@ -3,15 +3,37 @@
 CSV形式のスクリーニング結果を読み取り、パース、変換する機能をテストします。
 """
 
-import tempfile
+import json
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
+from pydantic import ValidationError
 
 from stock_batch.models.company import CSVCompanyData
 from stock_batch.services.csv_reader import CSVReader
 
+_CSV_HEADER = '"コード","銘柄名","市場","現在値","前日比(%)"\n'
+_ROW_1332 = '"1332","ニッスイ","東P","877.8","+3.5(+0.40%)"\n'
+_ROW_1418 = '"1418","インターライフＨＬＤＧ","東S","405","-1.0(-0.25%)"\n'
+
+# テストで使うCSVの内容はモジュール読み込み時に一度だけエンコードしておく
+# （BOM付きUTF-8はExcel保存時の形式）
+_CSV_BOM: bytes = (_CSV_HEADER + _ROW_1332).encode("utf-8-sig")
+_CSV_MALFORMED: bytes = (
+    _CSV_HEADER + '"1332","ニッスイ","東P","877.8"\n' + _ROW_1418
+).encode("utf-8-sig")
+_CSV_HEADER_ONLY: bytes = _CSV_HEADER.encode("utf-8-sig")
+_CSV_SHIFT_JIS: bytes = (_CSV_HEADER + _ROW_1332).encode("shift_jis")
+_CSV_TWO_ROWS: bytes = (_CSV_HEADER + _ROW_1332 + _ROW_1418).encode("utf-8-sig")
+
+
+def _write_csv(directory: Path, content: bytes) -> str:
+    """エンコード済みのCSV内容を書き込み、パスを返す"""
+    csv_path = directory / "test.csv"
+    csv_path.write_bytes(content)
+    return str(csv_path)
+
 
 class TestCSVReader:
     """CSVReader クラスのテスト"""
@@ -21,41 +43,25 @@ class TestCSVReader:
         reader = CSVReader("/path/to/csv/file.csv")
         assert reader.csv_path == "/path/to/csv/file.csv"
 
-    def test_read_csv_file_success(self) -> None:
+    def test_read_csv_file_success(self, sample_csv: str) -> None:
         """CSVファイル読み取り成功のテスト"""
-        # テスト用CSVファイル作成
-        csv_content = '''﻿"コード","銘柄名","市場","現在値","前日比(%)"
-"1332","ニッスイ","東P","877.8","+3.5(+0.40%)"
-"1418","インターライフＨＬＤＧ","東S","405","-1.0(-0.25%)"
-"130A","Ｖｅｒｉｔａｓ　Ｉｎ　Ｓｉｌｉ","東G","646","-33.0(-4.86%)"'''
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False, encoding="utf-8"
-        ) as tmp_file:
-            tmp_file.write(csv_content)
-            tmp_file_path = tmp_file.name
-
-        try:
-            reader = CSVReader(tmp_file_path)
-            companies = reader.read_csv()
-
-            assert len(companies) == 3
+        reader = CSVReader(sample_csv)
+        companies = reader.read_csv()
 
-            # 1番目の企業データ検証
-            first_company = companies[0]
-            assert first_company.code == "1332"
-            assert first_company.name == "ニッスイ"
-            assert first_company.market == "東P"
-            assert first_company.current_value == "877.8"
-            assert first_company.change_percent == "+3.5(+0.40%)"
+        assert len(companies) == 3
 
-            # アルファベット含むコード検証
-            third_company = companies[2]
-            assert third_company.code == "130A"
-            assert third_company.name == "Ｖｅｒｉｔａｓ　Ｉｎ　Ｓｉｌｉ"
+        # 1番目の企業データ検証
+        first_company = companies[0]
+        assert first_company.code == "1332"
+        assert first_company.name == "ニッスイ"
+        assert first_company.market == "東P"
+        assert first_company.current_value == "877.8"
+        assert first_company.change_percent == "+3.5(+0.40%)"
 
-        finally:
-            Path(tmp_file_path).unlink(missing_ok=True)
+        # アルファベット含むコード検証
+        third_company = companies[2]
+        assert third_company.code == "130A"
+        assert third_company.name == "Ｖｅｒｉｔａｓ　Ｉｎ　Ｓｉｌｉ"
 
     def test_read_csv_file_not_found(self) -> None:
         """存在しないCSVファイルのテスト"""
@@ -64,72 +70,37 @@ class TestCSVReader:
         with pytest.raises(FileNotFoundError):
             reader.read_csv()
 
-    def test_read_csv_with_bom(self) -> None:
+    def test_read_csv_with_bom(self, tmp_path: Path) -> None:
         """BOM付きCSVファイル読み取りのテスト"""
-        # BOM付きCSVコンテンツ（Excel保存時の形式）
-        csv_content = '''﻿"コード","銘柄名","市場","現在値","前日比(%)"
-"1332","ニッスイ","東P","877.8","+3.5(+0.40%)"'''
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False, encoding="utf-8-sig"
-        ) as tmp_file:
-            tmp_file.write(csv_content)
-            tmp_file_path = tmp_file.name
-
-        try:
-            reader = CSVReader(tmp_file_path)
-            companies = reader.read_csv()
+        tmp_file_path = _write_csv(tmp_path, _CSV_BOM)
 
-            assert len(companies) == 1
-            assert companies[0].code == "1332"
+        reader = CSVReader(tmp_file_path)
+        companies = reader.read_csv()
 
-        finally:
-            Path(tmp_file_path).unlink(missing_ok=True)
+        assert len(companies) == 1
+        assert companies[0].code == "1332"
 
-    def test_read_csv_with_malformed_data(self) -> None:
+    def test_read_csv_with_malformed_data(self, tmp_path: Path) -> None:
         """不正な形式のCSVデータのテスト"""
         # 列数が不足しているデータ
-        csv_content = '''﻿"コード","銘柄名","市場","現在値","前日比(%)"
-"1332","ニッスイ","東P","877.8"
-"1418","インターライフＨＬＤＧ","東S","405","-1.0(-0.25%)"'''
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False, encoding="utf-8"
-        ) as tmp_file:
-            tmp_file.write(csv_content)
-            tmp_file_path = tmp_file.name
-
-        try:
-            reader = CSVReader(tmp_file_path)
-            companies = reader.read_csv()
+        tmp_file_path = _write_csv(tmp_path, _CSV_MALFORMED)
 
-            # 2行目はスキップされ、有効な1行のみ読み込まれる
-            assert len(companies) == 1
-            assert companies[0].code == "1418"
+        reader = CSVReader(tmp_file_path)
+        companies = reader.read_csv()
 
-        finally:
-            Path(tmp_file_path).unlink(missing_ok=True)
+        # 2行目はスキップされ、有効な1行のみ読み込まれる
+        assert len(companies) == 1
+        assert companies[0].code == "1418"
 
-    def test_read_csv_empty_file(self) -> None:
+    def test_read_csv_empty_file(self, tmp_path: Path) -> None:
         """空のCSVファイルのテスト"""
-        csv_content = """﻿"コード","銘柄名","市場","現在値","前日比(%)"
-"""
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False, encoding="utf-8"
-        ) as tmp_file:
-            tmp_file.write(csv_content)
-            tmp_file_path = tmp_file.name
-
-        try:
-            reader = CSVReader(tmp_file_path)
-            companies = reader.read_csv()
+        tmp_file_path = _write_csv(tmp_path, _CSV_HEADER_ONLY)
 
-            # ヘッダーのみで企業データは0件
-            assert len(companies) == 0
+        reader = CSVReader(tmp_file_path)
+        companies = reader.read_csv()
 
-        finally:
-            Path(tmp_file_path).unlink(missing_ok=True)
+        # ヘッダーのみで企業データは0件
+        assert len(companies) == 0
 
     def test_validate_csv_headers(self) -> None:
         """CSVヘッダー検証のテスト"""
@@ -149,6 +120,16 @@ class TestCSVReader:
         result = reader.validate_headers(incorrect_headers)
         assert result is False
 
+    def test_validate_csv_headers_column_order(self) -> None:
+        """ヘッダーの列順が検証され、後続の追加列は許容されることのテスト"""
+        reader = CSVReader("/dummy/path")
+
+        reordered = ["銘柄名", "コード", "市場", "現在値", "前日比(%)"]
+        extended = ["コード", "銘柄名", "市場", "現在値", "前日比(%)", "出来高"]
+
+        assert reader.validate_headers(reordered) is False
+        assert reader.validate_headers(extended) is True
+
     def test_filter_valid_companies(self) -> None:
         """有効企業データのフィルタリングテスト"""
         reader = CSVReader("/dummy/path")
@@ -169,56 +150,55 @@ class TestCSVReader:
         assert valid_companies[0].code == "1332"
         assert valid_companies[1].code == "1420"
 
-    def test_read_csv_with_encoding_detection(self) -> None:
+    @pytest.mark.parametrize(
+        ("current_value", "expected"),
+        [
+            ("877.8", True),
+            ("405", True),
+            ("+3.5", True),
+            ("1e3", True),
+            ("１２３", True),
+            ("invalid", False),
+            ("1.2.3", False),
+            ("", False),
+        ],
+    )
+    def test_filter_valid_companies_price_formats(
+        self, current_value: str, expected: bool
+    ) -> None:
+        """現在値の表記ごとの有効判定がfloat()での解析可否と一致することのテスト"""
+        reader = CSVReader("/dummy/path")
+        data = CSVCompanyData("1332", "ニッスイ", "東P", current_value, "0")
+
+        assert (reader.filter_valid_companies([data]) == [data]) is expected
+
+    def test_read_csv_with_encoding_detection(self, tmp_path: Path) -> None:
         """文字エンコーディング自動検出のテスト"""
         # Shift_JISエンコーディングのテストファイル
-        csv_content = '''"コード","銘柄名","市場","現在値","前日比(%)"
-"1332","ニッスイ","東P","877.8","+3.5(+0.40%)"'''
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False, encoding="shift_jis"
-        ) as tmp_file:
-            tmp_file.write(csv_content)
-            tmp_file_path = tmp_file.name
+        tmp_file_path = _write_csv(tmp_path, _CSV_SHIFT_JIS)
 
-        try:
-            reader = CSVReader(tmp_file_path)
+        reader = CSVReader(tmp_file_path)
+        with patch("builtins.open", wraps=open) as spy_open:
             companies = reader.read_csv()
 
-            assert len(companies) == 1
-            assert companies[0].name == "ニッスイ"
-
-        finally:
-            Path(tmp_file_path).unlink(missing_ok=True)
+        assert len(companies) == 1
+        assert companies[0].name == "ニッスイ"
+        # エンコーディングの再試行でファイルを開き直さない
+        assert spy_open.call_count == 1
 
-    def test_get_csv_stats(self) -> None:
+    def test_get_csv_stats(self, sample_csv: str) -> None:
         """CSV統計情報取得のテスト"""
-        csv_content = '''﻿"コード","銘柄名","市場","現在値","前日比(%)"
-"1332","ニッスイ","東P","877.8","+3.5(+0.40%)"
-"1418","インターライフＨＬＤＧ","東S","405","-1.0(-0.25%)"
-"130A","Ｖｅｒｉｔａｓ　Ｉｎ　Ｓｉｌｉ","東G","646","-33.0(-4.86%)"'''
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False, encoding="utf-8"
-        ) as tmp_file:
-            tmp_file.write(csv_content)
-            tmp_file_path = tmp_file.name
-
-        try:
-            reader = CSVReader(tmp_file_path)
-            companies = reader.read_csv()
-            stats = reader.get_csv_stats(companies)
-
-            assert stats["total_companies"] == 3
-            assert stats["valid_companies"] == 3
-            assert stats["invalid_companies"] == 0
-            assert "markets" in stats
-            assert "東P" in stats["markets"]
-            assert "東S" in stats["markets"]
-            assert "東G" in stats["markets"]
-
-        finally:
-            Path(tmp_file_path).unlink(missing_ok=True)
+        reader = CSVReader(sample_csv)
+        companies = reader.read_csv()
+        stats = reader.get_csv_stats(companies)
+
+        assert stats["total_companies"] == 3
+        assert stats["valid_companies"] == 3
+        assert stats["invalid_companies"] == 0
+        assert "markets" in stats
+        assert "東P" in stats["markets"]
+        assert "東S" in stats["markets"]
+        assert "東G" in stats["markets"]
 
     @patch("builtins.open")
     def test_read_csv_io_error(self, mock_open: Mock) -> None:
@@ -254,27 +234,75 @@ class TestCSVReader:
         assert companies[1].name == "インターライフＨＬＤＧ"
         assert companies[1].price == 405.0
 
-    def test_read_and_convert_full_workflow(self) -> None:
+    def test_convert_to_companies_skips_invalid_rows(self) -> None:
+        """まとめて検証する際に不正な行のみが除外されることのテスト"""
+        reader = CSVReader("/dummy/path")
+
+        csv_data = [
+            CSVCompanyData("1332", "ニッスイ", "東P", "877.8", "+3.5(+0.40%)"),
+            CSVCompanyData("9998", "負の価格", "東S", "-1.0", "0"),  # 不正：負の価格
+            CSVCompanyData("9999", "価格不正", "東S", "invalid", "0"),  # 不正：価格形式
+            CSVCompanyData("1418", "インターライフＨＬＤＧ", "東S", "405", "0"),
+        ]
+
+        companies = reader.convert_to_companies(csv_data)
+
+        assert [company.symbol for company in companies] == ["1332.T", "1418.T"]
+
+    def test_read_and_convert_full_workflow(self, tmp_path: Path) -> None:
         """CSV読み取りから変換までのフルワークフローテスト"""
-        csv_content = '''﻿"コード","銘柄名","市場","現在値","前日比(%)"
-"1332","ニッスイ","東P","877.8","+3.5(+0.40%)"
-"1418","インターライフＨＬＤＧ","東S","405","-1.0(-0.25%)"'''
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False, encoding="utf-8"
-        ) as tmp_file:
-            tmp_file.write(csv_content)
-            tmp_file_path = tmp_file.name
-
-        try:
-            reader = CSVReader(tmp_file_path)
+        tmp_file_path = _write_csv(tmp_path, _CSV_TWO_ROWS)
+
+        reader = CSVReader(tmp_file_path)
+        companies = reader.read_and_convert()
+
+        assert len(companies) == 2
+        assert companies[0].symbol == "1332.T"
+        assert companies[1].symbol == "1418.T"
+        # business_summaryはCSV段階では未設定
+        assert companies[0].business_summary is None
+
+    def test_read_and_convert_streams_rows(self, sample_csv: str) -> None:
+        """読み取り・変換がCSVCompanyDataの全件リストを作らずに行われることのテスト"""
+        reader = CSVReader(sample_csv)
+
+        with patch.object(CSVReader, "read_csv", side_effect=AssertionError):
             companies = reader.read_and_convert()
 
-            assert len(companies) == 2
-            assert companies[0].symbol == "1332.T"
-            assert companies[1].symbol == "1418.T"
-            # business_summaryはCSV段階では未設定
-            assert companies[0].business_summary is None
+        assert [c.symbol for c in companies] == ["1332.T", "1418.T", "130A.T"]
+
+    def test_read_json(self, tmp_path: Path) -> None:
+        """JSON形式のスクリーニング結果読み取りのテスト"""
+        records = [
+            {
+                "code": "1332",
+                "name": "ニッスイ",
+                "market": "東P",
+                "current_value": "877.8",
+                "change_percent": "+3.5(+0.40%)",
+            },
+            {
+                "code": "130A",
+                "name": "価格不正",
+                "market": "東G",
+                "current_value": "invalid",
+                "change_percent": "0",
+            },
+        ]
+        json_path = tmp_path / "screener.json"
+        json_path.write_bytes(json.dumps(records, ensure_ascii=False).encode())
+
+        companies = CSVReader(str(json_path)).read_json()
+
+        # 価格が不正な行はCSVと同様に除外される
+        assert companies == [
+            CSVCompanyData("1332", "ニッスイ", "東P", "877.8", "+3.5(+0.40%)")
+        ]
+
+    def test_read_json_invalid_record(self, tmp_path: Path) -> None:
+        """必須フィールドが欠けたJSONでの検証エラーのテスト"""
+        json_path = tmp_path / "screener.json"
+        json_path.write_bytes(b'[{"code": "1332"}]')
 
-        finally:
-            Path(tmp_file_path).unlink(missing_ok=True)
+        with pytest.raises(ValidationError):
+            CSVReader(str(json_path)).read_json()